@@ -0,0 +1,163 @@
+"""Admission control for the public widget endpoints.
+
+Every public request takes a token from its client IP's bucket and from the
+bucket of the business it targets, then a slot from a global in-flight
+limit. Anything over a limit is rejected at once with ``429`` (rate) or
+``503`` (concurrency) and a ``Retry-After`` header instead of queueing
+behind the requests we can actually serve.
+
+Client IPs come from ``request.client``; behind a proxy run uvicorn with
+``--proxy-headers --forwarded-allow-ips=<proxy>`` so that is the real
+client. State is per worker process, so effective limits scale with the
+number of workers.
+"""
+
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Hashable
+
+from fastapi import HTTPException, Request
+
+import metrics
+
+# ==============================
+# Settings
+# ==============================
+
+ADMISSION_CONTROL_ENABLED = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+
+# Sustained requests per second and burst size; a rate of 0 disables the bucket
+PUBLIC_IP_RATE = float(os.getenv("PUBLIC_IP_RATE", "20"))
+PUBLIC_IP_BURST = float(os.getenv("PUBLIC_IP_BURST", "60"))
+PUBLIC_BUSINESS_RATE = float(os.getenv("PUBLIC_BUSINESS_RATE", "200"))
+PUBLIC_BUSINESS_BURST = float(os.getenv("PUBLIC_BUSINESS_BURST", "400"))
+PUBLIC_MAX_IN_FLIGHT = int(os.getenv("PUBLIC_MAX_IN_FLIGHT", "256"))
+# Buckets tracked per limiter; the least recently seen are dropped beyond this
+ADMISSION_MAX_KEYS = int(os.getenv("ADMISSION_MAX_KEYS", "100000"))
+
+shed_requests = metrics.Counter(
+    "admission_shed_total", "Public requests rejected by admission control.", ("reason",)
+)
+
+# ==============================
+# Limiters
+# ==============================
+
+class TokenBuckets:
+    def __init__(self, name: str, rate: float, burst: float, max_keys: int):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        # key -> (tokens, updated_at), least recently used first
+        self._buckets: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def take(self, key: Hashable) -> float:
+        """Take a token; return 0 if granted, else seconds until one is available."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            tokens, wait = tokens - 1, 0.0
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            # An evicted key just starts again from a full bucket
+            self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self) -> dict:
+        return {"rate": self.rate, "burst": self.burst, "tracked": len(self._buckets)}
+
+
+class ConcurrencyLimit:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+
+    def try_acquire(self) -> bool:
+        if self.limit > 0 and self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+
+
+ip_buckets = TokenBuckets("ip", PUBLIC_IP_RATE, PUBLIC_IP_BURST, ADMISSION_MAX_KEYS)
+business_buckets = TokenBuckets("business", PUBLIC_BUSINESS_RATE, PUBLIC_BUSINESS_BURST, ADMISSION_MAX_KEYS)
+concurrency = ConcurrencyLimit(PUBLIC_MAX_IN_FLIGHT)
+
+shed = {"ip": 0, "business": 0, "concurrency": 0}
+enabled = ADMISSION_CONTROL_ENABLED
+
+# ==============================
+# Checks
+# ==============================
+
+def _reject(reason: str, status_code: int, detail: str, retry_after: float):
+    shed[reason] += 1
+    shed_requests.inc((reason,))
+    raise HTTPException(
+        status_code=status_code, detail=detail, headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+def check_business(business_id: str):
+    """Rate-limit by target business; for routes that carry the id in the body."""
+    if not enabled:
+        return
+    wait = business_buckets.take(business_id)
+    if wait:
+        _reject("business", 429, "Too many requests for this business, please retry shortly", wait)
+
+
+def _check_rates(request: Request):
+    wait = ip_buckets.take(request.client.host if request.client else "")
+    if wait:
+        _reject("ip", 429, "Too many requests, please retry shortly", wait)
+    business_id = request.path_params.get("business_id")
+    if business_id is not None:
+        check_business(business_id)
+
+
+async def public_request(request: Request):
+    """Dependency for public routes: IP and business buckets, then an in-flight slot."""
+    if not enabled:
+        yield
+        return
+
+    _check_rates(request)
+    if not concurrency.try_acquire():
+        _reject("concurrency", 503, "Server busy, please retry shortly", 1)
+    try:
+        yield
+    finally:
+        concurrency.release()
+
+
+async def public_stream(request: Request):
+    """Dependency for long-lived public streams: the rate buckets only.
+
+    A stream would otherwise pin an in-flight slot for its whole lifetime;
+    open streams are capped separately by ``events.EVENTS_MAX_SUBSCRIBERS``.
+    """
+    if enabled:
+        _check_rates(request)
+
+
+def stats() -> dict:
+    return {
+        "enabled": enabled,
+        "in_flight": concurrency.in_flight,
+        "max_in_flight": concurrency.limit,
+        "ip": ip_buckets.stats(),
+        "business": business_buckets.stats(),
+        "shed": dict(shed),
+    }
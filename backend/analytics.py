@@ -0,0 +1,250 @@
+"""Booking analytics from incrementally maintained daily rollups.
+
+``booking_rollups`` holds one document per business per appointment day::
+
+    {"business_id", "date", "bookings", "cancellations", "booked_minutes",
+     "revenue", "services": {service_id: {"name", "bookings", ...}}}
+
+Creating a booking adds to its day and cancelling one subtracts its minutes
+and price again, in a single upsert per day touched. ``summary`` reads at
+most one document per day in the range, so a dashboard query costs the same
+for a business with ten bookings as for one with ten years of them.
+Available minutes come from the business's opening hours times its number
+of staff (each member can be booked in parallel), not from storage.
+
+A rollup write that fails is logged and counted, never surfaced to the
+customer; rebuilding from ``bookings`` repairs it. The rebuild is also the
+backfill for bookings made before rollups existed::
+
+    python -m analytics rebuild [business_id]
+"""
+
+import asyncio
+import logging
+import sys
+from datetime import date as Date, timedelta
+from typing import Dict, Iterable, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+import database
+import indexes
+import metrics
+from slot_engine import day_window, to_minutes
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("bookings", "cancellations", "booked_minutes", "revenue")
+
+rollup_failures_total = metrics.Counter(
+    "analytics_rollup_failures_total", "Rollup updates that failed; fixed by python -m analytics rebuild."
+)
+
+# ==============================
+# Incremental Updates
+# ==============================
+
+def _minutes(booking: dict) -> int:
+    return to_minutes(booking["end_time"]) - to_minutes(booking["start_time"])
+
+
+def _changes(booking: dict, cancelled: bool, price: Optional[float] = None) -> Dict[str, float]:
+    """Counter deltas of one booking, keyed by rollup field path."""
+    minutes = _minutes(booking)
+    if price is None:
+        price = booking.get("price") or 0
+    if cancelled:
+        values = {"cancellations": 1, "booked_minutes": -minutes, "revenue": -price}
+    else:
+        values = {"bookings": 1, "booked_minutes": minutes, "revenue": price}
+    service = f"services.{booking['service_id']}"
+    return {**values, **{f"{service}.{field}": value for field, value in values.items()}}
+
+
+def _update(booking: dict, cancelled: bool) -> UpdateOne:
+    return UpdateOne(
+        {"business_id": booking["business_id"], "date": booking["date"]},
+        {
+            "$inc": _changes(booking, cancelled),
+            "$set": {f"services.{booking['service_id']}.name": booking.get("service_name")},
+        },
+        upsert=True,
+    )
+
+
+async def _write(db, updates: list):
+    try:
+        await db.booking_rollups.bulk_write(updates, ordered=False)
+    except PyMongoError as exc:
+        rollup_failures_total.inc()
+        logger.warning("Analytics rollup update of %d bookings failed: %s", len(updates), exc)
+
+
+async def record_created(db, booking: dict):
+    await _write(db, [_update(booking, cancelled=False)])
+
+
+async def record_cancelled(db, bookings: Iterable[dict]):
+    """Subtract bookings that were confirmed until this request cancelled them."""
+    updates = [_update(booking, cancelled=True) for booking in bookings]
+    if updates:
+        await _write(db, updates)
+
+# ==============================
+# Reads
+# ==============================
+
+def _ratio(part: float, whole: float) -> Optional[float]:
+    return round(part / whole, 4) if whole else None
+
+
+async def summary(db, business_id: str, schedule: dict, first: Date, last: Date, staff_count: int = 0) -> dict:
+    """Totals, per-service and per-day figures for ``[first, last]``.
+
+    A business with ``staff_count`` members has that many opening windows
+    a day to fill; one without staff has one. Past days use today's count.
+    """
+    capacity = max(1, staff_count)
+    docs = await db.booking_rollups.find(
+        {"business_id": business_id, "date": {"$gte": first.isoformat(), "$lte": last.isoformat()}},
+        {"_id": 0, "business_id": 0},
+    ).to_list(length=None)
+    by_date = {doc["date"]: doc for doc in docs}
+
+    totals = dict.fromkeys(COUNTERS, 0)
+    totals["available_minutes"] = 0
+    services: Dict[str, dict] = {}
+    days = []
+    opening_hours = {"schedule": schedule}
+    day = first
+    while day <= last:
+        doc = by_date.get(day.isoformat(), {})
+        window = day_window(opening_hours, day)
+        available = (window[1] - window[0]) * capacity if window else 0
+        row = {"date": day.isoformat(), **{c: doc.get(c, 0) for c in COUNTERS}, "available_minutes": available}
+        for counter in (*COUNTERS, "available_minutes"):
+            totals[counter] += row[counter]
+        for service_id, figures in doc.get("services", {}).items():
+            entry = services.setdefault(service_id, {"service_id": service_id, **dict.fromkeys(COUNTERS, 0)})
+            entry["name"] = figures.get("name") or entry.get("name")
+            for counter in COUNTERS:
+                entry[counter] += figures.get(counter, 0)
+        row["revenue"] = round(row["revenue"], 2)
+        row["utilization"] = _ratio(row["booked_minutes"], available)
+        days.append(row)
+        day += timedelta(days=1)
+
+    totals["confirmed"] = totals["bookings"] - totals["cancellations"]
+    totals["revenue"] = round(totals["revenue"], 2)
+    totals["utilization"] = _ratio(totals["booked_minutes"], totals["available_minutes"])
+    for entry in services.values():
+        entry["confirmed"] = entry["bookings"] - entry["cancellations"]
+        entry["revenue"] = round(entry["revenue"], 2)
+    return {
+        "from": first.isoformat(),
+        "to": last.isoformat(),
+        "totals": totals,
+        "services": sorted(services.values(), key=lambda s: (-s["bookings"], s["service_id"])),
+        "days": days,
+    }
+
+async def count(db, business_id: str, status: Optional[str], date_range: Optional[dict] = None) -> int:
+    """Bookings on the days in ``date_range`` (a ``$gte``/``$lte`` filter), from the rollups.
+
+    Reads one small document per day that had bookings, however many
+    bookings those days hold, and covers archived bookings too.
+    """
+    match = {"business_id": business_id}
+    if date_range:
+        match["date"] = date_range
+    result = await db.booking_rollups.aggregate([
+        {"$match": match},
+        {"$group": {"_id": None, "bookings": {"$sum": "$bookings"}, "cancellations": {"$sum": "$cancellations"}}},
+    ]).to_list(length=1)
+    if not result:
+        return 0
+    totals = result[0]
+    if status == "confirmed":
+        return totals["bookings"] - totals["cancellations"]
+    if status == "cancelled":
+        return totals["cancellations"]
+    return totals["bookings"]
+
+# ==============================
+# Rebuild / Backfill
+# ==============================
+
+def _add(target: dict, changes: Dict[str, float]):
+    for path, value in changes.items():
+        *parents, field = path.split(".")
+        node = target
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[field] = node.get(field, 0) + value
+
+
+async def _bookings_of(db, business_id: str):
+    projection = {"_id": 0, "id": 1, "business_id": 1, "service_id": 1, "service_name": 1, "date": 1,
+                  "start_time": 1, "end_time": 1, "status": 1, "price": 1}
+    seen = set()
+    # Hot first: a booking caught mid-archival is in both, and counts once
+    for collection in (db.bookings, db.bookings_archive):
+        async for booking in collection.find({"business_id": business_id}, projection):
+            if booking["id"] not in seen:
+                seen.add(booking["id"])
+                yield booking
+
+
+async def rebuild_business(db, business: dict) -> int:
+    """Recompute every rollup of one business from its hot and archived bookings."""
+    # Bookings made before the price was stored on them count at today's price
+    prices = {s["id"]: s.get("price") or 0 for s in business.get("services", [])}
+    rollups: Dict[str, dict] = {}
+    async for booking in _bookings_of(db, business["id"]):
+        rollup = rollups.setdefault(booking["date"], {"business_id": business["id"], "date": booking["date"]})
+        price = booking.get("price", prices.get(booking["service_id"], 0))
+        # A cancelled booking was created first, so it counts on both sides
+        _add(rollup, _changes(booking, cancelled=False, price=price))
+        if booking["status"] == "cancelled":
+            _add(rollup, _changes(booking, cancelled=True, price=price))
+        rollup["services"][booking["service_id"]]["name"] = booking.get("service_name")
+
+    await db.booking_rollups.delete_many({"business_id": business["id"]})
+    if rollups:
+        await db.booking_rollups.insert_many(list(rollups.values()), ordered=False)
+    return len(rollups)
+
+
+async def rebuild(db, business_id: Optional[str] = None) -> dict:
+    """Rebuild rollups for one business, or for all of them.
+
+    Bookings created or cancelled on a business while it is being rebuilt
+    may be missed; run it when traffic is quiet, or again for that business.
+    """
+    query = {"id": business_id} if business_id else {}
+    businesses = days = 0
+    async for business in db.businesses.find(query, {"_id": 0, "id": 1, "services": 1}):
+        days += await rebuild_business(db, business)
+        businesses += 1
+    return {"businesses": businesses, "days": days}
+
+
+async def _main(argv):
+    if len(argv) not in (2, 3) or argv[1] != "rebuild":
+        print("usage: python -m analytics rebuild [business_id]")
+        return 2
+
+    db = await database.connect()
+    try:
+        await indexes.ensure_indexes(db)
+        result = await rebuild(db, argv[2] if len(argv) == 3 else None)
+    finally:
+        await database.close()
+
+    print(f"Rebuilt {result['days']} daily rollups for {result['businesses']} businesses")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv)))
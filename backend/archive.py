@@ -0,0 +1,164 @@
+"""Hot/cold booking storage.
+
+Slot computation, conflict checks and the dashboard's default views only
+look at today and later, so ``bookings`` should hold little else. A
+background job moves bookings dated more than ``ARCHIVE_AFTER_DAYS`` ago to
+``bookings_archive`` in batches and drops their slot claims. The admin
+listing and count read the archive too, but only when the requested range
+starts before today.
+
+Every worker runs the job. A batch is copied with upserts keyed on ``_id``
+and only then deleted, so overlapping runs or a crash between the two
+steps leave at most a duplicate that the next run resolves. Run one pass
+by hand with::
+
+    python -m archive run
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from pymongo import ReplaceOne
+
+import booking_claims
+import database
+import indexes
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# ==============================
+# Settings
+# ==============================
+
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "true").lower() == "true"
+ARCHIVE_AFTER_DAYS = max(1, int(os.getenv("ARCHIVE_AFTER_DAYS", "90")))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+archived_total = metrics.Counter("bookings_archived_total", "Bookings moved to bookings_archive.")
+
+# ==============================
+# Reads
+# ==============================
+
+def today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def reaches_past(date_from: Optional[str]) -> bool:
+    """Whether a range starting at ``date_from`` may include archived bookings."""
+    return date_from is None or date_from < today()
+
+
+def merge_pages(hot: List[dict], cold: List[dict], key_fields: Sequence[str], descending: bool, limit: int) -> List[dict]:
+    """First ``limit`` rows of two keyset pages, without the copy a move in progress may leave."""
+    rows, seen = [], set()
+    for row in sorted(hot + cold, key=lambda r: [r[f] for f in key_fields], reverse=descending):
+        if row["id"] not in seen:
+            seen.add(row["id"])
+            rows.append(row)
+    return rows[:limit]
+
+# ==============================
+# Archival
+# ==============================
+
+async def archive_batch(db, before: str, limit: int = ARCHIVE_BATCH_SIZE) -> Tuple[int, int]:
+    """Move up to ``limit`` bookings dated before ``before``; returns (read, moved)."""
+    docs = await db.bookings.find({"date": {"$lt": before}}).limit(limit).to_list(length=limit)
+    if not docs:
+        return 0, 0
+    archived_at = datetime.now(timezone.utc).isoformat()
+    await db.bookings_archive.bulk_write(
+        [ReplaceOne({"_id": doc["_id"]}, {**doc, "archived_at": archived_at}, upsert=True) for doc in docs],
+        ordered=False,
+    )
+    # A booking cancelled since it was read stays hot and is copied again
+    result = await db.bookings.delete_many({"$or": [{"_id": doc["_id"], "status": doc["status"]} for doc in docs]})
+    await booking_claims.release_many(db, [doc["id"] for doc in docs])
+    archived_total.inc(amount=result.deleted_count)
+    return len(docs), result.deleted_count
+
+
+async def run(db, before: Optional[str] = None) -> int:
+    """Move every booking dated before ``before`` (default: the horizon)."""
+    if before is None:
+        before = (datetime.now(timezone.utc).date() - timedelta(days=ARCHIVE_AFTER_DAYS)).isoformat()
+    moved = 0
+    while True:
+        read, count = await archive_batch(db, before)
+        moved += count
+        if read < ARCHIVE_BATCH_SIZE:
+            return moved
+        await asyncio.sleep(0)  # let requests run between batches
+
+
+class Archiver:
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.archived = 0
+        self.failures = 0
+        self.last_run_at: Optional[str] = None
+
+    def start(self, db):
+        if ARCHIVE_ENABLED:
+            self._task = asyncio.create_task(self._loop(db))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _loop(self, db):
+        while True:
+            try:
+                self.archived += await run(db)
+                self.runs += 1
+                self.last_run_at = datetime.now(timezone.utc).isoformat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.failures += 1
+                logger.warning("Booking archival failed, retrying in %.0fs: %s", ARCHIVE_INTERVAL_SECONDS, exc)
+            await asyncio.sleep(ARCHIVE_INTERVAL_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": ARCHIVE_ENABLED,
+            "running": self._task is not None,
+            "after_days": ARCHIVE_AFTER_DAYS,
+            "runs": self.runs,
+            "archived": self.archived,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at,
+        }
+
+
+archiver = Archiver()
+
+
+async def _main(argv):
+    if argv[1:] != ["run"]:
+        print("usage: python -m archive run")
+        return 2
+
+    db = await database.connect()
+    try:
+        await indexes.ensure_indexes(db)
+        moved = await run(db)
+    finally:
+        await database.close()
+
+    print(f"Archived {moved} bookings dated more than {ARCHIVE_AFTER_DAYS} days ago")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv)))
@@ -0,0 +1,139 @@
+"""JWT authentication for the ``/api/admin/*`` router.
+
+A verified token is cached together with the business it resolves to until
+the token expires (capped by ``AUTH_CACHE_TTL_SECONDS``), so a repeat admin
+request costs no JWT decode and no database round trip. Entries are indexed
+by business, which lets admin writes and revocations evict them precisely.
+
+Revocation: ``revoke_token`` records the token's ``jti`` in
+``revoked_tokens`` (TTL-indexed on the token's expiry) and
+``revoke_all_tokens`` stamps ``tokens_valid_after`` on the business. Both
+take effect immediately on this worker and reach the others over the
+invalidation bus.
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+import jwt
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+import database
+import invalidation
+from cache import BusinessCache
+
+# ==============================
+# Settings
+# ==============================
+
+JWT_SECRET = os.getenv("JWT_SECRET", "change-me")
+JWT_ALGORITHM = "HS256"
+JWT_EXPIRE_HOURS = int(os.getenv("JWT_EXPIRE_HOURS", "168"))
+
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+
+ADMIN_BUSINESS_FIELDS = {"_id": 0, "password_hash": 0, "schedule": 0}
+
+# (token,) -> {"claims": ..., "business": ...}
+token_cache = BusinessCache("tokens", AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+# ==============================
+# Tokens
+# ==============================
+
+def create_token(business_id: str) -> str:
+    now = int(time.time())
+    claims = {
+        "business_id": business_id,
+        "iat": now,
+        "exp": now + JWT_EXPIRE_HOURS * 3600,
+        "jti": uuid.uuid4().hex,
+    }
+    return jwt.encode(claims, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+
+async def revoke_token(token: str, claims: dict):
+    db = database.get_db()
+    if claims.get("jti"):
+        await db.revoked_tokens.update_one(
+            {"jti": claims["jti"]},
+            {"$setOnInsert": {
+                "jti": claims["jti"],
+                "business_id": claims["business_id"],
+                "expires_at": datetime.fromtimestamp(claims["exp"], timezone.utc),
+            }},
+            upsert=True,
+        )
+    token_cache.invalidate(claims["business_id"], lambda key: key[0] == token)
+    # Other workers drop the business's cached tokens and re-verify them
+    invalidation.bus.publish("tokens", claims["business_id"], local=False)
+
+
+async def revoke_all_tokens(business_id: str):
+    db = database.get_db()
+    await db.businesses.update_one({"id": business_id}, {"$set": {"tokens_valid_after": int(time.time())}})
+    invalidation.bus.publish("tokens", business_id)
+
+
+def invalidate_business(business_id: str):
+    """Drop cached business docs after an admin write so handlers see fresh data."""
+    token_cache.invalidate(business_id)
+
+
+invalidation.bus.subscribe("tokens", lambda message: invalidate_business(message["business_id"]))
+invalidation.bus.on_reset(token_cache.invalidate_all)
+
+# ==============================
+# Dependencies
+# ==============================
+
+async def get_auth(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> dict:
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    token = credentials.credentials
+    cached = token_cache.get((token,))
+    if cached is not None:
+        return cached
+
+    try:
+        claims = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM], options={"require": ["exp"]})
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    business_id = claims.get("business_id")
+
+    version = token_cache.version(business_id)
+    db = database.get_db()
+    # Both lookups go out together: one round trip of latency on a miss
+    revoked, business = await asyncio.gather(
+        db.revoked_tokens.find_one({"jti": claims.get("jti")}, {"_id": 1}) if claims.get("jti") else _none(),
+        db.businesses.find_one({"id": business_id}, ADMIN_BUSINESS_FIELDS),
+    )
+    if revoked is not None:
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    if business is None:
+        raise HTTPException(status_code=401, detail="Business not found")
+    if claims.get("iat", 0) < business.pop("tokens_valid_after", 0):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+
+    auth = {"token": token, "claims": claims, "business": business}
+    token_cache.put((token,), auth, version, ttl=claims["exp"] - time.time(), business_id=business_id)
+    return auth
+
+
+async def get_current_business(auth: dict = Depends(get_auth)) -> dict:
+    return auth["business"]
+
+
+async def _none():
+    return None
@@ -0,0 +1,83 @@
+"""Shared helpers for the benchmark scripts."""
+
+import statistics
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from typing import Optional
+
+import httpx
+
+import database
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def summarize(latencies):
+    ms = [v * 1000 for v in latencies]
+    return {
+        "requests": len(ms),
+        "p50": round(percentile(ms, 50), 2),
+        "p95": round(percentile(ms, 95), 2),
+        "p99": round(percentile(ms, 99), 2),
+        "max": round(max(ms), 2),
+        "mean": round(statistics.mean(ms), 2),
+    }
+
+
+def next_weekday(days_ahead: int = 7) -> date:
+    day = date.today() + timedelta(days=days_ahead)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+def use_in_memory_db():
+    """Swap MongoDB for mongomock-motor so a run needs no mongod.
+
+    mongomock runs every query synchronously on the event loop, so under
+    concurrency slow queries stall unrelated requests. Use it for smoke runs
+    and before/after comparisons of the same scenario, not absolute numbers.
+    """
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("❌ --in-memory needs mongomock-motor: pip install mongomock-motor")
+
+    # No tailable cursors or change streams in mongomock; one process anyway
+    import invalidation
+
+    invalidation.bus.mode = "off"
+
+    async def connect():
+        database._client = AsyncMongoMockClient()
+        database._db = database._client[database.DB_NAME]
+        return database._db
+
+    database.connect = connect
+
+
+@asynccontextmanager
+async def app_client(base_url: Optional[str] = None, timeout: float = 60, admission_control: bool = False):
+    """Client for a running server at ``base_url``, or for the app in process.
+
+    In process every request comes from one address, so admission control is
+    off unless the run is about admission control itself.
+    """
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+            yield client
+        return
+
+    import admission
+    import main
+
+    admission.enabled = admission_control
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.lifespan(main.app), httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=timeout
+    ) as client:
+        yield client
@@ -0,0 +1,106 @@
+"""Concurrency test: N simultaneous bookings for the same slot.
+
+Runs the app in process and checks that exactly one request wins while the
+rest fail fast with 409. ``tests/test_double_booking.py`` asserts the same
+under pytest; this script adds timings. Run from ``backend/``::
+
+    # against MONGO_URL (use a throwaway DB_NAME)
+    DB_NAME=bookingking_bench python -m benchmarks.double_booking [requests]
+    # no mongod needed (pip install mongomock-motor)
+    python -m benchmarks.double_booking --in-memory
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+
+import database
+from benchmarks.common import app_client, next_weekday, use_in_memory_db
+
+
+async def run(concurrency):
+    async with app_client() as client:
+        register = await client.post("/api/admin/register", json={
+            "business_name": "Concurrency Test",
+            "email": f"bench_{uuid.uuid4().hex[:12]}@test.com",
+            "password": "bench123",
+        })
+        register.raise_for_status()
+        token, business_id = register.json()["token"], register.json()["business_id"]
+
+        service = await client.post(
+            "/api/admin/services",
+            json={"name": "Haircut", "duration": 30, "price": 25},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        service.raise_for_status()
+
+        payload = {
+            "business_id": business_id,
+            "service_id": service.json()["id"],
+            "date": next_weekday().isoformat(),
+            "start_time": "10:00",
+            "customer_name": "Racer",
+            "customer_email": "racer@test.com",
+            "customer_phone": "+1234567890",
+        }
+
+        async def attempt():
+            started = time.perf_counter()
+            response = await client.post("/api/bookings", json=payload)
+            return response.status_code, time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(attempt() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        db = database.get_db()
+        stored = await db.bookings.count_documents(
+            {"business_id": business_id, "date": payload["date"], "status": "confirmed"}
+        )
+
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    latencies = sorted(latency for _, latency in results)
+
+    return {
+        "requests": concurrency,
+        "statuses": statuses,
+        "bookings_stored": stored,
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_rps": round(concurrency / elapsed, 1),
+        "latency_ms": {
+            "p50": round(latencies[len(latencies) // 2] * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2),
+        },
+        "passed": statuses.get(200) == 1 and statuses.get(409) == concurrency - 1 and stored == 1,
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("requests", type=int, nargs="?", default=200, help="concurrent bookings for the slot")
+    parser.add_argument("--in-memory", action="store_true", help="use mongomock-motor instead of MONGO_URL")
+    parser.add_argument("--output", default="double_booking_results.json")
+    args = parser.parse_args()
+
+    if args.in_memory:
+        use_in_memory_db()
+    result = asyncio.run(run(args.requests))
+
+    print(f"📊 {result['requests']} concurrent bookings: {result['statuses']}")
+    print(f"   stored={result['bookings_stored']} throughput={result['throughput_rps']} req/s "
+          f"p50={result['latency_ms']['p50']}ms max={result['latency_ms']['max']}ms")
+    print("✅ PASS: exactly one booking won" if result["passed"] else "❌ FAIL: double booking or unexpected status")
+
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+    return 0 if result["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
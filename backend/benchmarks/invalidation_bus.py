@@ -0,0 +1,95 @@
+"""Cross-worker invalidation latency against a real mongod.
+
+Starts two buses on separate clients, as two workers would have, publishes
+from one and measures how long each message takes to be applied by the
+other. Needs a mongod at MONGO_URL (tailable cursors and change streams are
+not emulated by mongomock). ``--backend changestream`` needs a replica set;
+a single node is enough::
+
+    mongod --dbpath /tmp/db --replSet rs0 &
+    mongosh --eval 'rs.initiate()'
+
+Run from ``backend/``::
+
+    DB_NAME=bookingking_bench python -m benchmarks.invalidation_bus [--backend capped|changestream|auto]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+import database
+from benchmarks.common import summarize
+from invalidation import InvalidationBus
+
+
+async def run(backend, messages, interval):
+    clients = [AsyncIOMotorClient(database.MONGO_URL, serverSelectionTimeoutMS=5000) for _ in range(2)]
+    sender, follower = InvalidationBus(backend), InvalidationBus(backend)
+    sent_at, latencies = {}, []
+    done = asyncio.Event()
+
+    def received(message):
+        latencies.append(time.perf_counter() - sent_at[message["business_id"]])
+        if len(latencies) == messages:
+            done.set()
+
+    follower.subscribe("slots", received)
+    try:
+        await sender.start(clients[0][database.DB_NAME])
+        await follower.start(clients[1][database.DB_NAME])
+        for _ in range(200):
+            if follower.backend and sender.backend:
+                break
+            await asyncio.sleep(0.05)
+        else:
+            raise SystemExit(f"❌ no MongoDB reachable at {database.MONGO_URL}")
+        await asyncio.sleep(0.5)  # let the follower open its cursor
+
+        for i in range(messages):
+            key = f"bench-{i}"
+            sent_at[key] = time.perf_counter()
+            sender.publish("slots", key, dates=None, service_id=None)
+            await asyncio.sleep(interval)
+        try:
+            await asyncio.wait_for(done.wait(), timeout=10)
+        except asyncio.TimeoutError:
+            pass
+        return {"backend": follower.backend, "sent": messages, "received": len(latencies),
+                **(summarize(latencies) if latencies else {})}
+    finally:
+        await sender.stop()
+        await follower.stop()
+        for client in clients:
+            client.close()
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default="auto", choices=("auto", "capped", "changestream"))
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--interval", type=float, default=0.005, help="seconds between publishes")
+    parser.add_argument("--max-p95-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.backend, args.messages, args.interval))
+
+    print(f"📊 {result['backend']}: {result['received']}/{result['sent']} messages applied by the other worker")
+    if result["received"]:
+        print(f"   publish -> applied  p50={result['p50']}ms p95={result['p95']}ms "
+              f"p99={result['p99']}ms max={result['max']}ms")
+    passed = result["received"] == result["sent"] and result.get("p95", float("inf")) <= args.max_p95_ms
+    print(f"✅ PASS: every message delivered, p95 within {args.max_p95_ms}ms" if passed
+          else f"❌ FAIL: lost messages or p95 above {args.max_p95_ms}ms")
+
+    with open("invalidation_bus_results.json", "w") as f:
+        json.dump(result, f, indent=2)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
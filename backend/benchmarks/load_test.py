@@ -0,0 +1,274 @@
+"""Load test: concurrent widget and admin sessions with per-route latency.
+
+Widget sessions walk the embed flow (profile -> availability -> slots ->
+booking) and admin sessions sign in once and then browse and edit their
+dashboard, all at the same time. Reports throughput and p50/p95/p99 per
+route and saves them as JSON; pass a previous run as ``--baseline`` to flag
+p95 regressions between releases. Run from ``backend/``::
+
+    # app in process against MONGO_URL (use a throwaway DB_NAME)
+    DB_NAME=bookingking_bench python -m benchmarks.load_test
+    # app in process, no mongod needed (pip install mongomock-motor)
+    python -m benchmarks.load_test --in-memory
+    # a server that is already running
+    python -m benchmarks.load_test --base-url http://localhost:8001
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+
+from benchmarks.common import app_client, summarize, use_in_memory_db
+
+PASSWORD = "loadtest123"
+SERVICES = [
+    {"name": "Haircut", "duration": 30, "price": 25},
+    {"name": "Colour", "duration": 90, "price": 80},
+]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.unexpected = defaultdict(int)
+
+    async def call(self, client, route, method, url, expected=(200,), **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.statuses[route][type(exc).__name__] += 1
+            self.unexpected[route] += 1
+            return None
+        self.latencies[route].append(time.perf_counter() - started)
+        self.statuses[route][response.status_code] += 1
+        if response.status_code not in expected:
+            self.unexpected[route] += 1
+        return response
+
+    def report(self, elapsed):
+        routes = {}
+        for route in sorted(self.latencies):
+            routes[route] = {
+                **summarize(self.latencies[route]),
+                "rps": round(len(self.latencies[route]) / elapsed, 1),
+                "statuses": {str(k): v for k, v in self.statuses[route].items()},
+                "unexpected": self.unexpected[route],
+            }
+        return routes
+
+# ==============================
+# Sessions
+# ==============================
+
+async def setup_business(client, index):
+    email = f"load_{uuid.uuid4().hex[:12]}@test.com"
+    register = await client.post("/api/admin/register", json={
+        "business_name": f"Load Test {index}", "email": email, "password": PASSWORD,
+    })
+    register.raise_for_status()
+    headers = {"Authorization": f"Bearer {register.json()['token']}"}
+    services = []
+    for service in SERVICES:
+        response = await client.post("/api/admin/services", json=service, headers=headers)
+        response.raise_for_status()
+        services.append(response.json())
+    return {"id": register.json()["business_id"], "email": email, "services": services}
+
+
+async def widget_session(client, rec, business, rng, stop, think, shed=()):
+    """``shed`` lists the admission-control statuses that count as expected."""
+    ok = (200,) + shed
+    bid = business["id"]
+    first = date.today() + timedelta(days=1)
+    while not stop.is_set():
+        service = rng.choice(business["services"])
+        await rec.call(client, "GET /api/businesses/{id}", "GET", f"/api/businesses/{bid}", expected=ok)
+
+        days = await rec.call(
+            client, "GET /api/businesses/{id}/availability", "GET", f"/api/businesses/{bid}/availability", expected=ok,
+            params={"from": first.isoformat(), "to": (first + timedelta(days=27)).isoformat(),
+                    "service_id": service["id"]},
+        )
+        open_days = [d["date"] for d in days.json() if d["available"]] if days and days.status_code == 200 else []
+        if not open_days:
+            await asyncio.sleep(think)
+            continue
+
+        day = rng.choice(open_days)
+        slots = await rec.call(
+            client, "GET /api/businesses/{id}/slots", "GET", f"/api/businesses/{bid}/slots", expected=ok,
+            params={"date": day, "service_id": service["id"]},
+        )
+        free = [s for s in slots.json() if s["available"]] if slots and slots.status_code == 200 else []
+        if free:
+            # Another session may take the slot first; a 409 is the correct answer then
+            await rec.call(client, "POST /api/bookings", "POST", "/api/bookings", expected=ok + (409,), json={
+                "business_id": bid,
+                "service_id": service["id"],
+                "date": day,
+                "start_time": rng.choice(free)["start_time"],
+                "customer_name": "Load Tester",
+                "customer_email": "customer@test.com",
+                "customer_phone": "+1234567890",
+            })
+        await asyncio.sleep(think)
+
+
+async def admin_session(client, rec, business, rng, stop, think):
+    login = await rec.call(client, "POST /api/admin/login", "POST", "/api/admin/login",
+                           json={"email": business["email"], "password": PASSWORD})
+    if login is None or login.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {login.json()['token']}"}
+    today = date.today().isoformat()
+
+    while not stop.is_set():
+        await rec.call(client, "GET /api/admin/business", "GET", "/api/admin/business", headers=headers)
+        page = await rec.call(
+            client, "GET /api/admin/bookings", "GET", "/api/admin/bookings", headers=headers,
+            params={"status": "confirmed", "from": today, "order": "asc"},
+        )
+        await rec.call(
+            client, "GET /api/admin/bookings/count", "GET", "/api/admin/bookings/count", headers=headers,
+            params={"status": "confirmed", "from": today},
+        )
+
+        roll = rng.random()
+        if roll < 0.2 and page is not None and page.status_code == 200 and page.json():
+            booking = rng.choice(page.json())
+            # Two admins of the same business may race for the same booking
+            await rec.call(client, "DELETE /api/admin/bookings/{id}", "DELETE",
+                           f"/api/admin/bookings/{booking['id']}", expected=(200, 404), headers=headers)
+        elif roll < 0.3:
+            blocked = (date.today() + timedelta(days=rng.randint(30, 60))).isoformat()
+            await rec.call(client, "POST /api/admin/blocked-dates", "POST", "/api/admin/blocked-dates",
+                           headers=headers, json={"date": blocked})
+            await rec.call(client, "DELETE /api/admin/blocked-dates/{date}", "DELETE",
+                           f"/api/admin/blocked-dates/{blocked}", headers=headers)
+        await asyncio.sleep(think)
+
+# ==============================
+# Runner
+# ==============================
+
+async def run(args):
+    rng = random.Random(args.seed)
+    rec = Recorder()
+    async with app_client(args.base_url, admission_control=args.admission) as client:
+        businesses = [await setup_business(client, i) for i in range(args.businesses)]
+
+        stop = asyncio.Event()
+        shed = (429, 503) if args.base_url or args.admission else ()
+        sessions = [
+            widget_session(
+                client, rec, businesses[i % len(businesses)], random.Random(rng.random()), stop, args.think, shed
+            )
+            for i in range(args.widgets)
+        ] + [
+            admin_session(client, rec, businesses[i % len(businesses)], random.Random(rng.random()), stop, args.think)
+            for i in range(args.admins)
+        ]
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(session) for session in sessions]
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    routes = rec.report(elapsed)
+    total = sum(r["requests"] for r in routes.values())
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "target": args.base_url or ("in-process (in-memory db)" if args.in_memory else "in-process"),
+            "businesses": args.businesses,
+            "widget_sessions": args.widgets,
+            "admin_sessions": args.admins,
+            "duration_seconds": args.duration,
+            "think_seconds": args.think,
+            "admission_control": bool(args.base_url) or args.admission,
+        },
+        "summary": {
+            "requests": total,
+            "elapsed_seconds": round(elapsed, 2),
+            "throughput_rps": round(total / elapsed, 1),
+            "unexpected_statuses": sum(r["unexpected"] for r in routes.values()),
+        },
+        "routes": routes,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Return the routes whose p95 grew by more than ``tolerance`` (and 1ms)."""
+    regressions = []
+    for route, now in result["routes"].items():
+        before = baseline.get("routes", {}).get(route)
+        if before is None:
+            continue
+        if now["p95"] > before["p95"] * (1 + tolerance) and now["p95"] - before["p95"] > 1:
+            regressions.append((route, before["p95"], now["p95"]))
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="test a running server instead of the app in process")
+    parser.add_argument("--in-memory", action="store_true", help="use mongomock-motor instead of MONGO_URL")
+    parser.add_argument("--admission", action="store_true",
+                        help="keep per-IP/per-business limits on in process (all sessions share one IP)")
+    parser.add_argument("--businesses", type=int, default=5)
+    parser.add_argument("--widgets", type=int, default=50, help="concurrent widget sessions")
+    parser.add_argument("--admins", type=int, default=5, help="concurrent admin sessions")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load")
+    parser.add_argument("--think", type=float, default=0.0, help="pause between session steps")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--baseline", help="previous results file to compare p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 growth vs. baseline")
+    args = parser.parse_args()
+
+    if args.in_memory:
+        if args.base_url:
+            parser.error("--in-memory only applies to the in-process app")
+        use_in_memory_db()
+
+    result = asyncio.run(run(args))
+
+    summary = result["summary"]
+    print(f"📊 {summary['requests']} requests in {summary['elapsed_seconds']}s "
+          f"({summary['throughput_rps']} req/s) against {result['config']['target']}")
+    for route, stats in result["routes"].items():
+        print(f"   {route:<42} {stats['requests']:>6} req {stats['rps']:>7} req/s  "
+              f"p50={stats['p50']}ms p95={stats['p95']}ms p99={stats['p99']}ms  {stats['statuses']}")
+
+    passed = summary["unexpected_statuses"] == 0
+    print("✅ PASS: no unexpected statuses" if passed
+          else f"❌ FAIL: {summary['unexpected_statuses']} unexpected statuses")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        result["regressions"] = [{"route": r, "baseline_p95": b, "p95": n} for r, b, n in regressions]
+        for route, before, now in regressions:
+            print(f"❌ FAIL: {route} p95 {before}ms -> {now}ms")
+        if not regressions:
+            print(f"✅ PASS: no p95 regressions beyond {args.tolerance:.0%} of {args.baseline}")
+        passed = passed and not regressions
+
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
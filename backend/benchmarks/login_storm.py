@@ -0,0 +1,97 @@
+"""Load test: public slot latency while admin logins hammer bcrypt.
+
+Measures GET /slots latency on its own, then again while waves of
+concurrent logins run. With hashing on the bounded thread pool the two
+distributions should be close; on the event loop every login would add
+~200ms to whatever request is waiting behind it. Run from ``backend/``::
+
+    DB_NAME=bookingking_bench python -m benchmarks.login_storm [logins] [seconds]
+"""
+
+import asyncio
+import json
+import sys
+import time
+import uuid
+
+from benchmarks.common import app_client, next_weekday, summarize
+from passwords import hasher
+
+
+async def probe(client, url, params, stop):
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def run(logins, seconds):
+    async with app_client(timeout=120) as client:
+        credentials = {"email": f"storm_{uuid.uuid4().hex[:12]}@test.com", "password": "storm123"}
+        register = await client.post("/api/admin/register", json={"business_name": "Login Storm", **credentials})
+        register.raise_for_status()
+        token, business_id = register.json()["token"], register.json()["business_id"]
+        service = await client.post(
+            "/api/admin/services",
+            json={"name": "Haircut", "duration": 30, "price": 25},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        service.raise_for_status()
+
+        url = f"/api/businesses/{business_id}/slots"
+        params = {"date": next_weekday().isoformat(), "service_id": service.json()["id"]}
+
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, url, params, stop))
+        await asyncio.sleep(seconds)
+        stop.set()
+        baseline = await task
+
+        statuses = {}
+
+        async def login():
+            response = await client.post("/api/admin/login", json=credentials)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, url, params, stop))
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            await asyncio.gather(*(login() for _ in range(logins)))
+        stop.set()
+        storm = await task
+
+    result = {
+        "logins_per_wave": logins,
+        "login_statuses": statuses,
+        "hasher": hasher.stats(),
+        "slots_baseline_ms": summarize(baseline),
+        "slots_during_storm_ms": summarize(storm),
+    }
+    base, during = result["slots_baseline_ms"]["p95"], result["slots_during_storm_ms"]["p95"]
+    result["flat"] = during <= max(2 * base, base + 10)
+    return result
+
+
+def main_cli():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    result = asyncio.run(run(logins, seconds))
+
+    base, during = result["slots_baseline_ms"], result["slots_during_storm_ms"]
+    print(f"📊 Slots baseline:     p50={base['p50']}ms p95={base['p95']}ms p99={base['p99']}ms ({base['requests']} req)")
+    print(f"📊 Slots during storm: p50={during['p50']}ms p95={during['p95']}ms p99={during['p99']}ms ({during['requests']} req)")
+    print(f"   logins: {result['login_statuses']}  hasher: {result['hasher']}")
+    print("✅ PASS: slot latency stayed flat" if result["flat"] else "❌ FAIL: slot latency degraded during login storm")
+
+    with open("login_storm_results.json", "w") as f:
+        json.dump(result, f, indent=2)
+    return 0 if result["flat"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,164 @@
+"""Benchmark: cost of leaving the metrics middleware and Mongo listener on.
+
+Runs the same sequential workload in fresh processes with
+``METRICS_ENABLED=true`` and ``false``, alternating rounds so drift hits
+both sides equally, and compares per-request p50 latency by route. Also
+times the raw recording primitives. With ``--in-memory`` the Mongo listener
+never fires (mongomock has no command monitoring), so use a real mongod for
+the full picture. Run from ``backend/``::
+
+    DB_NAME=bookingking_bench python -m benchmarks.metrics_overhead [requests] [rounds]
+    python -m benchmarks.metrics_overhead 2000 5 --in-memory
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import uuid
+from types import SimpleNamespace
+
+from benchmarks.common import app_client, next_weekday, percentile, use_in_memory_db
+
+MARKER = "RESULT "
+# Overhead we are happy to pay per request
+BUDGET_US = 50
+BUDGET_PCT = 5
+
+
+async def workload(requests):
+    async with app_client() as client:
+        register = await client.post("/api/admin/register", json={
+            "business_name": "Metrics Overhead",
+            "email": f"metrics_{uuid.uuid4().hex[:12]}@test.com",
+            "password": "bench123",
+        })
+        register.raise_for_status()
+        business_id = register.json()["business_id"]
+        headers = {"Authorization": f"Bearer {register.json()['token']}"}
+        service = await client.post(
+            "/api/admin/services", json={"name": "Haircut", "duration": 30, "price": 25}, headers=headers
+        )
+        service.raise_for_status()
+
+        routes = {
+            "GET /api/health": ("/api/health", {}, None),
+            "GET /api/businesses/{id}/slots": (
+                f"/api/businesses/{business_id}/slots",
+                {"date": next_weekday().isoformat(), "service_id": service.json()["id"]},
+                None,
+            ),
+            # Uncached: one count command per request exercises the Mongo listener
+            "GET /api/admin/bookings/count": ("/api/admin/bookings/count", {}, headers),
+        }
+        results = {}
+        for name, (url, params, route_headers) in routes.items():
+            for _ in range(50):
+                await client.get(url, params=params, headers=route_headers)
+            latencies = []
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = await client.get(url, params=params, headers=route_headers)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+            results[name] = percentile(latencies, 50) * 1_000_000
+    return results
+
+
+def run_child(enabled, requests, in_memory):
+    env = dict(os.environ, METRICS_ENABLED="true" if enabled else "false", EMAIL_TRANSPORT="memory")
+    command = [sys.executable, "-m", "benchmarks.metrics_overhead", "--child", str(requests)]
+    if in_memory:
+        command.append("--in-memory")
+    output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+    line = next(line for line in output.splitlines() if line.startswith(MARKER))
+    return json.loads(line[len(MARKER):])
+
+
+def primitives():
+    import metrics
+
+    histogram = metrics.Histogram("bench_seconds", "benchmark only", ("method", "route"))
+    metrics.REGISTRY.remove(histogram)
+    counter = metrics.Counter("bench_total", "benchmark only", ("method", "route", "status"))
+    metrics.REGISTRY.remove(counter)
+    timer = metrics.CommandTimer()
+    started = SimpleNamespace(request_id=1, connection_id=("localhost", 27017), command_name="find",
+                              command={"find": "bookings", "filter": {}})
+    succeeded = SimpleNamespace(request_id=1, connection_id=("localhost", 27017), duration_micros=850)
+
+    def listener_pair():
+        timer.started(started)
+        timer.succeeded(succeeded)
+
+    n = 200_000
+    return {
+        "histogram_observe_us": round(timeit.timeit(
+            lambda: histogram.observe(("GET", "/api/businesses/{business_id}/slots"), 0.0042), number=n) / n * 1e6, 3),
+        "counter_inc_us": round(timeit.timeit(
+            lambda: counter.inc(("GET", "/api/businesses/{business_id}/slots", "200")), number=n) / n * 1e6, 3),
+        "mongo_listener_pair_us": round(timeit.timeit(listener_pair, number=n) / n * 1e6, 3),
+    }
+
+
+def main_cli():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    in_memory = "--in-memory" in sys.argv
+    if in_memory:
+        use_in_memory_db()
+
+    if "--child" in sys.argv:
+        print(MARKER + json.dumps(asyncio.run(workload(int(args[0])))))
+        return 0
+
+    requests = int(args[0]) if args else 2000
+    rounds = int(args[1]) if len(args) > 1 else 5
+
+    on, off = {}, {}
+    for i in range(rounds):
+        # Alternate which side goes first so warm caches favour neither
+        for enabled in ((True, False) if i % 2 == 0 else (False, True)):
+            for route, p50 in run_child(enabled, requests, in_memory).items():
+                (on if enabled else off).setdefault(route, []).append(p50)
+
+    routes = {}
+    passed = True
+    for route in on:
+        with_metrics, without = statistics.median(on[route]), statistics.median(off[route])
+        overhead = with_metrics - without
+        ok = overhead <= max(BUDGET_US, without * BUDGET_PCT / 100)
+        passed = passed and ok
+        routes[route] = {
+            "p50_us_metrics_on": round(with_metrics, 1),
+            "p50_us_metrics_off": round(without, 1),
+            "overhead_us": round(overhead, 1),
+            "overhead_pct": round(overhead / without * 100, 2),
+            "within_budget": ok,
+        }
+
+    result = {
+        "requests_per_route": requests,
+        "rounds": rounds,
+        "database": "in-memory" if in_memory else "MONGO_URL",
+        "budget": f"<= {BUDGET_US}us or {BUDGET_PCT}% per request",
+        "routes": routes,
+        "primitives": primitives(),
+    }
+
+    for route, stats in routes.items():
+        print(f"📊 {route:<32} off={stats['p50_us_metrics_off']}us on={stats['p50_us_metrics_on']}us "
+              f"overhead={stats['overhead_us']}us ({stats['overhead_pct']}%)")
+    print(f"   primitives: {result['primitives']}")
+    print("✅ PASS: metrics overhead within budget" if passed else "❌ FAIL: metrics overhead above budget")
+
+    with open("metrics_overhead_results.json", "w") as f:
+        json.dump(result, f, indent=2)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
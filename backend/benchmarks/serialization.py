@@ -0,0 +1,113 @@
+"""Micro-benchmark: encoding a 1,000-booking admin response.
+
+Compares FastAPI's default path (jsonable_encoder + stdlib json), the same
+with response_model validation, and ORJSONResponse on the raw DB documents,
+then the bytes on the wire with gzip and brotli at the configured levels.
+Run from ``backend/``::
+
+    python -m benchmarks.serialization [bookings]
+"""
+
+import json
+import random
+import sys
+import timeit
+import uuid
+from datetime import date, timedelta
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+import compression
+from main import Booking
+
+
+def make_bookings(count):
+    rng = random.Random(7)
+    first = date(2026, 1, 5)
+    business_id = str(uuid.uuid4())
+    services = [(str(uuid.uuid4()), name) for name in ("Haircut", "Colour", "Beard Trim", "Wash & Blow-dry")]
+    bookings = []
+    for i in range(count):
+        service_id, service_name = rng.choice(services)
+        start = rng.randrange(9 * 60, 17 * 60, 15)
+        bookings.append({
+            "id": str(uuid.uuid4()),
+            "business_id": business_id,
+            "service_id": service_id,
+            "service_name": service_name,
+            "date": (first + timedelta(days=i // 8)).isoformat(),
+            "start_time": f"{start // 60:02d}:{start % 60:02d}",
+            "end_time": f"{(start + 30) // 60:02d}:{(start + 30) % 60:02d}",
+            "customer_name": f"Customer {i}",
+            "customer_email": f"customer{i}@example.com",
+            "customer_phone": f"+1555{i:07d}",
+            "status": "confirmed" if rng.random() > 0.1 else "cancelled",
+            "created_at": "2026-01-01T12:00:00.000000+00:00",
+        })
+    return bookings
+
+
+def per_call_ms(fn, number):
+    return round(min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000, 3)
+
+
+def compressed(body, encoding):
+    encoder = compression.encoder_for(encoding)
+    return encoder.compress(body) + encoder.finish()
+
+
+def main_cli():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    bookings = make_bookings(count)
+    adapter = TypeAdapter(List[Booking])
+    number = 20
+
+    def default_path():
+        return JSONResponse(jsonable_encoder(bookings)).body
+
+    def validated_path():
+        # What FastAPI does with response_model when a handler returns plain data
+        return JSONResponse(jsonable_encoder(adapter.dump_python(adapter.validate_python(bookings)))).body
+
+    def orjson_path():
+        return ORJSONResponse(bookings).body
+
+    body = orjson_path()
+    assert json.loads(body) == json.loads(default_path())
+
+    timings = {
+        "jsonable_encoder_json_ms": per_call_ms(default_path, number),
+        "response_model_validation_json_ms": per_call_ms(validated_path, number),
+        "orjson_direct_ms": per_call_ms(orjson_path, number),
+    }
+    wire = {"identity_bytes": len(body)}
+    encodings = ["gzip"] + (["br"] if compression.brotli is not None else [])
+    for encoding in encodings:
+        wire[f"{encoding}_bytes"] = len(compressed(body, encoding))
+        wire[f"{encoding}_ms"] = per_call_ms(lambda: compressed(body, encoding), number)
+
+    speedup = timings["jsonable_encoder_json_ms"] / timings["orjson_direct_ms"]
+    result = {"bookings": count, "serialization": timings, "wire": wire, "speedup_vs_default": round(speedup, 1)}
+
+    print(f"📊 {count} bookings")
+    for name, value in timings.items():
+        print(f"   {name:<36} {value}ms")
+    for encoding in ["identity"] + encodings:
+        line = f"   {encoding:<36} {wire[f'{encoding}_bytes']:>8} bytes"
+        if f"{encoding}_ms" in wire:
+            line += f"  ({wire[f'{encoding}_ms']}ms)"
+        print(line)
+    passed = speedup > 1
+    print(f"✅ PASS: orjson path is {speedup:.1f}x faster than the default" if passed
+          else "❌ FAIL: orjson path is not faster than the default")
+
+    with open("serialization_results.json", "w") as f:
+        json.dump(result, f, indent=2)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
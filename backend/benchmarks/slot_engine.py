@@ -0,0 +1,78 @@
+"""Micro-benchmark: interval sweep vs. the per-slot/per-booking scan.
+
+Run from ``backend/``::
+
+    python -m benchmarks.slot_engine
+"""
+
+import random
+import sys
+import timeit
+from datetime import date
+
+from slot_engine import compile_schedule, compute_slots, to_hhmm, to_minutes
+
+DAY = date(2026, 3, 2)  # a Monday
+BUSINESS = {
+    "availability": [{"day": 0, "start_time": "00:00", "end_time": "23:59", "enabled": True}],
+    "blocked_dates": [],
+}
+BUSINESS["schedule"] = compile_schedule(BUSINESS["availability"], BUSINESS["blocked_dates"])
+
+
+def naive_slots(business, service, day, bookings):
+    """Reference implementation: check every slot against every booking."""
+    window = next(a for a in business["availability"] if a["day"] == day.weekday())
+    duration = service["duration"]
+    start, end = to_minutes(window["start_time"]), to_minutes(window["end_time"])
+    slots = []
+    while start + duration <= end:
+        slot_end = start + duration
+        taken = any(
+            to_minutes(b["start_time"]) < slot_end and to_minutes(b["end_time"]) > start
+            for b in bookings
+        )
+        slots.append({"start_time": to_hhmm(start), "end_time": to_hhmm(slot_end), "available": not taken})
+        start = slot_end
+    return slots
+
+
+def make_bookings(count, rng):
+    bookings = []
+    for _ in range(count):
+        start = rng.randrange(0, 23 * 60)
+        length = rng.choice((5, 10, 15, 30))
+        bookings.append({"start_time": to_hhmm(start), "end_time": to_hhmm(start + length)})
+    return bookings
+
+
+def bench(func, *args, repeat=5):
+    runs = max(1, int(0.2 / max(timeit.timeit(lambda: func(*args), number=1), 1e-6)))
+    best = min(timeit.repeat(lambda: func(*args), number=runs, repeat=repeat))
+    return best / runs * 1000
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'bookings':>8} {'duration':>8} {'slots':>6} {'naive ms':>10} {'engine ms':>10} {'speedup':>8}")
+
+    for count in (50, 500, 1000, 2000, 5000):
+        bookings = make_bookings(count, rng)
+        for duration in (5, 15):
+            service = {"duration": duration}
+            expected = naive_slots(BUSINESS, service, DAY, bookings)
+            if compute_slots(BUSINESS, service, DAY, bookings) != expected:
+                print("❌ engine output differs from reference implementation")
+                return 1
+
+            naive_ms = bench(naive_slots, BUSINESS, service, DAY, bookings)
+            engine_ms = bench(compute_slots, BUSINESS, service, DAY, bookings)
+            print(
+                f"{count:>8} {duration:>8} {len(expected):>6} "
+                f"{naive_ms:>10.3f} {engine_ms:>10.3f} {naive_ms / engine_ms:>7.1f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Micro-benchmark: memory per idle SSE subscriber and publish fan-out time.
+
+Opens N subscribers on one business (spread over its "all" channel and 30
+date channels), each with a task parked in ``Subscriber.wait`` the way an
+open stream is, and measures the traced memory they hold. Then publishes
+slot events and times delivery until every subscriber has been woken. Run
+from ``backend/``::
+
+    python -m benchmarks.sse_fanout [subscribers]
+"""
+
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+import events
+
+BUSINESS_ID = "bench-business"
+DATES = [f"2030-01-{d:02d}" for d in range(1, 31)]
+
+
+async def drain(subscriber, received):
+    while not subscriber.closed:
+        frames = await subscriber.wait(3600)
+        received[0] += len(frames)
+
+
+async def run(count):
+    broker = events.Broker(count)
+    events.broker = broker
+    received = [0]
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    subscribers = [
+        broker.subscribe(BUSINESS_ID, events.ALL_DATES if i % 2 else DATES[i % len(DATES)])
+        for i in range(count)
+    ]
+    tasks = [asyncio.create_task(drain(s, received)) for s in subscribers]
+    await asyncio.sleep(0)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    per_subscriber = sum(s.size_diff for s in after.compare_to(before, "filename")) / count
+
+    booking = {"date": DATES[0], "start_time": "10:00", "end_time": "11:00", "id": "x", "business_id": BUSINESS_ID}
+    targets = sum(1 for s in subscribers if s.channel in (events.ALL_DATES, DATES[0]))
+    rounds = 20
+    publish_seconds, deliver_seconds = [], []
+    for _ in range(rounds):
+        received[0] = 0
+        started = time.perf_counter()
+        events.publish_booking_created(booking)
+        publish_seconds.append(time.perf_counter() - started)
+        while received[0] < targets:
+            await asyncio.sleep(0)
+        deliver_seconds.append(time.perf_counter() - started)
+
+    for s in subscribers:
+        s.close()
+    await asyncio.gather(*tasks)
+    return {
+        "subscribers": count,
+        "subscribers_per_event": targets,
+        "bytes_per_idle_subscriber": round(per_subscriber),
+        "publish_ms": round(min(publish_seconds) * 1000, 3),
+        "deliver_all_ms": round(min(deliver_seconds) * 1000, 3),
+    }
+
+
+def main_cli():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    result = asyncio.run(run(count))
+
+    print(f"📊 {result['subscribers']} idle subscribers, {result['subscribers_per_event']} per slot event")
+    print(f"   memory per idle subscriber (incl. its task)  {result['bytes_per_idle_subscriber']} bytes")
+    print(f"   publish (encode once + append to each)      {result['publish_ms']}ms")
+    print(f"   until every subscriber has woken            {result['deliver_all_ms']}ms")
+    passed = result["bytes_per_idle_subscriber"] < 4096
+    print("✅ PASS: idle subscribers stay under 4KB each" if passed
+          else "❌ FAIL: idle subscribers use 4KB or more each")
+
+    with open("sse_fanout_results.json", "w") as f:
+        json.dump(result, f, indent=2)
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
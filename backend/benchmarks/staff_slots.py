@@ -0,0 +1,110 @@
+"""Micro-benchmark: multi-staff slot generation, merged ranges vs. the naive scan.
+
+Every member's day is packed with bookings, leaving short random gaps, and
+the naive reference checks every slot against every qualified member's
+bookings. Fails if the engine's output differs or a day takes longer than
+``BUDGET_MS``. Run from ``backend/``::
+
+    python -m benchmarks.staff_slots [staff_count]
+"""
+
+import random
+import sys
+from datetime import date
+
+from benchmarks.slot_engine import bench
+from slot_engine import compile_schedule, compute_slots, qualified_staff, to_hhmm, to_minutes
+
+DAY = date(2026, 3, 2)  # a Monday
+OPEN, CLOSE = "07:00", "21:00"
+BUDGET_MS = 10.0
+
+AVAILABILITY = [{"day": 0, "start_time": OPEN, "end_time": CLOSE, "enabled": True}]
+SERVICES = [{"id": f"s{i}", "duration": duration} for i, duration in enumerate((5, 15, 30, 60, 90))]
+
+
+def make_business(staff_count, rng):
+    staff = []
+    for i in range(staff_count):
+        # Most members do everything; the rest a random subset
+        service_ids = None if i % 3 else rng.sample([s["id"] for s in SERVICES], 3)
+        staff.append({"id": f"m{i}", "name": f"Member {i}", "service_ids": service_ids})
+    return {
+        "availability": AVAILABILITY,
+        "schedule": compile_schedule(AVAILABILITY, []),
+        "services": SERVICES,
+        "staff": staff,
+    }
+
+
+def make_bookings(staff, rng):
+    """Back-to-back bookings per member with the odd short gap, as on a busy day."""
+    bookings = []
+    for member in staff:
+        minute = to_minutes(OPEN)
+        while True:
+            minute += rng.choice((0, 0, 0, 5, 10, 15, 30))
+            length = rng.choice((15, 30, 45, 60))
+            if minute + length > to_minutes(CLOSE):
+                break
+            bookings.append({
+                "start_time": to_hhmm(minute), "end_time": to_hhmm(minute + length), "staff_id": member["id"],
+            })
+            minute += length
+    rng.shuffle(bookings)
+    return bookings
+
+
+def naive_slots(business, service, day, bookings):
+    """Reference implementation: every slot against every qualified member's bookings."""
+    duration = service["duration"]
+    start, end = to_minutes(OPEN), to_minutes(CLOSE)
+    members = qualified_staff(business, service)
+    slots = []
+    while start + duration <= end:
+        slot_end = start + duration
+        available = any(
+            not any(
+                b["staff_id"] == member["id"]
+                and to_minutes(b["start_time"]) < slot_end and to_minutes(b["end_time"]) > start
+                for b in bookings
+            )
+            for member in members
+        )
+        slots.append({"start_time": to_hhmm(start), "end_time": to_hhmm(slot_end), "available": available})
+        start = slot_end
+    return slots
+
+
+def main(argv):
+    staff_count = int(argv[1]) if len(argv) > 1 else 50
+    rng = random.Random(42)
+    business = make_business(staff_count, rng)
+    bookings = make_bookings(business["staff"], rng)
+    print(f"{staff_count} staff, {len(bookings)} bookings, open {OPEN}-{CLOSE}")
+    print(f"{'duration':>8} {'slots':>6} {'open':>5} {'naive ms':>10} {'engine ms':>10} {'speedup':>8}")
+
+    worst = 0.0
+    for service in SERVICES:
+        expected = naive_slots(business, service, DAY, bookings)
+        if compute_slots(business, service, DAY, bookings) != expected:
+            print("❌ engine output differs from reference implementation")
+            return 1
+
+        naive_ms = bench(naive_slots, business, service, DAY, bookings, repeat=3)
+        engine_ms = bench(compute_slots, business, service, DAY, bookings)
+        worst = max(worst, engine_ms)
+        print(
+            f"{service['duration']:>8} {len(expected):>6} {sum(s['available'] for s in expected):>5} "
+            f"{naive_ms:>10.3f} {engine_ms:>10.3f} {naive_ms / engine_ms:>7.1f}x"
+        )
+
+    if worst > BUDGET_MS:
+        print(f"❌ slowest day took {worst:.2f} ms, budget is {BUDGET_MS} ms")
+        return 1
+    print(f"✅ slowest day took {worst:.2f} ms (budget {BUDGET_MS} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,193 @@
+"""Double-booking prevention through unique slot claims.
+
+A confirmed booking owns one ``slot_claims`` document per minute it covers.
+The unique ``(business_id, date, minute, resource)`` index declared in
+``indexes.py`` makes MongoDB itself reject any overlapping booking, so no
+read-then-insert check, lock or transaction is needed: the first writer to
+reach a minute wins and everybody else gets a duplicate-key error
+immediately. ``resource`` is the staff member a booking is assigned to; it
+is absent for businesses without staff, which are a single resource.
+
+Slot holds (see ``holds.py``) are claims with an ``expires_at``; a TTL
+index removes them after expiry, and a booking takes a hold over by
+re-pointing its claims, so the minutes are never free in between.
+
+A booking's claims are written before the booking itself, so they start
+out pending: they expire after ``CLAIM_PENDING_SECONDS`` like a hold's,
+and ``confirm`` clears that once the booking is stored. Claims left behind
+by a worker that died in between therefore free the slot again instead of
+blocking it forever.
+
+Run ``python -m booking_claims backfill`` once to create claims for
+bookings that were made before claims existed.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from pymongo.errors import BulkWriteError
+
+import database
+import indexes
+from slot_engine import to_minutes
+
+DUPLICATE_KEY = 11000
+
+CLAIM_PENDING_SECONDS = int(os.getenv("CLAIM_PENDING_SECONDS", "60"))
+
+
+class SlotTaken(Exception):
+    pass
+
+
+def claim_documents(
+    business_id: str,
+    date: str,
+    start: int,
+    end: int,
+    booking_id: str,
+    expires_at: Optional[datetime] = None,
+    resource: Optional[str] = None,
+):
+    extra = {"expires_at": expires_at} if expires_at is not None else {}
+    if resource is not None:
+        extra["resource"] = resource
+    return [
+        {"business_id": business_id, "date": date, "minute": minute, "booking_id": booking_id, **extra}
+        for minute in range(start, end)
+    ]
+
+
+async def claim(
+    db,
+    business_id: str,
+    date: str,
+    start: int,
+    end: int,
+    booking_id: str,
+    expires_at: Optional[datetime] = None,
+    resource: Optional[str] = None,
+):
+    """Claim ``[start, end)`` of ``resource`` for ``booking_id`` (a hold if ``expires_at``) or raise ``SlotTaken``."""
+    for attempt in range(2):
+        try:
+            # Ordered: the batch stops at the first minute someone else owns.
+            await db.slot_claims.insert_many(
+                claim_documents(business_id, date, start, end, booking_id, expires_at, resource), ordered=True
+            )
+            return
+        except BulkWriteError as exc:
+            if not any(err.get("code") == DUPLICATE_KEY for err in exc.details.get("writeErrors", [])):
+                raise
+            await release(db, booking_id)
+            # Expired holds linger until the TTL monitor's next pass (up to a minute)
+            if attempt or not await purge_expired(db, business_id, date, start, end):
+                raise SlotTaken() from exc
+
+
+def pending_until() -> datetime:
+    """Expiry for a booking's claims until ``confirm``."""
+    return datetime.now(timezone.utc) + timedelta(seconds=CLAIM_PENDING_SECONDS)
+
+
+async def confirm(db, booking_id: str):
+    """Make a stored booking's claims permanent."""
+    await db.slot_claims.update_many({"booking_id": booking_id}, {"$unset": {"expires_at": ""}})
+
+
+async def purge_expired(db, business_id: str, date: str, start: int, end: int) -> int:
+    result = await db.slot_claims.delete_many({
+        "business_id": business_id,
+        "date": date,
+        "minute": {"$gte": start, "$lt": end},
+        "expires_at": {"$lte": datetime.now(timezone.utc)},
+    })
+    return result.deleted_count
+
+
+async def convert_hold(
+    db, hold_id: str, business_id: str, date: str, start: int, end: int, booking_id: str, expires_at: datetime
+) -> bool:
+    """Hand the live hold's claims on ``[start, end)`` to ``booking_id``.
+
+    One update re-points the claims and sets their expiry to ``expires_at``
+    (see ``pending_until``) until ``confirm``; they keep their
+    ``resource``, so the booking gets the hold's staff member. Returns
+    False, leaving nothing claimed by either id, if the hold does not cover
+    the whole range or lapsed first.
+    """
+    result = await db.slot_claims.update_many(
+        {
+            "booking_id": hold_id,
+            "business_id": business_id,
+            "date": date,
+            "minute": {"$gte": start, "$lt": end},
+            "expires_at": {"$gt": datetime.now(timezone.utc)},
+        },
+        {"$set": {"booking_id": booking_id, "expires_at": expires_at}},
+    )
+    converted = result.modified_count == end - start
+    if not converted:
+        await release(db, booking_id)
+    # Minutes the hold covered beyond this booking, if any
+    await release(db, hold_id)
+    return converted
+
+
+async def release(db, booking_id: str):
+    await db.slot_claims.delete_many({"booking_id": booking_id})
+
+
+async def release_many(db, booking_ids: List[str]):
+    await db.slot_claims.delete_many({"booking_id": {"$in": booking_ids}})
+
+
+async def backfill(db) -> dict:
+    """Create missing claims for confirmed bookings; report any overlaps."""
+    created, conflicts = 0, []
+    cursor = db.bookings.find(
+        {"status": "confirmed"},
+        {"_id": 0, "id": 1, "business_id": 1, "date": 1, "start_time": 1, "end_time": 1, "staff_id": 1},
+    )
+    async for booking in cursor:
+        if await db.slot_claims.find_one({"booking_id": booking["id"]}, {"_id": 1}):
+            continue
+        try:
+            await claim(
+                db,
+                booking["business_id"],
+                booking["date"],
+                to_minutes(booking["start_time"]),
+                to_minutes(booking["end_time"]),
+                booking["id"],
+                resource=booking.get("staff_id"),
+            )
+            created += 1
+        except SlotTaken:
+            conflicts.append(booking["id"])
+    return {"claimed": created, "conflicts": conflicts}
+
+
+async def _main(argv):
+    if argv[1:] != ["backfill"]:
+        print("usage: python -m booking_claims backfill")
+        return 2
+
+    db = await database.connect()
+    try:
+        await indexes.ensure_indexes(db)
+        result = await backfill(db)
+    finally:
+        await database.close()
+
+    print(f"Claimed {result['claimed']} bookings")
+    for booking_id in result["conflicts"]:
+        print(f"⚠️  Overlapping booking left unclaimed: {booking_id}")
+    return 1 if result["conflicts"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv)))
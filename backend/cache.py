@@ -0,0 +1,144 @@
+"""In-process LRU/TTL cache for per-business read paths.
+
+Every entry is indexed by the business it belongs to (by default the first
+element of its tuple key) so writes can evict exactly the entries of the
+tenant they touched. All operations are synchronous and run on the event
+loop thread, so no locking is needed.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+Key = Tuple[Hashable, ...]
+
+_MISSING = object()
+
+
+class BusinessCache:
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (expires_at, value, business_id)
+        self._entries: "OrderedDict[Key, Tuple[float, Any, Hashable]]" = OrderedDict()
+        self._by_business: Dict[Hashable, Set[Key]] = {}
+        self._versions: Dict[Hashable, int] = {}
+        # Bumped by invalidate_all; part of every business's version
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    # ------------------------------
+    # Reads / writes
+    # ------------------------------
+
+    def version(self, business_id: Hashable) -> int:
+        """Snapshot to pass to ``put`` so a fill racing with a write is dropped."""
+        return self._generation + self._versions.get(business_id, 0)
+
+    def get(self, key: Key, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(
+        self,
+        key: Key,
+        value: Any,
+        version: Optional[int] = None,
+        ttl: Optional[float] = None,
+        business_id: Optional[Hashable] = None,
+    ) -> None:
+        if business_id is None:
+            business_id = key[0]
+        if version is not None and version != self.version(business_id):
+            return
+
+        ttl = self.ttl_seconds if ttl is None else min(ttl, self.ttl_seconds)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, value, business_id)
+        self._by_business.setdefault(business_id, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    # ------------------------------
+    # Invalidation
+    # ------------------------------
+
+    def invalidate(self, business_id: Hashable, match: Optional[Callable[[Key], bool]] = None) -> int:
+        """Drop the business's entries (optionally only those ``match`` accepts)."""
+        self._versions[business_id] = self._versions.get(business_id, 0) + 1
+
+        keys = self._by_business.get(business_id)
+        if not keys:
+            return 0
+        doomed = [k for k in keys if match is None or match(k)]
+        for key in doomed:
+            self._remove(key)
+        self.invalidations += len(doomed)
+        return len(doomed)
+
+    def invalidate_all(self) -> int:
+        """Drop every entry, and any fill already in flight for any business."""
+        self._generation += 1
+        dropped = len(self._entries)
+        self._entries.clear()
+        self._by_business.clear()
+        self.invalidations += dropped
+        return dropped
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_business.clear()
+        self._versions.clear()
+
+    def _remove(self, key: Key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        business_id = entry[2]
+        keys = self._by_business.get(business_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_business[business_id]
+
+    # ------------------------------
+    # Stats
+    # ------------------------------
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import os
+
+# ==============================
+# Connection Settings
+# ==============================
+#
+# Every knob can be overridden through the environment so the pool can be
+# sized per deployment without a code change.
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = os.getenv("DB_NAME", "bookingking")
+
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "200"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "10000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+MONGO_WARMUP_CONNECTIONS = int(os.getenv("MONGO_WARMUP_CONNECTIONS", str(MONGO_MIN_POOL_SIZE)))
+
+# Motor runs every pymongo call on its own thread pool, sized once at import
+# time. Match it to the connection pool so the pool is actually reachable.
+os.environ.setdefault("MOTOR_MAX_WORKERS", str(MONGO_MAX_POOL_SIZE))
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase  # noqa: E402
+
+import metrics  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_db = None
+
+# ==============================
+# Lifecycle
+# ==============================
+
+async def connect() -> AsyncIOMotorDatabase:
+    global _client, _db
+
+    _client = AsyncIOMotorClient(
+        MONGO_URL,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+        connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        uuidRepresentation="standard",
+        event_listeners=[metrics.command_timer] if metrics.METRICS_ENABLED else [],
+    )
+    _db = _client[DB_NAME]
+
+    await warm_up()
+    return _db
+
+
+async def warm_up():
+    # Open the first connections before traffic arrives so the first burst
+    # of widget requests does not pay for TCP/TLS handshakes.
+    await _client.admin.command("ping")
+    if MONGO_WARMUP_CONNECTIONS > 1:
+        await asyncio.gather(
+            *(_client.admin.command("ping") for _ in range(MONGO_WARMUP_CONNECTIONS))
+        )
+    logger.info("MongoDB connected (%s, pool %d-%d)", DB_NAME, MONGO_MIN_POOL_SIZE, MONGO_MAX_POOL_SIZE)
+
+
+async def close():
+    global _client, _db
+
+    if _client is not None:
+        _client.close()
+        logger.info("Database connection closed")
+    _client = None
+    _db = None
+
+# ==============================
+# Accessors
+# ==============================
+
+def get_client() -> AsyncIOMotorClient:
+    if _client is None:
+        raise RuntimeError("Database is not connected")
+    return _client
+
+
+def get_db() -> AsyncIOMotorDatabase:
+    if _db is None:
+        raise RuntimeError("Database is not connected")
+    return _db
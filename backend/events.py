@@ -0,0 +1,239 @@
+"""Live updates over Server-Sent Events, fed by an in-process pub/sub.
+
+Booking and admin routes ``publish_*`` after their write succeeds; the SSE
+routes ``subscribe`` and hand the subscriber to an ``EventStream`` response.
+Each event is encoded into its SSE frame once and the same bytes object is
+appended to every matching subscriber, so fan-out is a list append per
+connection. An idle subscriber is a slotted object and an empty list, plus
+one pending future and timer while it waits for the next keep-alive.
+
+Channels are per business: ``"admin"`` (booking details, dashboard only),
+``"all"`` (public slot events for every date) and one per date for widgets
+that only watch the day on screen. Events travel between worker processes
+on the invalidation bus, so a stream sees bookings made on any worker.
+
+A client that falls ``EVENTS_BUFFER`` frames behind is disconnected rather
+than buffered without bound; ``EventSource`` reconnects on its own and the
+client refetches.
+"""
+
+import asyncio
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+import orjson
+from starlette.responses import Response
+
+import invalidation
+import metrics
+
+# ==============================
+# Settings
+# ==============================
+
+EVENTS_ENABLED = os.getenv("EVENTS_ENABLED", "true").lower() == "true"
+EVENTS_MAX_SUBSCRIBERS = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "10000"))
+EVENTS_BUFFER = int(os.getenv("EVENTS_BUFFER", "100"))
+# Comment frames keep proxies from closing idle streams and surface dead clients
+EVENTS_KEEPALIVE_SECONDS = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", "3000"))
+
+ADMIN = "admin"
+ALL_DATES = "all"
+
+subscribers_gauge = metrics.Gauge("sse_subscribers", "Open Server-Sent Events streams.")
+published_total = metrics.Counter("sse_events_published_total", "Events published to subscribers.", ("event",))
+dropped_total = metrics.Counter("sse_subscribers_dropped_total", "Streams closed for falling behind.")
+
+# ==============================
+# Subscribers
+# ==============================
+
+class Subscriber:
+    __slots__ = ("business_id", "channel", "closed", "_frames", "_waiter")
+
+    def __init__(self, business_id: str, channel: str):
+        self.business_id = business_id
+        self.channel = channel
+        self.closed = False
+        self._frames: List[bytes] = []
+        self._waiter: Optional[asyncio.Future] = None
+
+    def push(self, frame: bytes):
+        if self.closed:
+            return
+        if len(self._frames) >= EVENTS_BUFFER:
+            dropped_total.inc()
+            self.close()
+            return
+        self._frames.append(frame)
+        self._wake()
+
+    def close(self):
+        self.closed = True
+        self._wake()
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def wait(self, timeout: float) -> List[bytes]:
+        """Frames queued since the last call; empty after ``timeout`` idle seconds."""
+        if not self._frames and not self.closed:
+            loop = asyncio.get_running_loop()
+            self._waiter = loop.create_future()
+            timer = loop.call_later(timeout, self._wake)
+            try:
+                await self._waiter
+            finally:
+                timer.cancel()
+                self._waiter = None
+        frames, self._frames = self._frames, []
+        return frames
+
+
+class Broker:
+    def __init__(self, max_subscribers: int):
+        self.max_subscribers = max_subscribers
+        self.count = 0
+        # business_id -> channel -> subscribers
+        self._channels: Dict[str, Dict[str, Set[Subscriber]]] = {}
+
+    def subscribe(self, business_id: str, channel: str) -> Optional[Subscriber]:
+        """Register a subscriber, or return None when the worker is at capacity."""
+        if self.count >= self.max_subscribers:
+            return None
+        subscriber = Subscriber(business_id, channel)
+        self._channels.setdefault(business_id, {}).setdefault(channel, set()).add(subscriber)
+        self.count += 1
+        subscribers_gauge.inc()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        channels = self._channels.get(subscriber.business_id)
+        members = channels.get(subscriber.channel) if channels else None
+        if members is None or subscriber not in members:
+            return
+        members.discard(subscriber)
+        if not members:
+            del channels[subscriber.channel]
+            if not channels:
+                del self._channels[subscriber.business_id]
+        self.count -= 1
+        subscribers_gauge.dec()
+
+    def publish(self, business_id: str, channels: Optional[Iterable[str]], frame: bytes):
+        """Deliver ``frame`` to the given channels, or to every channel if None."""
+        by_channel = self._channels.get(business_id)
+        if not by_channel:
+            return
+        targets = by_channel.values() if channels is None else (by_channel.get(c, ()) for c in channels)
+        for members in list(targets):
+            for subscriber in list(members):
+                subscriber.push(frame)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": EVENTS_ENABLED,
+            "subscribers": self.count,
+            "max_subscribers": self.max_subscribers,
+            "businesses": len(self._channels),
+        }
+
+
+broker = Broker(EVENTS_MAX_SUBSCRIBERS)
+
+invalidation.bus.subscribe("event", lambda m: broker.publish(m["business_id"], m["channels"], m["frame"]))
+
+# ==============================
+# Publishing
+# ==============================
+
+def encode(event: str, data) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+def _publish(business_id: str, channels: Optional[Iterable[str]], event: str, data):
+    if not EVENTS_ENABLED:
+        return
+    published_total.inc((event,))
+    invalidation.bus.publish(
+        "event", business_id, channels=list(channels) if channels is not None else None, frame=encode(event, data)
+    )
+
+
+def _slot(booking: dict) -> dict:
+    slot = {"date": booking["date"], "start_time": booking["start_time"], "end_time": booking["end_time"]}
+    if booking.get("staff_id"):
+        # Only this member is taken; others may still have the slot free
+        slot["staff_id"] = booking["staff_id"]
+    return slot
+
+
+def publish_booking_created(booking: dict):
+    business_id = booking["business_id"]
+    _publish(business_id, (ALL_DATES, booking["date"]), "slot-taken", _slot(booking))
+    _publish(business_id, (ADMIN,), "booking-created", booking)
+
+
+def publish_booking_cancelled(booking: dict):
+    business_id = booking["business_id"]
+    _publish(business_id, (ALL_DATES, booking["date"]), "slot-freed", _slot(booking))
+    _publish(business_id, (ADMIN,), "booking-cancelled", {"id": booking["id"], **_slot(booking)})
+
+
+def publish_schedule_changed(business_id: str, dates: Optional[Iterable[str]] = None):
+    """Opening hours or blocked dates changed; ``dates=None`` means any date."""
+    if dates is None:
+        _publish(business_id, None, "schedule-changed", {"dates": None})
+        return
+    dates = sorted(dates)
+    _publish(business_id, (ALL_DATES, ADMIN, *dates), "schedule-changed", {"dates": dates})
+
+# ==============================
+# Response
+# ==============================
+
+class EventStream(Response):
+    """``text/event-stream`` response that relays one subscriber until disconnect."""
+
+    media_type = "text/event-stream"
+
+    def __init__(self, subscriber: Subscriber, headers: Optional[dict] = None):
+        self.subscriber = subscriber
+        self.status_code = 200
+        self.background = None
+        self.init_headers({
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # nginx: pass frames through unbuffered
+            **(headers or {}),
+        })
+
+    async def __call__(self, scope, receive, send):
+        subscriber = self.subscriber
+
+        async def watch_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            subscriber.close()
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await send({
+                "type": "http.response.body",
+                "body": f"retry: {EVENTS_RETRY_MS}\n\n".encode(),
+                "more_body": True,
+            })
+            while not subscriber.closed:
+                frames = await subscriber.wait(EVENTS_KEEPALIVE_SECONDS)
+                body = b"".join(frames) if frames else b": keep-alive\n\n"
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+            if not watcher.done():
+                # Closed by the server (client fell behind): end the response cleanly
+                await send({"type": "http.response.body", "body": b""})
+        except OSError:
+            pass  # client went away mid-write
+        finally:
+            watcher.cancel()
+            broker.unsubscribe(subscriber)
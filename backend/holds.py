@@ -0,0 +1,94 @@
+"""Short-lived slot holds.
+
+A visitor who picks a time gets a hold for ``HOLD_SECONDS`` while they type
+their details. The hold owns the slot's minutes in ``slot_claims`` exactly
+as a booking would, so nobody else can book or hold it meanwhile, and
+``POST /api/bookings`` with the ``hold_id`` takes the claims over instead
+of racing for them (``booking_claims.convert_hold``). At a business with
+staff, the hold is for one member (``staff.assign``) and so is the booking.
+
+``slot_holds`` keeps one small document per hold for the slot engine, which
+counts live holds as busy. Both collections carry ``expires_at`` under a
+TTL index, and every read also filters on it, since the TTL monitor only
+runs once a minute.
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+
+import booking_claims
+import staff
+from slot_engine import to_hhmm
+
+HOLD_SECONDS = int(os.getenv("HOLD_SECONDS", "300"))
+
+BUSY_FIELDS = {"_id": 0, "date": 1, "start_time": 1, "end_time": 1, "staff_id": 1, "expires_at": 1}
+
+
+def _aware(value: datetime) -> datetime:
+    # pymongo hands BSON dates back as naive UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+async def create(
+    db, business: dict, service: dict, date: str, start: int, end: int, bookings: Iterable[dict] = ()
+) -> dict:
+    """Hold ``[start, end)`` or raise ``booking_claims.SlotTaken``.
+
+    ``bookings`` are the day's confirmed bookings and live holds, which a
+    business with staff needs to pick a free member.
+    """
+    hold = {
+        "id": str(uuid.uuid4()),
+        "business_id": business["id"],
+        "service_id": service["id"],
+        "date": date,
+        "start_time": to_hhmm(start),
+        "end_time": to_hhmm(end),
+        "expires_at": datetime.now(timezone.utc) + timedelta(seconds=HOLD_SECONDS),
+    }
+    member = await staff.assign(
+        db, business, service, date, start, end, hold["id"], bookings, expires_at=hold["expires_at"]
+    )
+    if member is not None:
+        hold["staff_id"] = member["id"]
+    try:
+        await db.slot_holds.insert_one(dict(hold))
+    except Exception:
+        await booking_claims.release(db, hold["id"])
+        raise
+    return hold
+
+
+async def release(db, hold_id: str) -> Optional[dict]:
+    """Drop a hold and free its minutes; returns the hold if it existed."""
+    hold = await db.slot_holds.find_one_and_delete({"id": hold_id}, projection={"_id": 0})
+    await booking_claims.release(db, hold_id)
+    return hold
+
+
+async def find(db, hold_id: str) -> Optional[dict]:
+    return await db.slot_holds.find_one({"id": hold_id}, {"_id": 0})
+
+
+async def forget(db, hold_id: str):
+    """Drop the hold document once a booking has taken its claims over."""
+    await db.slot_holds.delete_one({"id": hold_id})
+
+
+async def active(db, business_id: str, date_filter) -> List[dict]:
+    """Live holds of a business on the dates ``date_filter`` matches."""
+    return await db.slot_holds.find(
+        {"business_id": business_id, "date": date_filter, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+        BUSY_FIELDS,
+    ).to_list(length=None)
+
+
+def seconds_left(held: List[dict]) -> Optional[float]:
+    """How long a result computed with ``held`` stays true; None if no holds."""
+    if not held:
+        return None
+    first = min(_aware(h["expires_at"]) for h in held)
+    return max(0.0, (first - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,220 @@
+"""``Idempotency-Key`` support for mutating API routes.
+
+A client that may retry (a widget on a flaky connection) sends the same
+random key with every attempt. The first attempt runs normally and its
+successful response is stored in ``idempotency_keys`` for
+``IDEMPOTENCY_TTL_SECONDS``. Later attempts get that response back, with
+``Idempotent-Replayed: true``, from an in-process cache or one lookup by
+``_id``, without running the handler or writing anything. The route's own
+dependencies still run first, so a replay needs a token that is valid now
+and passes admission control like any other request.
+
+Keys are scoped to the route and the ``Authorization`` header, and tied to
+a hash of the request body: reusing one with a different body is a 422.
+While the first attempt is still running, a retry waits up to
+``IDEMPOTENCY_WAIT_SECONDS`` for it and then gets a 409. Failed attempts
+(any non-2xx response or error) are not stored, so a retry runs again.
+
+Routers opt in with ``route_class=IdempotentRoute``; requests without the
+header, and reads, take the normal path, and so do endpoints marked
+``@exempt``. Sign-in and sign-out are exempt: a stored login response would
+be a token handed out again without a password check, even after
+``logout-all`` revoked it.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from fastapi.dependencies.utils import get_parameterless_sub_dependant
+from fastapi.routing import APIRoute
+from pymongo.errors import DuplicateKeyError
+
+import database
+import metrics
+from cache import BusinessCache
+
+# ==============================
+# Settings
+# ==============================
+
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+IDEMPOTENCY_CACHE_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_CACHE_MAX_ENTRIES", "10000"))
+IDEMPOTENCY_CACHE_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_CACHE_TTL_SECONDS", "600"))
+# An attempt that has not finished after this long is presumed dead
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "30"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "5"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+POLL_SECONDS = 0.1
+
+requests_total = metrics.Counter(
+    "idempotency_requests_total", "Requests carrying an Idempotency-Key, by outcome.", ("outcome",)
+)
+
+# (scoped key digest,) -> stored response; completed responses never change
+response_cache = BusinessCache("idempotency", IDEMPOTENCY_CACHE_MAX_ENTRIES, IDEMPOTENCY_CACHE_TTL_SECONDS)
+
+# ==============================
+# Store
+# ==============================
+
+def _digest(*parts: bytes) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _replay(stored: dict, fingerprint: str) -> Response:
+    if stored["fingerprint"] != fingerprint:
+        requests_total.inc(("mismatch",))
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+    requests_total.inc(("replayed",))
+    return Response(
+        stored["body"], status_code=stored["status"], headers={**stored["headers"], "Idempotent-Replayed": "true"}
+    )
+
+
+async def _acquire(db, digest: str, fingerprint: str) -> Optional[dict]:
+    """The stored response for ``digest``, or None once this request owns the key."""
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        stored = await db.idempotency_keys.find_one({"_id": digest})
+        if stored is None:
+            now = datetime.now(timezone.utc)
+            try:
+                await db.idempotency_keys.insert_one({
+                    "_id": digest,
+                    "fingerprint": fingerprint,
+                    "state": "pending",
+                    "expires_at": now + timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS),
+                })
+                return None
+            except DuplicateKeyError:
+                continue  # another attempt got there first; read what it wrote
+        if stored["state"] == "done":
+            return stored
+        if stored["fingerprint"] != fingerprint:
+            return stored  # _replay rejects it without waiting
+        expires_at = stored["expires_at"]
+        if (expires_at if expires_at.tzinfo else expires_at.replace(tzinfo=timezone.utc)) <= datetime.now(timezone.utc):
+            # The attempt holding it died without cleaning up
+            await db.idempotency_keys.delete_one({"_id": digest, "state": "pending", "expires_at": expires_at})
+            continue
+        if time.monotonic() >= deadline:
+            requests_total.inc(("in_progress",))
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still in progress",
+                headers={"Retry-After": "1"},
+            )
+        await asyncio.sleep(POLL_SECONDS)
+
+
+class _Replayed(Exception):
+    """Carries a stored response out of ``claim`` past the endpoint."""
+
+    def __init__(self, response: Response):
+        self.response = response
+
+
+async def claim(request: Request):
+    """Route dependency: replay a stored response, or take the key for this request.
+
+    Solved after the route's other dependencies, so authentication and
+    admission apply to replays as they do to first attempts.
+    """
+    key = request.headers.get("idempotency-key")
+    if key is None or request.method not in MUTATING_METHODS:
+        return
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(status_code=400, detail="Invalid Idempotency-Key")
+    fingerprint = _digest(await request.body())
+    digest = _digest(
+        request.headers.get("authorization", "").encode(), request.method.encode(),
+        request.url.path.encode(), key.encode(),
+    )
+    cached = response_cache.get((digest,))
+    if cached is not None:
+        raise _Replayed(_replay(cached, fingerprint))
+
+    stored = await _acquire(database.get_db(), digest, fingerprint)
+    if stored is not None:
+        stored = {k: stored[k] for k in ("fingerprint", "status", "headers", "body") if k in stored}
+        if "body" in stored:
+            response_cache.put((digest,), stored)
+        raise _Replayed(_replay(stored, fingerprint))
+    request.state.idempotency = (digest, fingerprint)
+
+
+async def _release(digest: str):
+    await database.get_db().idempotency_keys.delete_one({"_id": digest, "state": "pending"})
+
+
+async def _complete(digest: str, fingerprint: str, response: Response) -> Response:
+    body = getattr(response, "body", None)  # streaming responses are never stored
+    if not 200 <= response.status_code < 300 or body is None:
+        await _release(digest)
+        return response
+
+    stored = {
+        "fingerprint": fingerprint,
+        "status": response.status_code,
+        "headers": {k: v for k, v in response.headers.items() if k != "content-length"},
+        "body": bytes(body),
+    }
+    await database.get_db().idempotency_keys.update_one(
+        {"_id": digest},
+        {"$set": {
+            **stored,
+            "state": "done",
+            "expires_at": datetime.now(timezone.utc) + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS),
+        }},
+    )
+    response_cache.put((digest,), stored)
+    requests_total.inc(("executed",))
+    return response
+
+# ==============================
+# Route Class
+# ==============================
+
+def exempt(endpoint: Callable) -> Callable:
+    """Never store or replay this endpoint's responses (apply below the route decorator)."""
+    endpoint.idempotency_exempt = True
+    return endpoint
+
+
+class IdempotentRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, endpoint, **kwargs)
+        if not getattr(endpoint, "idempotency_exempt", False):
+            # Last, after the router's and route's own dependencies
+            self.dependant.dependencies.append(get_parameterless_sub_dependant(depends=Depends(claim), path=self.path_format))
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        if getattr(self.endpoint, "idempotency_exempt", False):
+            return handler
+
+        async def route_handler(request: Request) -> Response:
+            try:
+                response = await handler(request)
+            except _Replayed as replayed:
+                return replayed.response
+            except BaseException:
+                if hasattr(request.state, "idempotency"):
+                    await _release(request.state.idempotency[0])
+                raise
+            if hasattr(request.state, "idempotency"):
+                return await _complete(*request.state.idempotency, response)
+            return response
+
+        return route_handler
@@ -0,0 +1,258 @@
+"""Index declarations and query-plan verification.
+
+``ensure_indexes`` runs at startup and is idempotent: ``createIndexes`` is a
+no-op for indexes that already exist with the same spec.
+
+``QUERY_SHAPES`` lists every query the API issues in production. The
+self-check explains each of them and fails if any would scan a whole
+collection::
+
+    python -m indexes ensure   # create indexes
+    python -m indexes check    # explain() every query shape, exit 1 on COLLSCAN
+"""
+
+import asyncio
+import logging
+import sys
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+import database
+
+logger = logging.getLogger(__name__)
+
+# ==============================
+# Index Declarations
+# ==============================
+
+INDEXES = {
+    "businesses": [
+        IndexModel([("id", ASCENDING)], unique=True, name="uniq_id"),
+        IndexModel([("email", ASCENDING)], unique=True, name="uniq_email"),
+    ],
+    "bookings": [
+        IndexModel([("id", ASCENDING)], unique=True, name="uniq_id"),
+        IndexModel(
+            [("business_id", ASCENDING), ("date", ASCENDING), ("status", ASCENDING), ("start_time", ASCENDING)],
+            name="business_date_status_start",
+        ),
+        # Admin listing: keyset pagination walks this index in either direction
+        IndexModel(
+            [("business_id", ASCENDING), ("date", ASCENDING), ("start_time", ASCENDING), ("id", ASCENDING)],
+            name="business_date_start_id",
+        ),
+        # Archival scans past dates across all businesses
+        IndexModel([("date", ASCENDING)], name="date"),
+    ],
+    "bookings_archive": [
+        IndexModel([("id", ASCENDING)], unique=True, name="uniq_id"),
+        IndexModel(
+            [("business_id", ASCENDING), ("date", ASCENDING), ("start_time", ASCENDING), ("id", ASCENDING)],
+            name="business_date_start_id",
+        ),
+    ],
+    "slot_claims": [
+        # resource (the staff member) is missing, i.e. null, for businesses without staff
+        IndexModel(
+            [("business_id", ASCENDING), ("date", ASCENDING), ("minute", ASCENDING), ("resource", ASCENDING)],
+            unique=True,
+            name="uniq_business_date_minute_resource",
+        ),
+        IndexModel([("booking_id", ASCENDING)], name="booking_id"),
+        # Hold claims, and booking claims until the booking is stored, carry expires_at
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl_expires_at"),
+    ],
+    "slot_holds": [
+        IndexModel([("id", ASCENDING)], unique=True, name="uniq_id"),
+        IndexModel([("business_id", ASCENDING), ("date", ASCENDING)], name="business_date"),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl_expires_at"),
+    ],
+    "booking_rollups": [
+        IndexModel([("business_id", ASCENDING), ("date", ASCENDING)], unique=True, name="uniq_business_date"),
+    ],
+    "idempotency_keys": [
+        # Pending entries expire too, so a crashed attempt frees its key
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl_expires_at"),
+    ],
+    "revoked_tokens": [
+        IndexModel([("jti", ASCENDING)], unique=True, name="uniq_jti"),
+        # Entries are only needed until the token would have expired anyway
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="ttl_expires_at"),
+    ],
+}
+
+
+# Superseded indexes, dropped once their replacements exist
+RETIRED_INDEXES = {
+    # Unique per minute regardless of resource: would stop two staff members
+    # from being booked at the same time
+    "slot_claims": ["uniq_business_date_minute"],
+}
+
+
+async def ensure_indexes(db):
+    for collection, models in INDEXES.items():
+        await db[collection].create_indexes(models)
+    for collection, names in RETIRED_INDEXES.items():
+        existing = await db[collection].index_information()
+        for name in names:
+            if name in existing:
+                await db[collection].drop_index(name)
+                logger.info("Dropped retired index %s.%s", collection, name)
+    logger.info("Indexes ensured for %s", ", ".join(INDEXES))
+
+# ==============================
+# Production Query Shapes
+# ==============================
+
+SAMPLE = "explain-check"
+
+QUERY_SHAPES = [
+    {"name": "business by id", "collection": "businesses", "filter": {"id": SAMPLE}},
+    {"name": "business by email", "collection": "businesses", "filter": {"email": SAMPLE}},
+    {
+        "name": "bookings for a day",
+        "collection": "bookings",
+        "filter": {"business_id": SAMPLE, "date": "2026-01-01", "status": "confirmed"},
+    },
+    {
+        "name": "bookings for a date range",
+        "collection": "bookings",
+        "filter": {
+            "business_id": SAMPLE,
+            "date": {"$gte": "2026-01-01", "$lte": "2026-03-31"},
+            "status": "confirmed",
+        },
+    },
+    {
+        "name": "admin bookings listing",
+        "collection": "bookings",
+        "filter": {"business_id": SAMPLE},
+        "sort": {"date": DESCENDING, "start_time": DESCENDING, "id": DESCENDING},
+    },
+    {
+        "name": "admin bookings page after cursor",
+        "collection": "bookings",
+        "filter": {"$and": [
+            {"business_id": SAMPLE, "status": "confirmed", "date": {"$gte": "2026-01-01"}},
+            {"$or": [
+                {"date": {"$gt": "2026-01-01"}},
+                {"date": "2026-01-01", "start_time": {"$gt": "09:00"}},
+                {"date": "2026-01-01", "start_time": "09:00", "id": {"$gt": SAMPLE}},
+            ]},
+        ]},
+        "sort": {"date": ASCENDING, "start_time": ASCENDING, "id": ASCENDING},
+    },
+    {"name": "booking by id", "collection": "bookings", "filter": {"id": SAMPLE, "business_id": SAMPLE}},
+    {
+        "name": "upcoming bookings of a staff member",
+        "collection": "bookings",
+        "filter": {"business_id": SAMPLE, "date": {"$gte": "2026-01-01"}, "status": "confirmed", "staff_id": SAMPLE},
+    },
+    {
+        "name": "upcoming bookings without staff",
+        "collection": "bookings",
+        "filter": {"business_id": SAMPLE, "date": {"$gte": "2026-01-01"}, "staff_id": {"$exists": False}},
+    },
+    {"name": "bookings due for archival", "collection": "bookings", "filter": {"date": {"$lt": "2026-01-01"}}},
+    {
+        "name": "archived bookings listing",
+        "collection": "bookings_archive",
+        "filter": {"business_id": SAMPLE, "date": {"$lte": "2026-01-01"}},
+        "sort": {"date": DESCENDING, "start_time": DESCENDING, "id": DESCENDING},
+    },
+    {
+        "name": "admin bookings count",
+        "collection": "booking_rollups",
+        "filter": {"business_id": SAMPLE, "date": {"$lte": "2026-01-01"}},
+    },
+    {
+        "name": "analytics rollups for a date range",
+        "collection": "booking_rollups",
+        "filter": {"business_id": SAMPLE, "date": {"$gte": "2026-01-01", "$lte": "2026-12-31"}},
+    },
+    {"name": "slot claims by booking", "collection": "slot_claims", "filter": {"booking_id": SAMPLE}},
+    {
+        "name": "upcoming slot claims without staff",
+        "collection": "slot_claims",
+        "filter": {"business_id": SAMPLE, "date": {"$gte": "2026-01-01"}, "resource": {"$exists": False}},
+    },
+    {
+        "name": "expired hold claims in a slot",
+        "collection": "slot_claims",
+        "filter": {"business_id": SAMPLE, "date": "2026-01-01", "minute": {"$gte": 540, "$lt": 600},
+                   "expires_at": {"$lte": "2026-01-01T00:00:00Z"}},
+    },
+    {
+        "name": "live holds for a date range",
+        "collection": "slot_holds",
+        "filter": {"business_id": SAMPLE, "date": {"$gte": "2026-01-01", "$lte": "2026-03-31"},
+                   "expires_at": {"$gt": "2026-01-01T00:00:00Z"}},
+    },
+    {"name": "hold by id", "collection": "slot_holds", "filter": {"id": SAMPLE}},
+    {
+        "name": "upcoming holds without staff",
+        "collection": "slot_holds",
+        "filter": {"business_id": SAMPLE, "date": {"$gte": "2026-01-01"}, "staff_id": {"$exists": False}},
+    },
+    {"name": "idempotency key", "collection": "idempotency_keys", "filter": {"_id": SAMPLE}},
+    {"name": "revoked token by jti", "collection": "revoked_tokens", "filter": {"jti": SAMPLE}},
+]
+
+
+def plan_stages(plan: dict):
+    yield plan.get("stage")
+    for child in ("inputStage", "outerStage", "innerStage"):
+        if child in plan:
+            yield from plan_stages(plan[child])
+    for child in plan.get("inputStages", ()):
+        yield from plan_stages(child)
+
+
+async def explain(db, shape: dict) -> dict:
+    command = {"find": shape["collection"], "filter": shape["filter"]}
+    if "sort" in shape:
+        command["sort"] = shape["sort"]
+    result = await db.command({"explain": command, "verbosity": "queryPlanner"})
+    return result["queryPlanner"]["winningPlan"]
+
+
+async def verify_query_plans(db) -> list:
+    """Return ``(shape name, stages)`` for every shape that is not index-backed."""
+    failures = []
+    for shape in QUERY_SHAPES:
+        stages = list(plan_stages(await explain(db, shape)))
+        if "COLLSCAN" in stages or "EOF" in stages:
+            failures.append((shape["name"], stages))
+    return failures
+
+# ==============================
+# CLI
+# ==============================
+
+async def _main(argv):
+    if argv[1:] not in (["ensure"], ["check"]):
+        print("usage: python -m indexes ensure|check")
+        return 2
+
+    db = await database.connect()
+    try:
+        if argv[1] == "ensure":
+            await ensure_indexes(db)
+            print("✅ Indexes ensured")
+            return 0
+
+        failures = await verify_query_plans(db)
+    finally:
+        await database.close()
+
+    for name, stages in failures:
+        print(f"❌ FAIL: {name} - {' <- '.join(s for s in stages if s)}")
+    if failures:
+        return 1
+    print(f"✅ All {len(QUERY_SHAPES)} query shapes are index-backed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv)))
@@ -0,0 +1,260 @@
+"""Cross-worker invalidation bus.
+
+With several uvicorn/gunicorn workers, each process has its own slot,
+profile and token caches and its own SSE subscribers. ``bus.publish``
+applies a message in this process at once and queues it for the
+``cache_invalidations`` capped collection. Every worker follows that
+collection and applies messages from the others, usually within a few
+milliseconds of the write.
+
+Backends (``INVALIDATION_BUS``):
+
+- ``capped``: a tailable, awaitData cursor. It works on a standalone mongod.
+- ``changestream``: a change stream on the same collection. It needs a
+  replica set; a single-node ``mongod --replSet rs0`` is enough.
+- ``auto`` (the default): change streams on a replica set, capped otherwise.
+- ``off``: local only, for a single worker.
+
+If a follower loses its place (cursor killed, collection wrapped, network
+error), messages may have been missed. It then clears its caches and starts
+again from the newest message, so staleness is bounded by the retry delay
+rather than by cache TTLs.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid, PyMongoError
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# ==============================
+# Settings
+# ==============================
+
+INVALIDATION_BUS = os.getenv("INVALIDATION_BUS", "auto")  # auto | capped | changestream | off
+INVALIDATION_COLLECTION = os.getenv("INVALIDATION_COLLECTION", "cache_invalidations")
+INVALIDATION_CAPPED_BYTES = int(os.getenv("INVALIDATION_CAPPED_BYTES", str(16 * 1024 * 1024)))
+INVALIDATION_RETRY_SECONDS = float(os.getenv("INVALIDATION_RETRY_SECONDS", "1"))
+# How long an idle tailable getMore waits server-side for new messages
+INVALIDATION_AWAIT_MS = int(os.getenv("INVALIDATION_AWAIT_MS", "1000"))
+
+messages_total = metrics.Counter(
+    "invalidation_messages_total", "Invalidation bus messages by kind and direction.", ("kind", "direction")
+)
+delivery_seconds = metrics.Histogram(
+    "invalidation_delivery_seconds", "Publish-to-apply delay of messages from other workers.", ("kind",)
+)
+resets_total = metrics.Counter("invalidation_resets_total", "Full cache resets after the follower lost its place.")
+
+# ==============================
+# Bus
+# ==============================
+
+class InvalidationBus:
+    def __init__(self, mode: str = INVALIDATION_BUS, collection: str = INVALIDATION_COLLECTION):
+        self.mode = mode
+        self.collection = collection
+        self.worker_id = uuid.uuid4().hex
+        self.backend: Optional[str] = None
+        self._handlers: Dict[str, Callable[[dict], None]] = {}
+        self._reset_handlers: List[Callable[[], None]] = []
+        self._pending: List[dict] = []
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._db = None
+        self.sent = 0
+        self.received = 0
+        self.send_failures = 0
+        self.resets = 0
+        self.last_delay_ms: Optional[float] = None
+
+    # ------------------------------
+    # Registration
+    # ------------------------------
+
+    def subscribe(self, kind: str, handler: Callable[[dict], None]):
+        """``handler(message)`` runs for local and remote messages of ``kind``."""
+        self._handlers[kind] = handler
+
+    def on_reset(self, handler: Callable[[], None]):
+        """``handler()`` drops everything it caches; runs when messages may be lost."""
+        self._reset_handlers.append(handler)
+
+    # ------------------------------
+    # Publishing
+    # ------------------------------
+
+    def publish(self, kind: str, business_id: str, local: bool = True, **fields):
+        """Apply ``kind`` here (unless ``local=False``) and broadcast it to other workers.
+
+        Synchronous: handlers run on the event loop and the database write
+        happens in a background batch, so callers add no round trip.
+        """
+        message = {"kind": kind, "business_id": business_id, **fields}
+        if local:
+            self._apply(message)
+        if self._db is None:
+            return
+        self._pending.append({**message, "origin": self.worker_id, "sent_at": time.time()})
+        self._wakeup.set()
+
+    def _apply(self, message: dict):
+        handler = self._handlers.get(message["kind"])
+        if handler is not None:
+            handler(message)
+
+    def _reset(self):
+        self.resets += 1
+        resets_total.inc()
+        for handler in self._reset_handlers:
+            handler()
+
+    # ------------------------------
+    # Lifecycle
+    # ------------------------------
+
+    async def start(self, db):
+        if self.mode == "off":
+            return
+        self._db = db
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._write_loop()), asyncio.create_task(self._follow_loop())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._pending and self._db is not None:
+            await self._flush()
+        self._db = None
+
+    # ------------------------------
+    # Writer
+    # ------------------------------
+
+    async def _write_loop(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self._flush()
+
+    async def _flush(self):
+        # Everything queued since the last flush goes out in one insert
+        batch, self._pending = self._pending, []
+        try:
+            await self._db[self.collection].insert_many(batch, ordered=True)
+        except PyMongoError as exc:
+            # Applied here already; other workers catch up at TTL expiry
+            self.send_failures += len(batch)
+            logger.warning("Invalidation bus: dropped %d messages: %s", len(batch), exc)
+            return
+        self.sent += len(batch)
+        for message in batch:
+            messages_total.inc((message["kind"], "sent"))
+
+    # ------------------------------
+    # Follower
+    # ------------------------------
+
+    async def _follow_loop(self):
+        # Anything published while we were not following may have been missed
+        resync = False
+        while True:
+            try:
+                if self.backend is None:
+                    backend = await self._choose_backend()
+                    await self._ensure_collection()
+                    self.backend = backend
+                if self.backend == "changestream":
+                    await self._follow_change_stream(resync)
+                else:
+                    await self._follow_capped(resync)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Invalidation bus: follower restarting after error: %s", exc)
+            resync = True
+            await asyncio.sleep(INVALIDATION_RETRY_SECONDS)
+
+    async def _choose_backend(self) -> str:
+        if self.mode != "auto":
+            return self.mode
+        hello = await self._db.client.admin.command("hello")
+        return "changestream" if hello.get("setName") else "capped"
+
+    async def _ensure_collection(self):
+        try:
+            await self._db.create_collection(self.collection, capped=True, size=INVALIDATION_CAPPED_BYTES)
+        except CollectionInvalid:
+            options = await self._db[self.collection].options()
+            if not options.get("capped"):
+                raise RuntimeError(f"{self.collection} exists but is not a capped collection")
+
+    async def _follow_capped(self, resync: bool):
+        collection = self._db[self.collection]
+        # A tailable cursor on an empty collection dies at once, so make sure
+        # there is at least one document; then start after the newest one
+        await collection.insert_one({"kind": "hello", "origin": self.worker_id, "sent_at": time.time()})
+        newest = await collection.find({}, {"_id": 1}).sort("$natural", -1).limit(1).to_list(length=1)
+        cursor = collection.find(
+            {"_id": {"$gt": newest[0]["_id"]}, "origin": {"$ne": self.worker_id}},
+            cursor_type=CursorType.TAILABLE_AWAIT,
+        ).max_await_time_ms(INVALIDATION_AWAIT_MS)
+        if resync:
+            self._reset()
+        try:
+            while cursor.alive:
+                async for message in cursor:
+                    self._receive(message)
+        finally:
+            await cursor.close()
+        raise RuntimeError("tailable cursor was closed by the server")
+
+    async def _follow_change_stream(self, resync: bool):
+        pipeline = [{"$match": {"operationType": "insert", "fullDocument.origin": {"$ne": self.worker_id}}}]
+        async with self._db[self.collection].watch(pipeline) as stream:
+            if resync:
+                self._reset()
+            async for change in stream:
+                self._receive(change["fullDocument"])
+
+    def _receive(self, message: dict):
+        kind = message.get("kind")
+        if kind not in self._handlers:
+            return
+        self.received += 1
+        messages_total.inc((kind, "received"))
+        delay = max(0.0, time.time() - message.get("sent_at", time.time()))
+        self.last_delay_ms = round(delay * 1000, 2)
+        delivery_seconds.observe((kind,), delay)
+        self._apply(message)
+
+    # ------------------------------
+    # Stats
+    # ------------------------------
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "backend": self.backend,
+            "running": bool(self._tasks),
+            "worker_id": self.worker_id,
+            "sent": self.sent,
+            "received": self.received,
+            "send_failures": self.send_failures,
+            "resets": self.resets,
+            "pending": len(self._pending),
+            "last_delay_ms": self.last_delay_ms,
+        }
+
+
+bus = InvalidationBus()
@@ -1,13 +1,139 @@
-from fastapi import FastAPI, APIRouter
-from fastapi.middleware.cors import CORSMiddleware
-from pymongo import MongoClient
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Collection, List, Optional, Tuple
+import asyncio
+import base64
+import hashlib
+import json
 import os
+import uuid
+
+from fastapi import FastAPI, APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel, EmailStr, Field
+from pymongo.errors import DuplicateKeyError
+
+import orjson
+
+import admission
+import analytics
+import archive
+import auth
+import booking_claims
+import compression
+import database
+import events
+import holds
+import idempotency
+import indexes
+import invalidation
+import metrics
+import notifications
+import schedules
+import staff
+from auth import create_token, get_current_business
+from passwords import HasherBusy, hasher
+from cache import BusinessCache
+from slot_engine import (
+    compile_schedule, compute_range, compute_slots, day_window, is_slot_start, to_hhmm, to_minutes,
+)
+
+# ==============================
+# Settings
+# ==============================
+
+AVAILABILITY_MAX_DAYS = int(os.getenv("AVAILABILITY_MAX_DAYS", "92"))
+
+BOOKINGS_PAGE_SIZE = int(os.getenv("BOOKINGS_PAGE_SIZE", "50"))
+BOOKINGS_MAX_PAGE_SIZE = int(os.getenv("BOOKINGS_MAX_PAGE_SIZE", "200"))
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "200"))
+BLOCKED_RANGE_MAX_DAYS = int(os.getenv("BLOCKED_RANGE_MAX_DAYS", "366"))
+
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", "366"))
+ANALYTICS_DEFAULT_DAYS = int(os.getenv("ANALYTICS_DEFAULT_DAYS", "30"))
+
+SLOT_CACHE_MAX_ENTRIES = int(os.getenv("SLOT_CACHE_MAX_ENTRIES", "20000"))
+SLOT_CACHE_TTL_SECONDS = float(os.getenv("SLOT_CACHE_TTL_SECONDS", "300"))
+
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "5000"))
+PROFILE_CACHE_TTL_SECONDS = float(os.getenv("PROFILE_CACHE_TTL_SECONDS", "60"))
+# Browsers revalidate every time (a cheap 304); shared caches may hold it briefly
+PROFILE_MAX_AGE = int(os.getenv("PROFILE_MAX_AGE", "0"))
+PROFILE_SHARED_MAX_AGE = int(os.getenv("PROFILE_SHARED_MAX_AGE", "30"))
+PROFILE_STALE_WHILE_REVALIDATE = int(os.getenv("PROFILE_STALE_WHILE_REVALIDATE", "300"))
+
+BOOTSTRAP_DAYS = int(os.getenv("BOOTSTRAP_DAYS", "14"))
+BOOTSTRAP_CACHE_MAX_ENTRIES = int(os.getenv("BOOTSTRAP_CACHE_MAX_ENTRIES", "5000"))
+BOOTSTRAP_CACHE_TTL_SECONDS = float(os.getenv("BOOTSTRAP_CACHE_TTL_SECONDS", "60"))
+# Availability changes with every booking, so shared caches only hold it briefly
+BOOTSTRAP_SHARED_MAX_AGE = int(os.getenv("BOOTSTRAP_SHARED_MAX_AGE", "5"))
+
+# (business_id, date, service_id) -> slot list
+slot_cache = BusinessCache("slots", SLOT_CACHE_MAX_ENTRIES, SLOT_CACHE_TTL_SECONDS)
+# (business_id,) -> (etag, public profile)
+profile_cache = BusinessCache("profiles", PROFILE_CACHE_MAX_ENTRIES, PROFILE_CACHE_TTL_SECONDS)
+# (business_id, first date, last date, requested service_id) -> (etag, body)
+bootstrap_cache = BusinessCache("bootstrap", BOOTSTRAP_CACHE_MAX_ENTRIES, BOOTSTRAP_CACHE_TTL_SECONDS)
+
+
+def _drop_slots(message: dict):
+    dates = set(message["dates"]) if message.get("dates") is not None else None
+    service_id = message.get("service_id")
+    slot_cache.invalidate(
+        message["business_id"],
+        lambda key: (dates is None or key[1] in dates) and (service_id is None or key[2] == service_id),
+    )
+    bootstrap_cache.invalidate(
+        message["business_id"],
+        lambda key: (dates is None or any(key[1] <= d <= key[2] for d in dates))
+        and (service_id is None or key[3] in (None, service_id)),
+    )
+
+
+def _drop_business(message: dict):
+    profile_cache.invalidate(message["business_id"])
+    bootstrap_cache.invalidate(message["business_id"])
+    auth.invalidate_business(message["business_id"])
+
+
+# Writes on any worker evict these caches on every worker
+invalidation.bus.subscribe("slots", _drop_slots)
+invalidation.bus.subscribe("business", _drop_business)
+invalidation.bus.on_reset(slot_cache.invalidate_all)
+invalidation.bus.on_reset(profile_cache.invalidate_all)
+invalidation.bus.on_reset(bootstrap_cache.invalidate_all)
+
+# ==============================
+# Lifespan
+# ==============================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db = await database.connect()
+    await indexes.ensure_indexes(db)
+    await notifications.start(db)
+    await invalidation.bus.start(db)
+    archive.archiver.start(db)
+    try:
+        yield
+    finally:
+        await archive.archiver.stop()
+        await invalidation.bus.stop()
+        await notifications.stop()
+        hasher.shutdown()
+        await database.close()
 
 # ==============================
 # App Initialization
 # ==============================
 
-app = FastAPI(title="Embeddable Booking System API")
+app = FastAPI(
+    title="Embeddable Booking System API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # ==============================
 # CORS (MUST COME FIRST)
@@ -23,23 +149,449 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 
 # ==============================
-# Database Setup
+# Compression
+# ==============================
+
+app.add_middleware(compression.CompressionMiddleware)
+
+# ==============================
+# Metrics
 # ==============================
+#
+# Served at /metrics, outside /api, so the public ingress does not expose it;
+# Prometheus scrapes the pod directly.
+
+if metrics.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# ==============================
+# Exception Handlers
+# ==============================
+
+@app.exception_handler(HasherBusy)
+async def hasher_busy_handler(request, exc):
+    return JSONResponse(
+        {"detail": "Too many sign-in attempts, please retry shortly"},
+        status_code=503,
+        headers={"Retry-After": "1"},
+    )
+
+# ==============================
+# Models
+# ==============================
+
+# HH:MM on the 24-hour clock; anything else would not round-trip through
+# to_minutes/to_hhmm
+TIME_PATTERN = r"^([01]\d|2[0-3]):[0-5]\d$"
+# Closing time may also be midnight at the end of the day (to_minutes gives 1440)
+END_TIME_PATTERN = r"^(([01]\d|2[0-3]):[0-5]\d|24:00)$"
+
+
+class RegisterRequest(BaseModel):
+    business_name: str = Field(min_length=1)
+    description: str = ""
+    email: EmailStr
+    password: str = Field(min_length=1)
+
+
+class LoginRequest(BaseModel):
+    email: EmailStr
+    password: str
+
+
+class ServiceCreate(BaseModel):
+    name: str = Field(min_length=1)
+    duration: int = Field(gt=0, le=24 * 60)
+    description: str = ""
+    price: float = Field(default=0, ge=0)
+
+
+class StaffCreate(BaseModel):
+    name: str = Field(min_length=1)
+    service_ids: Optional[List[str]] = None  # None = every service
+
+
+class AvailabilityDay(BaseModel):
+    day: int = Field(ge=0, le=6)  # 0 = Monday
+    start_time: str = Field(pattern=TIME_PATTERN)
+    end_time: str = Field(pattern=END_TIME_PATTERN)
+    enabled: bool = True
+
+
+class AvailabilityUpdate(BaseModel):
+    availability: List[AvailabilityDay]
+
+
+class BlockedDateRequest(BaseModel):
+    date: str = Field(pattern=r"^\d{4}-\d{2}-\d{2}$")
+
+
+class ServiceBulkCreate(BaseModel):
+    services: List[ServiceCreate] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class DateRange(BaseModel):
+    date_from: str = Field(alias="from", pattern=r"^\d{4}-\d{2}-\d{2}$")
+    date_to: str = Field(alias="to", pattern=r"^\d{4}-\d{2}-\d{2}$")
+
+
+class BlockedDatesBulk(BaseModel):
+    block: List[DateRange] = []
+    unblock: List[DateRange] = []
+
 
-MONGO_URL = os.getenv("MONGO_URL")
-DB_NAME = os.getenv("DB_NAME", "bookingking")
+class BookingCancelBulk(BaseModel):
+    booking_ids: List[str] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class HoldCreate(BaseModel):
+    business_id: str
+    service_id: str
+    date: str = Field(pattern=r"^\d{4}-\d{2}-\d{2}$")
+    start_time: str = Field(pattern=TIME_PATTERN)
+
+
+class BookingCreate(HoldCreate):
+    customer_name: str = Field(min_length=1)
+    customer_email: EmailStr
+    customer_phone: str = Field(min_length=1)
+    hold_id: Optional[str] = None
+
+# Response models below document the large payloads in OpenAPI. Their routes
+# return ORJSONResponse directly, so FastAPI neither re-validates nor
+# re-encodes output that already came from the database or the slot engine.
+
+class Slot(BaseModel):
+    start_time: str
+    end_time: str
+    available: bool
+
+
+class CalendarDay(BaseModel):
+    date: str
+    available: bool
+    slots: Optional[List[Slot]] = None
+
+
+class Service(BaseModel):
+    id: str
+    name: str
+    duration: int
+    description: str = ""
+    price: float = 0
+
+
+class PublicBusiness(BaseModel):
+    id: str
+    business_name: str
+    description: str = ""
+    services: List[Service] = []
+    availability: List[AvailabilityDay] = []
+    blocked_dates: List[str] = []
+
+
+class DaySlots(BaseModel):
+    date: str
+    slots: List[Slot]
+
+
+class WidgetBootstrap(BaseModel):
+    business: PublicBusiness
+    service_id: Optional[str] = None
+    date_from: str = Field(alias="from")
+    date_to: str = Field(alias="to")
+    days: List[CalendarDay]
+    slots: Optional[DaySlots] = None
+
+
+class Booking(BaseModel):
+    # Everything but the cursor key may be projected away with ?fields=
+    id: str
+    date: str
+    start_time: str
+    business_id: Optional[str] = None
+    service_id: Optional[str] = None
+    service_name: Optional[str] = None
+    end_time: Optional[str] = None
+    customer_name: Optional[str] = None
+    customer_email: Optional[str] = None
+    customer_phone: Optional[str] = None
+    price: Optional[float] = None
+    staff_id: Optional[str] = None
+    staff_name: Optional[str] = None
+    status: Optional[str] = None
+    created_at: Optional[str] = None
+
+# ==============================
+# Helpers
+# ==============================
+
+PUBLIC_BUSINESS_FIELDS = {
+    "_id": 0,
+    "id": 1,
+    "business_name": 1,
+    "description": 1,
+    "services": 1,
+    "availability": 1,
+    "blocked_dates": 1,
+}
+
+# What the slot and booking paths need: the compiled schedule, not the raw
+# availability strings
+BOOKABLE_BUSINESS_FIELDS = {"_id": 0, "id": 1, "business_name": 1, "services": 1, "staff": 1, "schedule": 1}
+
+SCHEDULE_UPDATE_ATTEMPTS = 5
+
+
+def default_availability():
+    # Monday to Friday, 09:00 - 17:00
+    return [
+        {"day": day, "start_time": "09:00", "end_time": "17:00", "enabled": day < 5}
+        for day in range(7)
+    ]
+
+
+async def find_bookable_business(db, business_id: str) -> dict:
+    business = await db.businesses.find_one({"id": business_id}, BOOKABLE_BUSINESS_FIELDS)
+    if business is None:
+        raise HTTPException(status_code=404, detail="Business not found")
+    if "schedule" not in business:
+        # Not compiled yet (see schedules.backfill); compile this once in memory
+        raw = await db.businesses.find_one({"id": business_id}, {"_id": 0, "availability": 1, "blocked_dates": 1})
+        business["schedule"] = schedules.schedule_of(raw or {})
+    return business
+
+
+async def find_busy(db, business_id: str, date_filter) -> Tuple[list, Optional[float]]:
+    """Confirmed bookings and live holds on the matching dates.
+
+    Also returns how many seconds a result computed from them stays valid:
+    a hold stops counting at its expiry without any write to invalidate on.
+    """
+    bookings, held = await asyncio.gather(
+        db.bookings.find(
+            {"business_id": business_id, "date": date_filter, "status": "confirmed"},
+            {"_id": 0, "date": 1, "start_time": 1, "end_time": 1, "staff_id": 1},
+        ).to_list(length=None),
+        holds.active(db, business_id, date_filter),
+    )
+    return bookings + held, holds.seconds_left(held)
+
+
+async def find_staff_busy(db, business: dict, date: str) -> list:
+    """What ``staff.assign`` needs to pick a member; nothing without staff."""
+    if not business.get("staff"):
+        return []
+    busy, _ = await find_busy(db, business["id"], date)
+    return busy
+
+
+async def find_open_slot(db, data: HoldCreate) -> Tuple[dict, dict, int, int]:
+    """Business, service and ``[start, end)`` minutes of a requested slot, or 400/404."""
+    day = parse_date(data.date)
+    business = await find_bookable_business(db, data.business_id)
+    service = find_service(business, data.service_id)
+    start = to_minutes(data.start_time)
+    # "09:60" parses to 10:00; only the canonical spelling names a slot
+    if to_hhmm(start) != data.start_time or not is_slot_start(day_window(business, day), service["duration"], start):
+        raise HTTPException(status_code=400, detail="Time slot not available")
+    return business, service, start, start + service["duration"]
+
+
+def parse_date(value: str):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date, expected YYYY-MM-DD")
+
+
+def find_service(business: dict, service_id: str) -> dict:
+    for service in business.get("services", []):
+        if service["id"] == service_id:
+            return service
+    raise HTTPException(status_code=404, detail="Service not found")
+
+
+def find_member(business: dict, staff_id: Optional[str]) -> Optional[dict]:
+    for member in business.get("staff") or ():
+        if member["id"] == staff_id:
+            return member
+    return None
+
+
+def check_service_ids(business: dict, service_ids: Optional[List[str]]):
+    unknown = set(service_ids or ()) - {s["id"] for s in business.get("services", [])}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown services: {', '.join(sorted(unknown))}")
+
+
+def invalidate_slots(
+    business_id: str,
+    date: Optional[str] = None,
+    service_id: Optional[str] = None,
+    dates: Optional[Collection[str]] = None,
+):
+    if date is not None:
+        dates = (date,)
+    invalidation.bus.publish(
+        "slots", business_id, dates=sorted(dates) if dates is not None else None, service_id=service_id
+    )
+
+
+def expand_ranges(ranges: List[DateRange]) -> List[str]:
+    days = []
+    for item in ranges:
+        first, last = parse_date(item.date_from), parse_date(item.date_to)
+        if last < first:
+            raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+        if len(days) + (last - first).days + 1 > BLOCKED_RANGE_MAX_DAYS:
+            raise HTTPException(status_code=400, detail=f"At most {BLOCKED_RANGE_MAX_DAYS} days per request")
+        days.extend((first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1))
+    # Overlapping ranges name a day once, so it gets a single outcome
+    return list(dict.fromkeys(days))
+
+
+def open_stream(business_id: str, channel: str) -> events.EventStream:
+    if not events.EVENTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Live updates are disabled")
+    subscriber = events.broker.subscribe(business_id, channel)
+    if subscriber is None:
+        raise HTTPException(
+            status_code=503, detail="Too many live connections, please retry shortly", headers={"Retry-After": "5"}
+        )
+    return events.EventStream(subscriber)
+
+
+def profile_etag(business: dict) -> str:
+    return f'"{business["id"]}-v{business.get("version", 0)}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison: a CDN may hand back our tag with a W/ prefix
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+BOOKING_FIELDS = {
+    "id", "business_id", "service_id", "service_name", "date", "start_time", "end_time",
+    "customer_name", "customer_email", "customer_phone", "price", "staff_id", "staff_name", "status", "created_at",
+}
+# Always returned: the cursor is built from them
+BOOKING_KEY_FIELDS = ("date", "start_time", "id")
+
+
+def booking_projection(fields: Optional[str]) -> dict:
+    if not fields:
+        return {"_id": 0}
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - BOOKING_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return {"_id": 0, **{f: 1 for f in requested | set(BOOKING_KEY_FIELDS)}}
+
+
+def booking_filter(business_id: str, status: Optional[str], date_from: Optional[str], date_to: Optional[str]) -> dict:
+    query = {"business_id": business_id}
+    if status:
+        query["status"] = status
+    date_range = {}
+    if date_from:
+        date_range["$gte"] = parse_date(date_from).isoformat()
+    if date_to:
+        date_range["$lte"] = parse_date(date_to).isoformat()
+    if date_range:
+        query["date"] = date_range
+    return query
+
+
+def encode_cursor(booking: dict) -> str:
+    key = [booking[f] for f in BOOKING_KEY_FIELDS]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(key, list) or len(key) != len(BOOKING_KEY_FIELDS) or not all(isinstance(v, str) for v in key):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+
+def after_cursor(key: list, op: str) -> dict:
+    """Keyset condition: rows strictly after ``key`` in (date, start_time, id) order."""
+    date, start_time, booking_id = key
+    return {"$or": [
+        {"date": {op: date}},
+        {"date": date, "start_time": {op: start_time}},
+        {"date": date, "start_time": start_time, "id": {op: booking_id}},
+    ]}
+
+
+async def update_business(business_id: str, update: dict, query: Optional[dict] = None):
+    """Apply an admin mutation, bump the profile version and drop cached copies."""
+    db = database.get_db()
+    result = await db.businesses.update_one(
+        {"id": business_id, **(query or {})},
+        {**update, "$inc": {"version": 1}},
+    )
+    if result.matched_count:
+        invalidation.bus.publish("business", business_id)
+    return result
+
+
+async def update_schedule(business_id: str, availability: Optional[list] = None, change_blocked=None):
+    """Rewrite availability and/or blocked dates together with their compiled form.
+
+    The compiled schedule depends on both fields, so this reads them, applies
+    the change and writes back only if ``version`` is unchanged, retrying on
+    a concurrent admin write.
+    """
+    db = database.get_db()
+    for _ in range(SCHEDULE_UPDATE_ATTEMPTS):
+        current = await db.businesses.find_one(
+            {"id": business_id}, {"_id": 0, "availability": 1, "blocked_dates": 1, "version": 1}
+        )
+        if current is None:
+            raise HTTPException(status_code=404, detail="Business not found")
+        new_availability = current.get("availability", []) if availability is None else availability
+        blocked = current.get("blocked_dates", [])
+        if change_blocked is not None:
+            blocked = change_blocked(list(blocked))
+        result = await update_business(
+            business_id,
+            {"$set": {
+                "availability": new_availability,
+                "blocked_dates": blocked,
+                "schedule": compile_schedule(new_availability, blocked),
+            }},
+            query={"version": current.get("version")},
+        )
+        if result.matched_count:
+            return
+    raise HTTPException(status_code=409, detail="Business was modified concurrently, please retry")
 
-client = MongoClient(MONGO_URL)
-db = client[DB_NAME]
 
 # ==============================
 # API Router
 # ==============================
 
-api_router = APIRouter(prefix="/api")
+# Mutations honour an Idempotency-Key header (see idempotency.py)
+api_router = APIRouter(prefix="/api", route_class=idempotency.IdempotentRoute)
+admin_router = APIRouter(
+    prefix="/admin", dependencies=[Depends(get_current_business)], route_class=idempotency.IdempotentRoute
+)
 
 # ------------------------------
 # Example Health Check
@@ -48,33 +600,690 @@ api_router = APIRouter(prefix="/api")
 async def health():
     return {"status": "ok"}
 
+
+@api_router.get("/health/cache")
+async def cache_health():
+    return {
+        "slots": slot_cache.stats(),
+        "profiles": profile_cache.stats(),
+        "bootstrap": bootstrap_cache.stats(),
+        "tokens": auth.token_cache.stats(),
+        "idempotency": idempotency.response_cache.stats(),
+    }
+
+
+@api_router.get("/health/passwords")
+async def password_health():
+    return hasher.stats()
+
+
+@api_router.get("/health/invalidation")
+async def invalidation_health():
+    return invalidation.bus.stats()
+
+
+@api_router.get("/health/admission")
+async def admission_health():
+    return admission.stats()
+
+
+@api_router.get("/health/events")
+async def events_health():
+    return events.broker.stats()
+
+
+@api_router.get("/health/archive")
+async def archive_health():
+    return archive.archiver.stats()
+
+
+@api_router.get("/health/email")
+async def email_health():
+    queue = notifications.get_queue()
+    return queue.stats() if queue else {"running": False}
+
 # ------------------------------
 # Admin Register
 # ------------------------------
 @api_router.post("/admin/register")
-async def register_admin(data: dict):
-    # Replace with your actual logic
-    return {"message": "Admin registered successfully"}
+@idempotency.exempt
+async def register_admin(data: RegisterRequest):
+    db = database.get_db()
+    email = data.email.lower()
+    if await db.businesses.find_one({"email": email}, {"_id": 1}):
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    business = {
+        "id": str(uuid.uuid4()),
+        "business_name": data.business_name,
+        "description": data.description,
+        "email": email,
+        "password_hash": await hasher.hash(data.password),
+        "services": [],
+        "availability": default_availability(),
+        "blocked_dates": [],
+        "schedule": compile_schedule(default_availability(), []),
+        "version": 1,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        await db.businesses.insert_one(business)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    return {
+        "token": create_token(business["id"]),
+        "business_id": business["id"],
+        "business_name": business["business_name"],
+    }
 
 # ------------------------------
 # Admin Login
 # ------------------------------
 @api_router.post("/admin/login")
-async def login_admin(data: dict):
-    # Replace with your actual logic
-    return {"message": "Admin login successful"}
+@idempotency.exempt
+async def login_admin(data: LoginRequest):
+    db = database.get_db()
+    business = await db.businesses.find_one(
+        {"email": data.email.lower()},
+        {"_id": 0, "id": 1, "business_name": 1, "password_hash": 1},
+    )
+    valid, new_hash = await hasher.verify(data.password, business["password_hash"] if business else None)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # BCRYPT_ROUNDS changed since this hash was made; upgrade it transparently
+        await db.businesses.update_one(
+            {"id": business["id"], "password_hash": business["password_hash"]},
+            {"$set": {"password_hash": new_hash}},
+        )
 
-# ==============================
-# Include Router (ONLY ONCE)
-# ==============================
+    return {
+        "token": create_token(business["id"]),
+        "business_id": business["id"],
+        "business_name": business["business_name"],
+    }
 
-app.include_router(api_router)
+# ------------------------------
+# Public Business Profile
+# ------------------------------
+@api_router.get(
+    "/businesses/{business_id}", response_model=PublicBusiness, dependencies=[Depends(admission.public_request)]
+)
+async def get_business(business_id: str, if_none_match: Optional[str] = Header(None)):
+    cached = profile_cache.get((business_id,))
+    if cached is None:
+        version = profile_cache.version(business_id)
+        db = database.get_db()
+        business = await db.businesses.find_one({"id": business_id}, {**PUBLIC_BUSINESS_FIELDS, "version": 1})
+        if business is None:
+            raise HTTPException(status_code=404, detail="Business not found")
+        etag = profile_etag(business)
+        business.pop("version", None)
+        # Serialized once per version; hits just write the bytes
+        cached = (etag, orjson.dumps(business))
+        profile_cache.put((business_id,), cached, version)
+
+    etag, body = cached
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={PROFILE_MAX_AGE}, s-maxage={PROFILE_SHARED_MAX_AGE}, "
+            f"stale-while-revalidate={PROFILE_STALE_WHILE_REVALIDATE}"
+        ),
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+# ------------------------------
+# Available Slots
+# ------------------------------
+@api_router.get(
+    "/businesses/{business_id}/slots", response_model=List[Slot], dependencies=[Depends(admission.public_request)]
+)
+async def get_slots(business_id: str, date: str = Query(...), service_id: str = Query(...)):
+    day = parse_date(date)
+    key = (business_id, date, service_id)
+    slots = slot_cache.get(key)
+    if slots is not None:
+        return ORJSONResponse(slots)
+
+    version = slot_cache.version(business_id)
+    db = database.get_db()
+    business = await find_bookable_business(db, business_id)
+    service = find_service(business, service_id)
+
+    busy, ttl = await find_busy(db, business_id, date)
+    slots = compute_slots(business, service, day, busy)
+    slot_cache.put(key, slots, version, ttl=ttl)
+    return ORJSONResponse(slots)
+
+# ------------------------------
+# Availability Range (calendar)
+# ------------------------------
+@api_router.get(
+    "/businesses/{business_id}/availability",
+    response_model=List[CalendarDay],
+    dependencies=[Depends(admission.public_request)],
+)
+async def get_availability(
+    business_id: str,
+    date_from: str = Query(..., alias="from"),
+    date_to: str = Query(..., alias="to"),
+    service_id: str = Query(...),
+    include_slots: bool = Query(False),
+):
+    first, last = parse_date(date_from), parse_date(date_to)
+    if last < first:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (last - first).days >= AVAILABILITY_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {AVAILABILITY_MAX_DAYS} days")
+
+    db = database.get_db()
+    business = await find_bookable_business(db, business_id)
+    service = find_service(business, service_id)
+
+    # One range query for the whole calendar instead of one per day
+    busy, _ = await find_busy(db, business_id, {"$gte": first.isoformat(), "$lte": last.isoformat()})
+
+    days = []
+    for day, slots in compute_range(business, service, first, last, busy).items():
+        entry = {"date": day.isoformat(), "available": any(s["available"] for s in slots)}
+        if include_slots:
+            entry["slots"] = slots
+        days.append(entry)
+    return ORJSONResponse(days)
+
+# ------------------------------
+# Widget Bootstrap
+# ------------------------------
+@api_router.get(
+    "/businesses/{business_id}/bootstrap",
+    response_model=WidgetBootstrap,
+    dependencies=[Depends(admission.public_request)],
+)
+async def get_bootstrap(
+    business_id: str,
+    date_from: Optional[str] = Query(None, alias="from"),
+    days: int = Query(BOOTSTRAP_DAYS, ge=1, le=AVAILABILITY_MAX_DAYS),
+    service_id: Optional[str] = Query(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Profile, per-day availability and the first open day's slots in one response.
+
+    Availability is for ``service_id`` (default: the first service) over
+    ``days`` days from ``from``, which should be the visitor's local date
+    and defaults to today in UTC.
+    """
+    first = parse_date(date_from) if date_from else datetime.now(timezone.utc).date()
+    last = first + timedelta(days=days - 1)
+    key = (business_id, first.isoformat(), last.isoformat(), service_id)
+
+    cached = bootstrap_cache.get(key)
+    if cached is None:
+        version = bootstrap_cache.version(business_id)
+        db = database.get_db()
+        business = await db.businesses.find_one(
+            {"id": business_id}, {**PUBLIC_BUSINESS_FIELDS, "schedule": 1, "staff": 1}
+        )
+        if business is None:
+            raise HTTPException(status_code=404, detail="Business not found")
+        bookable = {
+            "schedule": business.pop("schedule", None) or schedules.schedule_of(business),
+            "staff": business.pop("staff", None),
+        }
+        if service_id is not None:
+            service = find_service(business, service_id)
+        else:
+            service = business["services"][0] if business.get("services") else None
+
+        calendar, first_open, ttl = [], None, None
+        if service is not None:
+            busy, ttl = await find_busy(db, business_id, {"$gte": first.isoformat(), "$lte": last.isoformat()})
+            for day, slots in compute_range(bookable, service, first, last, busy).items():
+                available = any(s["available"] for s in slots)
+                calendar.append({"date": day.isoformat(), "available": available})
+                if available and first_open is None:
+                    first_open = {"date": day.isoformat(), "slots": slots}
+
+        body = orjson.dumps({
+            "business": business,
+            "service_id": service["id"] if service else None,
+            "from": first.isoformat(),
+            "to": last.isoformat(),
+            "days": calendar,
+            "slots": first_open,
+        })
+        cached = (f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"', body)
+        bootstrap_cache.put(key, cached, version, ttl=ttl)
+
+    etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age=0, s-maxage={BOOTSTRAP_SHARED_MAX_AGE}"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+# ------------------------------
+# Live Slot Events (SSE)
+# ------------------------------
+@api_router.get("/businesses/{business_id}/events", dependencies=[Depends(admission.public_stream)])
+async def business_events(business_id: str, date: Optional[str] = Query(None)):
+    """slot-taken / slot-freed / schedule-changed for one business, or one of its dates."""
+    if date is not None:
+        parse_date(date)
+    db = database.get_db()
+    if await db.businesses.find_one({"id": business_id}, {"_id": 1}) is None:
+        raise HTTPException(status_code=404, detail="Business not found")
+    return open_stream(business_id, date or events.ALL_DATES)
+
+# ------------------------------
+# Create Booking
+# ------------------------------
+@api_router.post("/bookings", dependencies=[Depends(admission.public_request)])
+async def create_booking(data: BookingCreate):
+    """Book a slot; with ``hold_id`` the visitor's hold becomes the booking."""
+    admission.check_business(data.business_id)
+    db = database.get_db()
+    business, service, start, end = await find_open_slot(db, data)
+    end_time = to_hhmm(end)
+
+    booking_id = str(uuid.uuid4())
+    # Claims stay pending until the booking is stored (see booking_claims)
+    pending = booking_claims.pending_until()
+    hold = await holds.find(db, data.hold_id) if data.hold_id is not None else None
+    held = hold is not None and await booking_claims.convert_hold(
+        db, data.hold_id, data.business_id, data.date, start, end, booking_id, pending
+    )
+    if held:
+        member = find_member(business, hold.get("staff_id"))
+    else:
+        # No hold, or it lapsed: the slot may still be free
+        try:
+            busy = await find_staff_busy(db, business, data.date)
+            member = await staff.assign(
+                db, business, service, data.date, start, end, booking_id, busy, expires_at=pending
+            )
+        except booking_claims.SlotTaken:
+            if data.hold_id is not None:
+                await holds.forget(db, data.hold_id)
+            raise HTTPException(status_code=409, detail="Time slot not available")
+
+    booking = {
+        "id": booking_id,
+        "business_id": data.business_id,
+        "service_id": service["id"],
+        "service_name": service["name"],
+        "date": data.date,
+        "start_time": to_hhmm(start),
+        "end_time": end_time,
+        "customer_name": data.customer_name,
+        "customer_email": data.customer_email,
+        "customer_phone": data.customer_phone,
+        # Revenue analytics count what the customer was quoted, not later prices
+        "price": service.get("price", 0),
+        "status": "confirmed",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if member is not None:
+        booking.update(staff_id=member["id"], staff_name=member["name"])
+    try:
+        await db.bookings.insert_one(dict(booking))
+    except Exception:
+        await booking_claims.release(db, booking_id)
+        raise
+    await booking_claims.confirm(db, booking_id)
+    if data.hold_id is not None:
+        await holds.forget(db, data.hold_id)
+    await analytics.record_created(db, booking)
+    invalidate_slots(data.business_id, date=data.date)
+    events.publish_booking_created(booking)
+    notifications.enqueue(notifications.booking_confirmation(booking, business["business_name"]))
+    return booking
+
+# ------------------------------
+# Slot Holds
+# ------------------------------
+@api_router.post("/holds", dependencies=[Depends(admission.public_request)])
+async def create_hold(data: HoldCreate):
+    """Reserve a slot for ``HOLD_SECONDS`` while the visitor enters their details."""
+    admission.check_business(data.business_id)
+    db = database.get_db()
+    business, service, start, end = await find_open_slot(db, data)
+    try:
+        busy = await find_staff_busy(db, business, data.date)
+        hold = await holds.create(db, business, service, data.date, start, end, busy)
+    except booking_claims.SlotTaken:
+        raise HTTPException(status_code=409, detail="Time slot not available")
+    invalidate_slots(data.business_id, date=data.date)
+    return {**hold, "expires_at": hold["expires_at"].isoformat()}
+
+
+@api_router.delete("/holds/{hold_id}")
+async def release_hold(hold_id: str):
+    db = database.get_db()
+    hold = await holds.release(db, hold_id)
+    if hold is None:
+        raise HTTPException(status_code=404, detail="Hold not found")
+    invalidate_slots(hold["business_id"], date=hold["date"])
+    return {"message": "Hold released"}
+
+# ------------------------------
+# Admin Session
+# ------------------------------
+@admin_router.post("/logout")
+@idempotency.exempt
+async def logout(session: dict = Depends(auth.get_auth)):
+    await auth.revoke_token(session["token"], session["claims"])
+    return {"message": "Logged out"}
+
+
+@admin_router.post("/logout-all")
+@idempotency.exempt
+async def logout_all(business: dict = Depends(get_current_business)):
+    await auth.revoke_all_tokens(business["id"])
+    return {"message": "All sessions revoked"}
+
+# ------------------------------
+# Admin Business
+# ------------------------------
+@admin_router.get("/business")
+async def get_admin_business(business: dict = Depends(get_current_business)):
+    return business
+
+# ------------------------------
+# Admin Live Events (SSE)
+# ------------------------------
+@admin_router.get("/events")
+async def admin_events(business: dict = Depends(get_current_business)):
+    """booking-created / booking-cancelled / schedule-changed for the dashboard."""
+    return open_stream(business["id"], events.ADMIN)
+
+# ------------------------------
+# Admin Bookings
+# ------------------------------
+@admin_router.get("/bookings", response_model=List[Booking])
+async def list_bookings(
+    business: dict = Depends(get_current_business),
+    status: Optional[str] = Query(None, pattern="^(confirmed|cancelled)$"),
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(BOOKINGS_PAGE_SIZE, ge=1, le=BOOKINGS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """One page of bookings in (date, start_time, id) order.
+
+    The body stays a plain list; when more rows exist the opaque cursor for
+    the next page is returned in ``X-Next-Cursor``. Ranges that start before
+    today also read ``bookings_archive``.
+    """
+    db = database.get_db()
+    query = booking_filter(business["id"], status, date_from, date_to)
+    reaches_past = archive.reaches_past(query.get("date", {}).get("$gte"))
+    if cursor:
+        query = {"$and": [query, after_cursor(decode_cursor(cursor), "$gt" if order == "asc" else "$lt")]}
+    direction = 1 if order == "asc" else -1
+    projection = booking_projection(fields)
+    sort = [(f, direction) for f in BOOKING_KEY_FIELDS]
+
+    # One extra row tells us whether another page exists without a count
+    page = await db.bookings.find(query, projection).sort(sort).limit(limit + 1).to_list(length=limit + 1)
+    # Archived rows are all dated before today: newest first, a full page
+    # that ends today or later cannot have any of them
+    if reaches_past and not (order == "desc" and len(page) > limit and page[-1]["date"] >= archive.today()):
+        cold = await db.bookings_archive.find(query, projection).sort(sort).limit(limit + 1).to_list(length=limit + 1)
+        page = archive.merge_pages(page, cold, BOOKING_KEY_FIELDS, order == "desc", limit + 1)
+    headers = {}
+    if len(page) > limit:
+        page = page[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(page[-1])
+    return ORJSONResponse(page, headers=headers)
+
+
+@admin_router.get("/bookings/count")
+async def count_bookings(
+    business: dict = Depends(get_current_business),
+    status: Optional[str] = Query(None, pattern="^(confirmed|cancelled)$"),
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+):
+    """How many bookings ``GET /admin/bookings`` would list with the same filters.
+
+    Served from the daily analytics rollups, so the cost grows with the
+    number of days in the range rather than the number of bookings, and
+    archived bookings are included without reading the archive.
+    """
+    db = database.get_db()
+    query = booking_filter(business["id"], status, date_from, date_to)
+    return {"count": await analytics.count(db, business["id"], status, query.get("date"))}
+
+
+@admin_router.delete("/bookings/{booking_id}")
+async def cancel_booking(booking_id: str, business: dict = Depends(get_current_business)):
+    db = database.get_db()
+    # Returns the pre-update document, so status tells us if this cancelled it
+    booking = await db.bookings.find_one_and_update(
+        {"id": booking_id, "business_id": business["id"]},
+        {"$set": {"status": "cancelled", "cancelled_at": datetime.now(timezone.utc).isoformat()}},
+        projection={"_id": 0},
+    )
+    if booking is None:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    await booking_claims.release(db, booking_id)
+    invalidate_slots(business["id"], date=booking["date"])
+    if booking["status"] == "confirmed":
+        await analytics.record_cancelled(db, [booking])
+        events.publish_booking_cancelled(booking)
+        notifications.enqueue(notifications.booking_cancellation(booking, business["business_name"]))
+    return {"message": "Booking cancelled"}
+
+
+@admin_router.post("/bookings/cancel")
+async def cancel_bookings(data: BookingCancelBulk, business: dict = Depends(get_current_business)):
+    db = database.get_db()
+    ids = list(dict.fromkeys(data.booking_ids))
+    scope = {"id": {"$in": ids}, "business_id": business["id"]}
+    # The timestamp marks exactly the bookings this request flipped, so a
+    # concurrent cancellation never sends a second email
+    cancelled_at = datetime.now(timezone.utc).isoformat()
+    await db.bookings.update_many(
+        {**scope, "status": "confirmed"}, {"$set": {"status": "cancelled", "cancelled_at": cancelled_at}}
+    )
+    found = {b["id"]: b for b in await db.bookings.find(scope, {"_id": 0}).to_list(length=None)}
+    if found:
+        await booking_claims.release_many(db, list(found))
+        invalidate_slots(business["id"], dates={b["date"] for b in found.values()})
+    await analytics.record_cancelled(db, [b for b in found.values() if b.get("cancelled_at") == cancelled_at])
+
+    results = []
+    for booking_id in ids:
+        booking = found.get(booking_id)
+        if booking is None:
+            results.append({"id": booking_id, "status": "not_found"})
+        elif booking.get("cancelled_at") == cancelled_at:
+            events.publish_booking_cancelled(booking)
+            notifications.enqueue(notifications.booking_cancellation(booking, business["business_name"]))
+            results.append({"id": booking_id, "status": "cancelled"})
+        else:
+            results.append({"id": booking_id, "status": "already_cancelled"})
+    return {"results": results}
+
+# ------------------------------
+# Admin Analytics
+# ------------------------------
+@admin_router.get("/analytics")
+async def get_analytics(
+    business: dict = Depends(get_current_business),
+    date_from: Optional[str] = Query(None, alias="from"),
+    date_to: Optional[str] = Query(None, alias="to"),
+):
+    """Bookings, cancellations, revenue and utilization per day and service.
+
+    Reads only the daily rollups, so the cost depends on the length of the
+    range, never on how many bookings the business has. Defaults to the last
+    ``ANALYTICS_DEFAULT_DAYS`` days.
+    """
+    last = parse_date(date_to) if date_to else datetime.now(timezone.utc).date()
+    first = parse_date(date_from) if date_from else last - timedelta(days=ANALYTICS_DEFAULT_DAYS - 1)
+    if last < first:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (last - first).days >= ANALYTICS_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {ANALYTICS_MAX_DAYS} days")
+
+    db = database.get_db()
+    return ORJSONResponse(await analytics.summary(
+        db, business["id"], schedules.schedule_of(business), first, last, len(business.get("staff") or ())
+    ))
+
+# ------------------------------
+# Admin Services
+# ------------------------------
+@admin_router.post("/services")
+async def add_service(data: ServiceCreate, business: dict = Depends(get_current_business)):
+    service = {"id": str(uuid.uuid4()), **data.model_dump()}
+    await update_business(business["id"], {"$push": {"services": service}})
+    return service
+
+
+@admin_router.post("/services/bulk")
+async def add_services(data: ServiceBulkCreate, business: dict = Depends(get_current_business)):
+    services = [{"id": str(uuid.uuid4()), **s.model_dump()} for s in data.services]
+    result = await update_business(business["id"], {"$push": {"services": {"$each": services}}})
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Business not found")
+    return {"results": [{"index": i, "status": "created", "service": s} for i, s in enumerate(services)]}
+
+
+@admin_router.delete("/services/{service_id}")
+async def delete_service(service_id: str, business: dict = Depends(get_current_business)):
+    result = await update_business(
+        business["id"],
+        {"$pull": {"services": {"id": service_id}}},
+        query={"services.id": service_id},
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Service not found")
+    invalidate_slots(business["id"], service_id=service_id)
+    return {"message": "Service deleted"}
+
+# ------------------------------
+# Admin Staff
+# ------------------------------
+@admin_router.post("/staff")
+async def add_staff(data: StaffCreate, business: dict = Depends(get_current_business)):
+    """Add a member; the first one takes over the business's upcoming bookings."""
+    check_service_ids(business, data.service_ids)
+    member = {"id": str(uuid.uuid4()), **data.model_dump()}
+    result = await update_business(business["id"], {"$push": {"staff": member}})
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Business not found")
+    db = database.get_db()
+    current = await db.businesses.find_one({"id": business["id"]}, {"_id": 0, "staff": 1})
+    if current["staff"][0]["id"] == member["id"]:
+        await staff.adopt(db, business["id"], member)
+    invalidate_slots(business["id"])
+    events.publish_schedule_changed(business["id"])
+    return member
+
+
+@admin_router.put("/staff/{staff_id}")
+async def update_staff(staff_id: str, data: StaffCreate, business: dict = Depends(get_current_business)):
+    check_service_ids(business, data.service_ids)
+    result = await update_business(
+        business["id"],
+        {"$set": {"staff.$.name": data.name, "staff.$.service_ids": data.service_ids}},
+        query={"staff.id": staff_id},
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Staff member not found")
+    invalidate_slots(business["id"])
+    events.publish_schedule_changed(business["id"])
+    return {"id": staff_id, **data.model_dump()}
+
+
+@admin_router.delete("/staff/{staff_id}")
+async def delete_staff(staff_id: str, business: dict = Depends(get_current_business)):
+    db = database.get_db()
+    if await staff.has_upcoming(db, business["id"], staff_id):
+        raise HTTPException(status_code=409, detail="Staff member has upcoming bookings, cancel them first")
+    result = await update_business(
+        business["id"],
+        {"$pull": {"staff": {"id": staff_id}}},
+        query={"staff.id": staff_id},
+    )
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Staff member not found")
+    invalidate_slots(business["id"])
+    events.publish_schedule_changed(business["id"])
+    return {"message": "Staff member deleted"}
+
+# ------------------------------
+# Admin Availability
+# ------------------------------
+@admin_router.put("/availability")
+async def update_availability(data: AvailabilityUpdate, business: dict = Depends(get_current_business)):
+    availability = [a.model_dump() for a in data.availability]
+    await update_schedule(business["id"], availability=availability)
+    invalidate_slots(business["id"])
+    events.publish_schedule_changed(business["id"])
+    return {"message": "Availability updated"}
+
+# ------------------------------
+# Admin Blocked Dates
+# ------------------------------
+@admin_router.post("/blocked-dates")
+async def block_date(data: BlockedDateRequest, business: dict = Depends(get_current_business)):
+    parse_date(data.date)
+    await update_schedule(
+        business["id"], change_blocked=lambda blocked: blocked if data.date in blocked else blocked + [data.date]
+    )
+    invalidate_slots(business["id"], date=data.date)
+    events.publish_schedule_changed(business["id"], [data.date])
+    return {"message": "Date blocked"}
+
+
+@admin_router.post("/blocked-dates/bulk")
+async def update_blocked_dates(data: BlockedDatesBulk, business: dict = Depends(get_current_business)):
+    to_block, to_unblock = expand_ranges(data.block), expand_ranges(data.unblock)
+    if not to_block and not to_unblock:
+        raise HTTPException(status_code=400, detail="Nothing to block or unblock")
+    if set(to_block) & set(to_unblock):
+        raise HTTPException(status_code=400, detail="A date cannot be both blocked and unblocked")
+
+    outcome = {}
+
+    def apply(blocked):
+        # Re-run on every optimistic retry, so results match what was written
+        current = set(blocked)
+        outcome.clear()
+        for day in to_block:
+            outcome[day] = "already_blocked" if day in current else "blocked"
+            current.add(day)
+        for day in to_unblock:
+            outcome[day] = "unblocked" if day in current else "not_blocked"
+            current.discard(day)
+        return sorted(current)
+
+    await update_schedule(business["id"], change_blocked=apply)
+    changed = {day for day, status in outcome.items() if status in ("blocked", "unblocked")}
+    if changed:
+        invalidate_slots(business["id"], dates=changed)
+        events.publish_schedule_changed(business["id"], changed)
+    return {"results": [{"date": day, "status": status} for day, status in outcome.items()]}
+
+
+@admin_router.delete("/blocked-dates/{date}")
+async def unblock_date(date: str, business: dict = Depends(get_current_business)):
+    await update_schedule(business["id"], change_blocked=lambda blocked: [d for d in blocked if d != date])
+    invalidate_slots(business["id"], date=date)
+    events.publish_schedule_changed(business["id"], [date])
+    return {"message": "Date unblocked"}
 
 # ==============================
-# Shutdown Event
+# Include Router (ONLY ONCE)
 # ==============================
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
-    print("Database connection closed")
\ No newline at end of file
+api_router.include_router(admin_router)
+app.include_router(api_router)
@@ -0,0 +1,216 @@
+"""Prometheus metrics for HTTP routes and MongoDB commands.
+
+A small in-process registry rather than a client library: three metric
+types, labels as tuples, and text exposition on ``GET /metrics``. Each
+observation is a dict lookup, a bisect and a few integer increments under
+an uncontended lock, so it is cheap enough to leave on in production
+(``python -m benchmarks.metrics_overhead`` measures it).
+
+HTTP requests are labelled with the route template (``/api/businesses/{business_id}/slots``),
+never the raw path, so label cardinality stays bounded. MongoDB commands
+are timed through pymongo's command monitoring, which Motor calls from its
+worker threads; that is why every metric takes a lock.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+from pymongo import monitoring
+
+# ==============================
+# Settings
+# ==============================
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ==============================
+# Metric Types
+# ==============================
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        # Unlabelled series exist from the start so dashboards see a 0, not a gap
+        self._values: Dict[Tuple[str, ...], float] = {} if self.labelnames else {(): 0}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, labels)} {value}" for labels, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Tuple[str, ...] = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def _samples(self):
+        with self._lock:
+            items = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+        lines = []
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+# ==============================
+# Metrics
+# ==============================
+
+http_requests = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+http_duration = Histogram("http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+http_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+
+mongo_duration = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency by collection and command.",
+    ("collection", "command"),
+)
+mongo_failures = Counter(
+    "mongodb_command_failures_total", "MongoDB commands that returned an error.", ("collection", "command"),
+)
+mongo_in_flight = Gauge("mongodb_commands_in_flight", "MongoDB commands sent and not yet answered.")
+
+# ==============================
+# HTTP Middleware
+# ==============================
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; BaseHTTPMiddleware would add a task per request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.dec()
+            # The router stores the matched route on the scope; unmatched
+            # paths share one label so scanners can't blow up cardinality
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            http_duration.observe((scope["method"], path), elapsed)
+            http_requests.inc((scope["method"], path, str(status)))
+
+# ==============================
+# MongoDB Command Listener
+# ==============================
+
+class CommandTimer(monitoring.CommandListener):
+    def __init__(self):
+        # (request_id, connection_id) -> (collection, command); started and
+        # succeeded/failed events for one command arrive on the same thread
+        self._pending: Dict[tuple, Tuple[str, str]] = {}
+
+    @staticmethod
+    def _collection(event) -> str:
+        key = "collection" if event.command_name == "getMore" else event.command_name
+        value = event.command.get(key)
+        return value if isinstance(value, str) else ""
+
+    def started(self, event):
+        self._pending[(event.request_id, event.connection_id)] = (self._collection(event), event.command_name)
+        mongo_in_flight.inc()
+
+    def succeeded(self, event):
+        labels = self._pending.pop((event.request_id, event.connection_id), None)
+        if labels is None:
+            return
+        mongo_in_flight.dec()
+        mongo_duration.observe(labels, event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        labels = self._pending.pop((event.request_id, event.connection_id), None)
+        if labels is None:
+            return
+        mongo_in_flight.dec()
+        mongo_duration.observe(labels, event.duration_micros / 1_000_000)
+        mongo_failures.inc(labels)
+
+
+command_timer = CommandTimer()
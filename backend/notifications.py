@@ -0,0 +1,292 @@
+"""Background email delivery.
+
+Request handlers only ``enqueue`` a message, which is an in-memory append,
+so booking latency never includes a call to the email provider. A small
+pool of asyncio workers drains the queue in batches, retries failed
+batches with exponential backoff and moves messages that keep failing to
+the ``email_dead_letters`` collection.
+
+The transport is pluggable: ``EMAIL_TRANSPORT=resend`` (the default when
+``RESEND_API_KEY`` is set), ``log`` (the default otherwise) or ``memory``
+for tests and CI.
+"""
+
+import asyncio
+import html
+import logging
+import os
+import random
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ==============================
+# Settings
+# ==============================
+
+RESEND_API_KEY = os.getenv("RESEND_API_KEY", "")
+SENDER_EMAIL = os.getenv("SENDER_EMAIL", "onboarding@resend.dev")
+EMAIL_TRANSPORT = os.getenv("EMAIL_TRANSPORT", "resend" if RESEND_API_KEY else "log")
+
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", "2"))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "50"))  # Resend batch API takes up to 100
+EMAIL_BATCH_WAIT_MS = int(os.getenv("EMAIL_BATCH_WAIT_MS", "200"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_BACKOFF_BASE_SECONDS = float(os.getenv("EMAIL_BACKOFF_BASE_SECONDS", "1"))
+EMAIL_BACKOFF_MAX_SECONDS = float(os.getenv("EMAIL_BACKOFF_MAX_SECONDS", "60"))
+EMAIL_QUEUE_MAX = int(os.getenv("EMAIL_QUEUE_MAX", "10000"))
+EMAIL_SHUTDOWN_TIMEOUT_SECONDS = float(os.getenv("EMAIL_SHUTDOWN_TIMEOUT_SECONDS", "5"))
+
+# ==============================
+# Transports
+# ==============================
+
+class EmailTransport:
+    async def send_batch(self, messages: List[dict]) -> None:
+        raise NotImplementedError
+
+
+class ResendTransport(EmailTransport):
+    def __init__(self, api_key: str, sender: str):
+        import resend  # only needed when actually sending
+
+        resend.api_key = api_key
+        self._resend = resend
+        self.sender = sender
+
+    async def send_batch(self, messages):
+        params = [
+            {"from": self.sender, "to": [m["to"]], "subject": m["subject"], "html": m["html"]}
+            for m in messages
+        ]
+        # The Resend SDK is blocking; keep it off the event loop.
+        if len(params) == 1:
+            await asyncio.to_thread(self._resend.Emails.send, params[0])
+        else:
+            await asyncio.to_thread(self._resend.Batch.send, params)
+
+
+class LogTransport(EmailTransport):
+    async def send_batch(self, messages):
+        for m in messages:
+            logger.info("Email (not sent, no RESEND_API_KEY) to=%s subject=%s", m["to"], m["subject"])
+
+
+class MemoryTransport(EmailTransport):
+    """Records messages instead of sending them; can be told to fail."""
+
+    def __init__(self, fail_times: int = 0):
+        self.sent: List[dict] = []
+        self.batches = 0
+        self.fail_times = fail_times
+
+    async def send_batch(self, messages):
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise RuntimeError("simulated transport failure")
+        self.batches += 1
+        self.sent.extend(messages)
+
+
+def default_transport() -> EmailTransport:
+    if EMAIL_TRANSPORT == "resend":
+        return ResendTransport(RESEND_API_KEY, SENDER_EMAIL)
+    if EMAIL_TRANSPORT == "memory":
+        return MemoryTransport()
+    return LogTransport()
+
+# ==============================
+# Queue
+# ==============================
+
+class EmailQueue:
+    def __init__(self, db, transport: EmailTransport):
+        self.db = db
+        self.transport = transport
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=EMAIL_QUEUE_MAX)
+        self._workers: List[asyncio.Task] = []
+        # Keyed by id() so shutdown can dead-letter messages that left the queue
+        self._inflight: Dict[int, List[dict]] = {}
+        self._delayed: Dict[int, Tuple[asyncio.TimerHandle, dict]] = {}
+
+        self.enqueued = 0
+        self.sent = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.batches = 0
+
+    def enqueue(self, message: dict) -> None:
+        message.setdefault("attempts", 0)
+        try:
+            self._queue.put_nowait(message)
+            self.enqueued += 1
+        except asyncio.QueueFull:
+            asyncio.get_running_loop().create_task(self._dead_letter([message], "queue full"))
+
+    def start(self):
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(EMAIL_WORKERS)]
+
+    async def stop(self, timeout: float = EMAIL_SHUTDOWN_TIMEOUT_SECONDS):
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Email queue not drained after %.1fs", timeout)
+
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+        # Whatever could not be delivered in time is kept, not dropped.
+        leftovers = [m for batch in self._inflight.values() for m in batch]
+        self._inflight.clear()
+        for handle, message in self._delayed.values():
+            handle.cancel()
+            leftovers.append(message)
+        self._delayed.clear()
+        while not self._queue.empty():
+            leftovers.append(self._queue.get_nowait())
+            self._queue.task_done()
+        if leftovers:
+            await self._dead_letter(leftovers, "shutdown")
+
+    async def _fill(self, batch: List[dict]):
+        batch.append(await self._queue.get())
+        deadline = asyncio.get_running_loop().time() + EMAIL_BATCH_WAIT_MS / 1000
+        while len(batch) < EMAIL_BATCH_SIZE:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _worker(self):
+        while True:
+            batch: List[dict] = []
+            self._inflight[id(batch)] = batch
+            await self._fill(batch)
+            try:
+                await self.transport.send_batch(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Email batch of %d failed: %s", len(batch), exc)
+                await self._retry(batch, str(exc))
+            else:
+                self.sent += len(batch)
+                self.batches += 1
+
+            del self._inflight[id(batch)]
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _retry(self, batch: List[dict], error: str):
+        loop = asyncio.get_running_loop()
+        exhausted = []
+        for message in batch:
+            message["attempts"] += 1
+            message["last_error"] = error
+            if message["attempts"] >= EMAIL_MAX_ATTEMPTS:
+                exhausted.append(message)
+                continue
+            delay = min(EMAIL_BACKOFF_MAX_SECONDS, EMAIL_BACKOFF_BASE_SECONDS * 2 ** (message["attempts"] - 1))
+            delay *= random.uniform(0.8, 1.2)
+            handle = loop.call_later(delay, self._requeue, message)
+            self._delayed[id(message)] = (handle, message)
+            self.retried += 1
+        if exhausted:
+            await self._dead_letter(exhausted, error)
+
+    def _requeue(self, message: dict):
+        self._delayed.pop(id(message), None)
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            asyncio.get_running_loop().create_task(self._dead_letter([message], "queue full"))
+
+    async def _dead_letter(self, messages: List[dict], error: str):
+        self.dead_lettered += len(messages)
+        now = datetime.now(timezone.utc).isoformat()
+        docs = [{**m, "error": m.get("last_error", error), "dead_lettered_at": now} for m in messages]
+        try:
+            await self.db.email_dead_letters.insert_many(docs)
+        except Exception:
+            logger.exception("Could not store %d dead-lettered emails", len(docs))
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "waiting_retry": len(self._delayed),
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "batches": self.batches,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+        }
+
+# ==============================
+# Lifecycle
+# ==============================
+
+_queue: Optional[EmailQueue] = None
+
+
+async def start(db, transport: Optional[EmailTransport] = None) -> EmailQueue:
+    global _queue
+    _queue = EmailQueue(db, transport or default_transport())
+    _queue.start()
+    return _queue
+
+
+async def stop():
+    global _queue
+    if _queue is not None:
+        await _queue.stop()
+    _queue = None
+
+
+def enqueue(message: dict) -> None:
+    if _queue is None:
+        logger.warning("Email queue not running; dropping %s to %s", message.get("kind"), message.get("to"))
+        return
+    _queue.enqueue(message)
+
+
+def get_queue() -> Optional[EmailQueue]:
+    return _queue
+
+# ==============================
+# Messages
+# ==============================
+
+def booking_confirmation(booking: dict, business_name: str) -> dict:
+    return {
+        "kind": "booking_confirmation",
+        "booking_id": booking["id"],
+        "to": booking["customer_email"],
+        "subject": f"Booking confirmed: {booking['service_name']} on {booking['date']}",
+        "html": _booking_html("Your booking is confirmed", booking, business_name),
+    }
+
+
+def booking_cancellation(booking: dict, business_name: str) -> dict:
+    return {
+        "kind": "booking_cancellation",
+        "booking_id": booking["id"],
+        "to": booking["customer_email"],
+        "subject": f"Booking cancelled: {booking['service_name']} on {booking['date']}",
+        "html": _booking_html("Your booking has been cancelled", booking, business_name),
+    }
+
+
+def _booking_html(heading: str, booking: dict, business_name: str) -> str:
+    e = html.escape
+    return (
+        f"<h2>{e(heading)}</h2>"
+        f"<p>Hi {e(booking['customer_name'])},</p>"
+        f"<p><strong>{e(booking['service_name'])}</strong> with {e(business_name)}<br>"
+        f"{e(booking['date'])}, {e(booking['start_time'])} - {e(booking['end_time'])}</p>"
+        f"<p>Reference: {e(booking['id'][:8])}</p>"
+    )
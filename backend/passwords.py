@@ -0,0 +1,112 @@
+"""Password hashing off the event loop.
+
+bcrypt is deliberately slow (~200ms at cost 12) and would stall every
+request on the worker if it ran on the event loop. Hashing and verification
+run on a small dedicated thread pool instead (bcrypt releases the GIL), with
+a cap on queued jobs so a login storm is rejected quickly rather than
+queueing without bound.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+# ==============================
+# Settings
+# ==============================
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+# Hashes made with a different cost are flagged by needs_update, which is
+# what drives the rehash-on-login below.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+class HasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, context: CryptContext, workers: int, max_pending: int):
+        self.context = context
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+
+        self.calls = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.queue_ms_total = 0.0
+        self.queue_ms_max = 0.0
+        self.run_ms_total = 0.0
+        self.run_ms_max = 0.0
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise HasherBusy()
+
+        submitted = time.perf_counter()
+        timings = {}
+
+        def job():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                timings["queue"] = started - submitted
+                timings["run"] = time.perf_counter() - started
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self._pending -= 1
+            self.calls += 1
+            if timings:
+                queue_ms, run_ms = timings["queue"] * 1000, timings["run"] * 1000
+                self.queue_ms_total += queue_ms
+                self.queue_ms_max = max(self.queue_ms_max, queue_ms)
+                self.run_ms_total += run_ms
+                self.run_ms_max = max(self.run_ms_max, run_ms)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, password_hash: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """Return ``(valid, new_hash)``; ``new_hash`` is set when the cost changed."""
+        if password_hash is None:
+            # Spend the same time as a real check so unknown emails can't be timed
+            await self._run(self.context.dummy_verify)
+            return False, None
+        valid, new_hash = await self._run(self.context.verify_and_update, password, password_hash)
+        if new_hash:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "rounds": BCRYPT_ROUNDS,
+            "workers": self._executor._max_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "queue_ms_avg": round(self.queue_ms_total / self.calls, 2) if self.calls else 0.0,
+            "queue_ms_max": round(self.queue_ms_max, 2),
+            "run_ms_avg": round(self.run_ms_total / self.calls, 2) if self.calls else 0.0,
+            "run_ms_max": round(self.run_ms_max, 2),
+        }
+
+
+hasher = PasswordHasher(pwd_context, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
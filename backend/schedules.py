@@ -0,0 +1,53 @@
+"""Compiled opening-hours schedules on business documents.
+
+Every admin write to ``availability`` or ``blocked_dates`` stores the
+compiled form from ``slot_engine.compile_schedule`` next to them. Businesses
+written before that existed are compiled on read until backfilled::
+
+    python -m schedules backfill
+"""
+
+import asyncio
+import sys
+
+import database
+from slot_engine import compile_schedule
+
+
+def schedule_of(business: dict) -> dict:
+    return compile_schedule(business.get("availability", ()), business.get("blocked_dates", ()))
+
+
+async def backfill(db) -> int:
+    """Compile schedules for businesses that don't have one yet."""
+    compiled = 0
+    cursor = db.businesses.find(
+        {"schedule": {"$exists": False}}, {"_id": 0, "id": 1, "availability": 1, "blocked_dates": 1, "version": 1}
+    )
+    async for business in cursor:
+        # Skipped if an admin write got there first; that write compiled it
+        result = await db.businesses.update_one(
+            {"id": business["id"], "version": business.get("version"), "schedule": {"$exists": False}},
+            {"$set": {"schedule": schedule_of(business)}},
+        )
+        compiled += result.modified_count
+    return compiled
+
+
+async def _main(argv):
+    if argv[1:] != ["backfill"]:
+        print("usage: python -m schedules backfill")
+        return 2
+
+    db = await database.connect()
+    try:
+        compiled = await backfill(db)
+    finally:
+        await database.close()
+
+    print(f"Compiled schedules for {compiled} businesses")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv)))
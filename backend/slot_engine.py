@@ -0,0 +1,218 @@
+"""Slot computation for a single business day.
+
+Everything works in minutes since midnight. Bookings are turned into a
+sorted, merged list of busy intervals once, and the candidate slots are then
+produced in a single sweep that walks the slots and the busy intervals side
+by side, so a day costs O(B log B + S) instead of O(S * B).
+
+Opening hours are read from the business's compiled ``schedule`` (see
+``compile_schedule``), which admin writes keep next to the raw
+``availability`` and ``blocked_dates`` fields, so the read path does no
+string parsing for them.
+
+A business with ``staff`` books each member separately: a slot is open if
+any member qualified for the service is free for its whole length. Each
+member's free time becomes the ranges of start minutes that fit the
+service, and one sweep over all members' ranges in start order merges
+them, so a day costs O(B log B + R log M + S) for R ranges across M
+members rather than checking every slot against every member's bookings.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date as Date, datetime, timedelta
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+Interval = Tuple[int, int]
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minutes(hhmm: str) -> int:
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def to_hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def compile_schedule(availability: Iterable[dict], blocked_dates: Iterable[str]) -> dict:
+    """Precompute opening hours for the read path.
+
+    ``weekly`` holds one ``[start, end]`` minute range (or ``None``) per
+    weekday, Monday first; ``blocked`` holds the blocked dates as sorted
+    proleptic ordinals, so a lookup is a bisect on integers.
+    """
+    weekly: List[Optional[List[int]]] = [None] * 7
+    seen = set()
+    for entry in availability:
+        # The first enabled entry for a weekday wins, as it always has
+        if entry.get("enabled") and entry["day"] not in seen:
+            seen.add(entry["day"])
+            start, end = to_minutes(entry["start_time"]), to_minutes(entry["end_time"])
+            if start < end:
+                weekly[entry["day"]] = [start, end]
+    blocked = set()
+    for value in blocked_dates:
+        try:
+            blocked.add(datetime.strptime(value, "%Y-%m-%d").date().toordinal())
+        except ValueError:
+            continue  # never matched a real day before either
+    return {"weekly": weekly, "blocked": sorted(blocked)}
+
+
+def is_blocked(blocked: Sequence[int], ordinal: int) -> bool:
+    i = bisect_left(blocked, ordinal)
+    return i < len(blocked) and blocked[i] == ordinal
+
+
+def day_window(business: dict, day: Date) -> Optional[Interval]:
+    """Opening hours for ``day`` or ``None`` when the business is closed."""
+    schedule = business["schedule"]
+    if is_blocked(schedule["blocked"], day.toordinal()):
+        return None
+    window = schedule["weekly"][day.weekday()]
+    return (window[0], window[1]) if window else None
+
+
+def busy_intervals(bookings: Iterable[dict]) -> List[Interval]:
+    """Sorted, non-overlapping busy intervals for a day's bookings."""
+    intervals = sorted((to_minutes(b["start_time"]), to_minutes(b["end_time"])) for b in bookings)
+
+    merged: List[Interval] = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def generate_slots(window: Interval, duration: int, busy: List[Interval]) -> List[dict]:
+    start, end = window
+    slots = []
+    i, n = 0, len(busy)
+
+    while start + duration <= end:
+        slot_end = start + duration
+        # Busy intervals that finished before this slot can never overlap a
+        # later one either, so the pointer only moves forward.
+        while i < n and busy[i][1] <= start:
+            i += 1
+        available = i == n or busy[i][0] >= slot_end
+        slots.append({"start_time": to_hhmm(start), "end_time": to_hhmm(slot_end), "available": available})
+        start = slot_end
+    return slots
+
+
+def is_slot_start(window: Optional[Interval], duration: int, start: int) -> bool:
+    """Whether ``start`` lies on the slot grid that ``generate_slots`` produces."""
+    if window is None:
+        return False
+    return window[0] <= start and start + duration <= window[1] and (start - window[0]) % duration == 0
+
+
+def qualified_staff(business: dict, service: dict) -> List[dict]:
+    """Members who perform ``service``, in the business's order."""
+    return [
+        member for member in business.get("staff") or ()
+        if member.get("service_ids") is None or service["id"] in member["service_ids"]
+    ]
+
+
+def staff_busy(staff: Sequence[dict], bookings: Iterable[dict]) -> Dict[str, List[Interval]]:
+    """Busy intervals per member id.
+
+    Bookings without a ``staff_id`` predate the business adding staff and
+    count for its first member, who takes them over (see ``staff.adopt``).
+    """
+    owner = staff[0]["id"]
+    by_member = defaultdict(list)
+    for booking in bookings:
+        by_member[booking.get("staff_id") or owner].append(booking)
+    return {member["id"]: busy_intervals(by_member.get(member["id"], ())) for member in staff}
+
+
+def free_starts(window: Interval, duration: int, busy: List[Interval]) -> List[Interval]:
+    """Half-open ranges of start minutes at which ``duration`` fits between ``busy`` intervals."""
+    ranges = []
+    cursor, close = window
+    for busy_start, busy_end in busy + [(close, close)]:
+        gap_end = min(busy_start, close)
+        if gap_end - cursor >= duration:
+            ranges.append((cursor, gap_end - duration + 1))
+        cursor = max(cursor, busy_end)
+        if cursor >= close:
+            break
+    return ranges
+
+
+def merge_ranges(per_member: Iterable[List[Interval]]) -> List[Interval]:
+    """Union of sorted range lists, joined in one sweep in start order.
+
+    ``sorted`` merges the already-sorted runs in C, which beats a
+    ``heapq.merge`` of them by several times at the sizes seen here.
+    """
+    merged: List[Interval] = []
+    for start, end in sorted(chain.from_iterable(per_member)):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def open_slots(window: Interval, duration: int, starts: List[Interval]) -> List[dict]:
+    """The slot grid of ``window``, open where a slot's start lies in ``starts``."""
+    start, end = window
+    slots = []
+    i, n = 0, len(starts)
+
+    while start + duration <= end:
+        while i < n and starts[i][1] <= start:
+            i += 1
+        available = i < n and starts[i][0] <= start
+        slots.append({"start_time": to_hhmm(start), "end_time": to_hhmm(start + duration), "available": available})
+        start += duration
+    return slots
+
+
+def free_staff(business: dict, service: dict, bookings: Iterable[dict], start: int, end: int) -> List[dict]:
+    """Qualified members with nothing booked in ``[start, end)``, in the business's order."""
+    busy = staff_busy(business["staff"], bookings)
+    return [
+        member for member in qualified_staff(business, service)
+        if not any(s < end and e > start for s, e in busy[member["id"]])
+    ]
+
+
+def compute_slots(business: dict, service: dict, day: Date, bookings: Iterable[dict]) -> List[dict]:
+    window = day_window(business, day)
+    if window is None:
+        return []
+    duration = service["duration"]
+    if not business.get("staff"):
+        return generate_slots(window, duration, busy_intervals(bookings))
+    busy = staff_busy(business["staff"], bookings)
+    starts = merge_ranges(free_starts(window, duration, busy[m["id"]]) for m in qualified_staff(business, service))
+    return open_slots(window, duration, starts)
+
+
+def compute_range(
+    business: dict, service: dict, first: Date, last: Date, bookings: Iterable[dict]
+) -> Dict[Date, List[dict]]:
+    """Slots for every day in ``[first, last]`` from one batch of bookings."""
+    by_date = defaultdict(list)
+    for booking in bookings:
+        by_date[booking["date"]].append(booking)
+
+    days = {}
+    day = first
+    while day <= last:
+        days[day] = compute_slots(business, service, day, by_date.get(day.isoformat(), ()))
+        day += timedelta(days=1)
+    return days
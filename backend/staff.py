@@ -0,0 +1,82 @@
+"""Staff members: the resources a business's bookings are assigned to.
+
+A business without ``staff`` is a single implicit resource, as before. Once
+it has members (``{"id", "name", "service_ids"}``, where ``service_ids``
+None means every service), a slot is open while any member qualified for
+the service is free for its whole length (``slot_engine.compute_slots``),
+and every booking or hold belongs to one member: its slot claims carry the
+member's id as ``resource``, so members are booked in parallel but never
+twice for the same minute.
+
+``assign`` tries the qualified members that were free when the caller read
+the day's bookings, in the business's order, and keeps the first whose
+claim succeeds; a member booked in between simply loses the claim race and
+the next one is tried.
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+import booking_claims
+from archive import today
+from slot_engine import free_staff
+
+
+async def assign(
+    db,
+    business: dict,
+    service: dict,
+    date: str,
+    start: int,
+    end: int,
+    claim_id: str,
+    bookings: Iterable[dict] = (),
+    expires_at: Optional[datetime] = None,
+) -> Optional[dict]:
+    """Claim ``[start, end)`` for the first free qualified member.
+
+    ``bookings`` are the day's confirmed bookings and live holds. Returns the
+    member, or None for a business without staff; raises
+    ``booking_claims.SlotTaken`` if nobody could take it.
+    """
+    if not business.get("staff"):
+        await booking_claims.claim(db, business["id"], date, start, end, claim_id, expires_at=expires_at)
+        return None
+    for member in free_staff(business, service, bookings, start, end):
+        try:
+            await booking_claims.claim(
+                db, business["id"], date, start, end, claim_id, expires_at=expires_at, resource=member["id"]
+            )
+            return member
+        except booking_claims.SlotTaken:
+            continue
+    raise booking_claims.SlotTaken()
+
+
+async def adopt(db, business_id: str, member: dict):
+    """Give a business's first member its upcoming bookings, holds and claims.
+
+    Until now they belonged to the business as a whole; without this, the
+    member could be booked a second time over them.
+    """
+    since = {"$gte": today()}
+    await db.bookings.update_many(
+        {"business_id": business_id, "date": since, "staff_id": {"$exists": False}},
+        {"$set": {"staff_id": member["id"], "staff_name": member["name"]}},
+    )
+    await db.slot_holds.update_many(
+        {"business_id": business_id, "date": since, "staff_id": {"$exists": False}},
+        {"$set": {"staff_id": member["id"]}},
+    )
+    await db.slot_claims.update_many(
+        {"business_id": business_id, "date": since, "resource": {"$exists": False}},
+        {"$set": {"resource": member["id"]}},
+    )
+
+
+async def has_upcoming(db, business_id: str, staff_id: str) -> bool:
+    booking = await db.bookings.find_one(
+        {"business_id": business_id, "date": {"$gte": today()}, "status": "confirmed", "staff_id": staff_id},
+        {"_id": 1},
+    )
+    return booking is not None
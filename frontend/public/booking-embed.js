@@ -27,9 +27,11 @@
     this.state = {
       step: 0,
       business: null,
+      bootstrap: null,
       selectedService: null,
       selectedDate: null,
       selectedSlot: null,
+      hold: null,
       slots: [],
       customerInfo: { name: '', email: '', phone: '' },
       booking: null,
@@ -95,15 +97,20 @@
     }
   };
 
+  // One round trip for the profile, the next two weeks of availability for
+  // the first service and the slots of its first open day.
   Widget.prototype.fetchBusiness = function() {
     var self = this;
-    fetch(API_BASE + '/businesses/' + this.businessId)
+    fetch(API_BASE + '/businesses/' + this.businessId + '/bootstrap?from=' + formatDate(new Date()))
       .then(function(res) {
         if (!res.ok) throw new Error('Business not found');
         return res.json();
       })
       .then(function(data) {
-        self.state.business = data;
+        var days = {};
+        for (var i = 0; i < data.days.length; i++) days[data.days[i].date] = data.days[i].available;
+        self.state.business = data.business;
+        self.state.bootstrap = { serviceId: data.service_id, days: days, slots: data.slots };
         self.state.loading = false;
         self.render();
       })
@@ -118,12 +125,24 @@
     var self = this;
     if (!this.state.selectedDate || !this.state.selectedService) return;
 
+    var dateStr = formatDate(this.state.selectedDate);
+    var boot = this.state.bootstrap;
+    if (boot && boot.slots && boot.slots.date === dateStr && boot.serviceId === this.state.selectedService.id) {
+      // Prefetched by the bootstrap call; later visits to this day refetch
+      this.state.slots = boot.slots.slots;
+      boot.slots = null;
+      this.watchDate(dateStr);
+      this.render();
+      return;
+    }
+
     this.state.slotsLoading = true;
     this.render();
 
-    var dateStr = formatDate(this.state.selectedDate);
     var url = API_BASE + '/businesses/' + this.businessId + '/slots?date=' + dateStr + '&service_id=' + this.state.selectedService.id;
 
+    this.watchDate(dateStr);
+
     fetch(url)
       .then(function(res) { return res.json(); })
       .then(function(data) {
@@ -138,30 +157,104 @@
       });
   };
 
+  // Live updates for the day on screen: slots booked elsewhere are greyed
+  // out at once, and a freed slot or changed hours reloads the list.
+  Widget.prototype.watchDate = function(dateStr) {
+    var self = this;
+    if (typeof EventSource === 'undefined') return;
+    if (this.events && this.eventsDate === dateStr && this.events.readyState !== 2) return;
+    if (this.events) this.events.close();
+
+    this.eventsDate = dateStr;
+    this.events = new EventSource(API_BASE + '/businesses/' + this.businessId + '/events?date=' + dateStr);
+    var reload = function() {
+      if (self.state.step === 2 && formatDate(self.state.selectedDate) === self.eventsDate) self.fetchSlots();
+    };
+    this.events.addEventListener('slot-taken', function(e) {
+      var taken = JSON.parse(e.data);
+      if (!self.state.selectedDate || formatDate(self.state.selectedDate) !== taken.date) return;
+      // Another staff member may still be free at that time
+      if (taken.staff_id) return reload();
+      for (var i = 0; i < self.state.slots.length; i++) {
+        var slot = self.state.slots[i];
+        if (slot.start_time < taken.end_time && taken.start_time < slot.end_time) slot.available = false;
+      }
+      if (self.state.step === 2) self.render();
+    });
+    this.events.addEventListener('slot-freed', reload);
+    this.events.addEventListener('schedule-changed', reload);
+  };
+
+  // Reserve the picked time while the customer types their details, so it
+  // cannot be booked underneath them. If the hold request fails for any
+  // reason but "taken", carry on without one.
+  Widget.prototype.holdSlot = function(slot) {
+    var self = this;
+    this.releaseHold();
+    postJSON(API_BASE + '/holds', JSON.stringify({
+      business_id: this.businessId,
+      service_id: this.state.selectedService.id,
+      date: formatDate(this.state.selectedDate),
+      start_time: slot.start_time
+    }), newKey())
+      .then(function(res) {
+        if (res.status === 409) {
+          for (var i = 0; i < self.state.slots.length; i++) {
+            if (self.state.slots[i].start_time === slot.start_time) self.state.slots[i].available = false;
+          }
+          alert('Sorry, that time was just taken. Please pick another.');
+          self.render();
+          return;
+        }
+        return (res.ok ? res.json() : Promise.resolve(null)).then(function(hold) {
+          self.state.hold = hold;
+          self.state.selectedSlot = slot;
+          self.state.step = 3;
+          self.render();
+        });
+      })
+      .catch(function() {
+        self.state.selectedSlot = slot;
+        self.state.step = 3;
+        self.render();
+      });
+  };
+
+  Widget.prototype.releaseHold = function() {
+    if (!this.state.hold) return;
+    fetch(API_BASE + '/holds/' + this.state.hold.id, { method: 'DELETE', keepalive: true }).catch(function() {});
+    this.state.hold = null;
+  };
+
   Widget.prototype.createBooking = function() {
     var self = this;
     this.state.submitting = true;
     this.render();
 
-    fetch(API_BASE + '/bookings', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({
-        business_id: this.businessId,
-        service_id: this.state.selectedService.id,
-        date: formatDate(this.state.selectedDate),
-        start_time: this.state.selectedSlot.start_time,
-        customer_name: this.state.customerInfo.name,
-        customer_email: this.state.customerInfo.email,
-        customer_phone: this.state.customerInfo.phone
-      })
-    })
+    var body = JSON.stringify({
+      business_id: this.businessId,
+      service_id: this.state.selectedService.id,
+      date: formatDate(this.state.selectedDate),
+      start_time: this.state.selectedSlot.start_time,
+      customer_name: this.state.customerInfo.name,
+      customer_email: this.state.customerInfo.email,
+      customer_phone: this.state.customerInfo.phone,
+      hold_id: this.state.hold ? this.state.hold.id : null
+    });
+    // Same details, same key: resubmitting after a timeout replays the booking
+    if (this.bookingBody !== body) {
+      this.bookingBody = body;
+      this.bookingKey = newKey();
+    }
+
+    postJSON(API_BASE + '/bookings', body, this.bookingKey)
       .then(function(res) {
         if (!res.ok) return res.json().then(function(e) { throw new Error(e.detail || 'Booking failed'); });
         return res.json();
       })
       .then(function(data) {
         self.state.booking = data;
+        self.state.hold = null;
         self.state.step = 4;
         self.state.submitting = false;
         self.render();
@@ -346,6 +439,10 @@
     h += '<div class="aptly-summary-row"><span class="aptly-summary-label">Service</span><span class="aptly-summary-value">' + esc(s.selectedService.name) + '</span></div>';
     h += '<div class="aptly-summary-row"><span class="aptly-summary-label">Date</span><span class="aptly-summary-value">' + formatDisplayDate(s.selectedDate) + '</span></div>';
     h += '<div class="aptly-summary-row"><span class="aptly-summary-label">Time</span><span class="aptly-summary-value">' + s.selectedSlot.start_time + ' - ' + s.selectedSlot.end_time + '</span></div>';
+    if (s.hold) {
+      var until = new Date(s.hold.expires_at);
+      h += '<div class="aptly-summary-row"><span class="aptly-summary-label">Held for you until</span><span class="aptly-summary-value">' + String(until.getHours()).padStart(2, '0') + ':' + String(until.getMinutes()).padStart(2, '0') + '</span></div>';
+    }
     h += '</div>';
 
     h += '<form id="aptly-form-' + this.containerId + '">';
@@ -381,6 +478,10 @@
     maxDate.setDate(maxDate.getDate() + 60);
     if (date > maxDate) return true;
 
+    var boot = this.state.bootstrap;
+    var service = this.state.selectedService;
+    if (boot && service && boot.serviceId === service.id && boot.days[formatDate(date)] === false) return true;
+
     var biz = this.state.business;
     if (biz && biz.blocked_dates) {
       var dateStr = formatDate(date);
@@ -413,7 +514,10 @@
     // Back
     var backBtns = container.querySelectorAll('[data-action="back"]');
     for (var i = 0; i < backBtns.length; i++) {
-      backBtns[i].onclick = function() { if (self.state.step > 0) { self.state.step--; self.render(); } };
+      backBtns[i].onclick = function() {
+        if (self.state.step === 3) self.releaseHold();
+        if (self.state.step > 0) { self.state.step--; self.render(); }
+      };
     }
 
     // Service
@@ -453,9 +557,7 @@
     var slots = container.querySelectorAll('[data-action="select-slot"]');
     for (var i = 0; i < slots.length; i++) {
       slots[i].onclick = function() {
-        self.state.selectedSlot = JSON.parse(this.getAttribute('data-slot'));
-        self.state.step = 3;
-        self.render();
+        self.holdSlot(JSON.parse(this.getAttribute('data-slot')));
       };
     }
 
@@ -488,6 +590,29 @@
   };
 
   // Utilities
+  function newKey() {
+    if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+    return Date.now().toString(36) + Math.random().toString(36).slice(2) + Math.random().toString(36).slice(2);
+  }
+
+  // POST with an Idempotency-Key, retrying when no response arrived. The
+  // server may have acted on an attempt whose answer was lost; the key makes
+  // it replay that result instead of acting twice.
+  function postJSON(url, body, key) {
+    var attempt = 0;
+    var send = function() {
+      return fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'Idempotency-Key': key },
+        body: body
+      }).catch(function(err) {
+        if (++attempt > 2) throw err;
+        return new Promise(function(resolve) { setTimeout(resolve, 1000 * attempt); }).then(send);
+      });
+    };
+    return send();
+  }
+
   function formatDate(d) {
     return d.getFullYear() + '-' + String(d.getMonth() + 1).padStart(2, '0') + '-' + String(d.getDate()).padStart(2, '0');
   }
@@ -1,5 +1,5 @@
 import { useState } from "react";
-import { useEffect, useCallback } from "react";
+import { useEffect, useCallback, useRef } from "react";
 import axios from "axios";
 import { Calendar } from "@/components/ui/calendar";
 import { Button } from "@/components/ui/button";
@@ -21,10 +21,18 @@ import {
   Sparkles
 } from "lucide-react";
 import { format, addDays, isBefore, startOfDay } from "date-fns";
+import { newIdempotencyKey, postIdempotent } from "@/lib/idempotency";
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+// Live events reload the days they name through the cached /slots endpoint,
+// after a random delay so open widgets do not all refetch at the same moment
+const REFRESH_DELAY_MS = 1000;
+const REFRESH_JITTER_MS = 2000;
+// Beyond this many changed days, one calendar request is cheaper
+const MAX_DAY_REFRESHES = 7;
+
 const STEPS = {
   SERVICE: 0,
   DATE: 1,
@@ -36,11 +44,19 @@ const STEPS = {
 export const BookingWidget = ({ businessId, primaryColor }) => {
   const [step, setStep] = useState(STEPS.SERVICE);
   const [business, setBusiness] = useState(null);
+  const [bootstrap, setBootstrap] = useState(null);
   const [loading, setLoading] = useState(true);
   const [selectedService, setSelectedService] = useState(null);
   const [selectedDate, setSelectedDate] = useState(null);
   const [selectedSlot, setSelectedSlot] = useState(null);
+  const [hold, setHold] = useState(null);
+  // Same details, same key: resubmitting after a timeout replays the booking
+  const bookingAttempt = useRef(null);
   const [slots, setSlots] = useState([]);
+  const [calendarDays, setCalendarDays] = useState({});
+  // Days to reload on the next refresh; null means the whole calendar
+  const staleDays = useRef(new Set());
+  const refreshTimer = useRef(null);
   const [slotsLoading, setSlotsLoading] = useState(false);
   const [submitting, setSubmitting] = useState(false);
   const [bookingResult, setBookingResult] = useState(null);
@@ -65,8 +81,12 @@ export const BookingWidget = ({ businessId, primaryColor }) => {
   const fetchBusiness = useCallback(async () => {
     try {
       setLoading(true);
-      const response = await axios.get(`${API}/businesses/${businessId}`);
-      setBusiness(response.data);
+      // Profile plus the first service's next two weeks in one round trip
+      const response = await axios.get(
+        `${API}/businesses/${businessId}/bootstrap?from=${format(new Date(), "yyyy-MM-dd")}`
+      );
+      setBusiness(response.data.business);
+      setBootstrap(response.data);
     } catch (error) {
       console.error("Failed to fetch business:", error);
       toast.error("Failed to load booking information");
@@ -76,12 +96,121 @@ export const BookingWidget = ({ businessId, primaryColor }) => {
   }, [businessId]);
 
 
+  // One request for the whole booking horizon: greys out full days and
+  // pre-loads their slots so picking a date needs no extra round trip.
+  const fetchCalendar = useCallback(async () => {
+    if (!selectedService) return;
+
+    try {
+      const today = new Date();
+      const response = await axios.get(
+        `${API}/businesses/${businessId}/availability?from=${format(today, "yyyy-MM-dd")}&to=${format(addDays(today, 60), "yyyy-MM-dd")}&service_id=${selectedService.id}&include_slots=true`
+      );
+      setCalendarDays(Object.fromEntries(response.data.map(day => [day.date, day])));
+    } catch (error) {
+      console.error("Failed to fetch availability:", error);
+      setCalendarDays({});
+    }
+  }, [selectedService, businessId]);
+
+  useEffect(() => {
+  if (selectedService) {
+    fetchCalendar();
+  }
+  }, [selectedService, fetchCalendar]);
+
+
+  const refreshDays = useCallback(async (dates) => {
+    if (!selectedService) return;
+
+    const results = await Promise.all(dates.map(async (date) => {
+      try {
+        const response = await axios.get(
+          `${API}/businesses/${businessId}/slots?date=${date}&service_id=${selectedService.id}`
+        );
+        return [date, response.data];
+      } catch (error) {
+        console.error("Failed to refresh slots:", error);
+        return null;
+      }
+    }));
+    setCalendarDays((days) => {
+      const next = { ...days };
+      for (const [date, daySlots] of results.filter(Boolean)) {
+        next[date] = { ...days[date], date, slots: daySlots, available: daySlots.some(s => s.available) };
+      }
+      return next;
+    });
+  }, [selectedService, businessId]);
+
+  const scheduleRefresh = useCallback((dates) => {
+    if (dates === null) {
+      staleDays.current = null;
+    } else if (staleDays.current) {
+      const first = format(new Date(), "yyyy-MM-dd");
+      const last = format(addDays(new Date(), 60), "yyyy-MM-dd");
+      dates.filter(d => d >= first && d <= last).forEach(d => staleDays.current.add(d));
+      if (!staleDays.current.size) return;
+    }
+    if (refreshTimer.current) return;
+    refreshTimer.current = setTimeout(() => {
+      const stale = staleDays.current;
+      refreshTimer.current = null;
+      staleDays.current = new Set();
+      if (stale === null || stale.size > MAX_DAY_REFRESHES) {
+        fetchCalendar();
+      } else {
+        refreshDays([...stale]);
+      }
+    }, REFRESH_DELAY_MS + Math.random() * REFRESH_JITTER_MS);
+  }, [fetchCalendar, refreshDays]);
+
+
+  // Live updates while a service is picked: slots booked elsewhere are
+  // greyed out at once, and freed slots or changed hours reload those days.
+  // A booking for one staff member may leave the slot open with another, so
+  // its day reloads too.
+  useEffect(() => {
+  if (!selectedService) return;
+
+  const source = new EventSource(`${API}/businesses/${businessId}/events`);
+  source.addEventListener("slot-taken", (event) => {
+    const taken = JSON.parse(event.data);
+    if (taken.staff_id) {
+      scheduleRefresh([taken.date]);
+      return;
+    }
+    const mark = (slot) =>
+      slot.start_time < taken.end_time && taken.start_time < slot.end_time ? { ...slot, available: false } : slot;
+    setCalendarDays((days) => {
+      const day = days[taken.date];
+      if (!day?.slots) return days;
+      const slots = day.slots.map(mark);
+      return { ...days, [taken.date]: { ...day, slots, available: slots.some(s => s.available) } };
+    });
+  });
+  source.addEventListener("slot-freed", (event) => scheduleRefresh([JSON.parse(event.data).date]));
+  source.addEventListener("schedule-changed", (event) => scheduleRefresh(JSON.parse(event.data).dates));
+  return () => {
+    source.close();
+    clearTimeout(refreshTimer.current);
+    refreshTimer.current = null;
+    staleDays.current = new Set();
+  };
+  }, [selectedService, businessId, scheduleRefresh]);
+
+
   const fetchSlots = useCallback(async () => {
     if (!selectedDate || !selectedService) return;
 
+    const dateStr = format(selectedDate, "yyyy-MM-dd");
+    if (calendarDays[dateStr]?.slots) {
+      setSlots(calendarDays[dateStr].slots);
+      return;
+    }
+
     try {
       setSlotsLoading(true);
-      const dateStr = format(selectedDate, "yyyy-MM-dd");
       const response = await axios.get(
         `${API}/businesses/${businessId}/slots?date=${dateStr}&service_id=${selectedService.id}`
       );
@@ -92,10 +221,22 @@ export const BookingWidget = ({ businessId, primaryColor }) => {
     } finally {
       setSlotsLoading(false);
     }
-  }, [selectedDate, selectedService, businessId]);
+  }, [selectedDate, selectedService, businessId, calendarDays]);
+
 
+  // Days from the bootstrap response render at once; fetchCalendar then
+  // fills in the whole horizon with slots.
+  const bootstrapDays = (service) => {
+    if (!bootstrap || bootstrap.service_id !== service.id) return {};
+    const days = Object.fromEntries(bootstrap.days.map(day => [day.date, day]));
+    if (bootstrap.slots) {
+      days[bootstrap.slots.date] = { ...days[bootstrap.slots.date], slots: bootstrap.slots.slots };
+    }
+    return days;
+  };
 
   const handleServiceSelect = (service) => {
+    setCalendarDays(bootstrapDays(service));
     setSelectedService(service);
     setStep(STEPS.DATE);
   };
@@ -106,13 +247,39 @@ export const BookingWidget = ({ businessId, primaryColor }) => {
     setStep(STEPS.TIME);
   };
 
-  const handleSlotSelect = (slot) => {
+  const releaseHold = () => {
+    if (!hold) return;
+    axios.delete(`${API}/holds/${hold.id}`).catch(() => {});
+    setHold(null);
+  };
+
+  // Hold the time while the customer types their details, so it cannot be
+  // booked underneath them. Only "taken" stops them; other failures just
+  // mean booking without a hold.
+  const handleSlotSelect = async (slot) => {
     if (!slot.available) return;
+    releaseHold();
+    try {
+      const response = await postIdempotent(`${API}/holds`, {
+        business_id: businessId,
+        service_id: selectedService.id,
+        date: format(selectedDate, "yyyy-MM-dd"),
+        start_time: slot.start_time
+      }, newIdempotencyKey());
+      setHold(response.data);
+    } catch (error) {
+      if (error.response?.status === 409) {
+        setSlots(current => current.map(s => s.start_time === slot.start_time ? { ...s, available: false } : s));
+        toast.error("That time was just taken. Please pick another.");
+        return;
+      }
+    }
     setSelectedSlot(slot);
     setStep(STEPS.DETAILS);
   };
 
   const handleBack = () => {
+    if (step === STEPS.DETAILS) releaseHold();
     if (step > STEPS.SERVICE) {
       setStep(step - 1);
     }
@@ -128,16 +295,23 @@ export const BookingWidget = ({ businessId, primaryColor }) => {
 
     try {
       setSubmitting(true);
-      const response = await axios.post(`${API}/bookings`, {
+      const payload = {
         business_id: businessId,
         service_id: selectedService.id,
         date: format(selectedDate, "yyyy-MM-dd"),
         start_time: selectedSlot.start_time,
         customer_name: customerInfo.name,
         customer_email: customerInfo.email,
-        customer_phone: customerInfo.phone
-      });
+        customer_phone: customerInfo.phone,
+        hold_id: hold?.id
+      };
+      const body = JSON.stringify(payload);
+      if (bookingAttempt.current?.body !== body) {
+        bookingAttempt.current = { body, key: newIdempotencyKey() };
+      }
+      const response = await postIdempotent(`${API}/bookings`, payload, bookingAttempt.current.key);
       
+      setHold(null);
       setBookingResult(response.data);
       setStep(STEPS.CONFIRMATION);
       toast.success("Booking confirmed!");
@@ -162,6 +336,7 @@ export const BookingWidget = ({ businessId, primaryColor }) => {
     if (isBefore(date, startOfDay(new Date()))) return true;
     if (isBefore(addDays(new Date(), 60), date)) return true;
     if (business?.blocked_dates?.includes(format(date, "yyyy-MM-dd"))) return true;
+    if (calendarDays[format(date, "yyyy-MM-dd")]?.available === false) return true;
     
     const dayOfWeek = date.getDay();
     const dayIndex = dayOfWeek === 0 ? 6 : dayOfWeek - 1;
@@ -391,6 +566,12 @@ export const BookingWidget = ({ businessId, primaryColor }) => {
                   <span className="text-muted-foreground">Time</span>
                   <span className="font-medium">{selectedSlot?.start_time} - {selectedSlot?.end_time}</span>
                 </div>
+                {hold && (
+                  <div className="flex justify-between text-sm">
+                    <span className="text-muted-foreground">Held for you until</span>
+                    <span className="font-medium">{format(new Date(hold.expires_at), "HH:mm")}</span>
+                  </div>
+                )}
               </div>
 
               <div className="space-y-3">
@@ -0,0 +1,52 @@
+// Server-Sent Events over fetch: EventSource cannot send an Authorization
+// header, and the admin token should not end up in URLs or access logs.
+// Reconnects after the server's `retry` delay until the returned function
+// is called; `onReconnect` lets callers refetch whatever they missed.
+export function subscribeEvents(url, { headers, onEvent, onReconnect }) {
+  const controller = new AbortController();
+  let retry = 3000;
+  let connected = false;
+
+  const dispatch = (frame) => {
+    let event = "message";
+    const data = [];
+    for (const line of frame.split("\n")) {
+      if (line.startsWith("event: ")) event = line.slice(7);
+      else if (line.startsWith("data: ")) data.push(line.slice(6));
+      else if (line.startsWith("retry: ")) retry = Number(line.slice(7)) || retry;
+    }
+    if (data.length) onEvent(event, JSON.parse(data.join("\n")));
+  };
+
+  const run = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        const response = await fetch(url, { headers, signal: controller.signal });
+        // Signed out or live updates switched off: retrying will not help
+        if (response.status === 401 || response.status === 404) return;
+        if (response.ok) {
+          if (connected && onReconnect) onReconnect();
+          connected = true;
+          const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+          let buffer = "";
+          for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += value;
+            let end;
+            while ((end = buffer.indexOf("\n\n")) >= 0) {
+              dispatch(buffer.slice(0, end));
+              buffer = buffer.slice(end + 2);
+            }
+          }
+        }
+      } catch (error) {
+        if (controller.signal.aborted) return;
+      }
+      await new Promise(resolve => setTimeout(resolve, retry));
+    }
+  };
+
+  run();
+  return () => controller.abort();
+}
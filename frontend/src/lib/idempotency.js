@@ -0,0 +1,20 @@
+import axios from "axios";
+
+export function newIdempotencyKey() {
+  if (window.crypto?.randomUUID) return window.crypto.randomUUID();
+  return Date.now().toString(36) + Math.random().toString(36).slice(2) + Math.random().toString(36).slice(2);
+}
+
+// POST with an Idempotency-Key, retrying when the request never got an
+// answer. The server may have acted on an attempt whose response was lost;
+// the key makes it replay that result instead of acting twice.
+export async function postIdempotent(url, data, key, retries = 2) {
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await axios.post(url, data, { headers: { "Idempotency-Key": key } });
+    } catch (error) {
+      if (error.response || attempt >= retries) throw error;
+      await new Promise(resolve => setTimeout(resolve, 1000 * (attempt + 1)));
+    }
+  }
+}
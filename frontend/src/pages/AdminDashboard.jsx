@@ -1,5 +1,5 @@
 import { useState} from "react";
-import { useEffect, useCallback } from "react";
+import { useEffect, useCallback, useRef } from "react";
 import { Routes, Route, Link, useNavigate, useLocation } from "react-router-dom";
 import axios from "axios";
 import { Button } from "@/components/ui/button";
@@ -7,6 +7,8 @@ import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import { Sheet, SheetContent, SheetTrigger } from "@/components/ui/sheet";
 import { toast } from "sonner";
+import { format, subDays } from "date-fns";
+import { subscribeEvents } from "@/lib/events";
 import {
   Calendar,
   Clock,
@@ -19,9 +21,11 @@ import {
   Trash2,
   Code,
   Menu,
-  ChevronRight
+  ChevronRight,
+  Users
 } from "lucide-react";
 import ServicesPage from "./admin/ServicesPage";
+import StaffPage from "./admin/StaffPage";
 import AvailabilityPage from "./admin/AvailabilityPage";
 import BlockedDatesPage from "./admin/BlockedDatesPage";
 import EmbedPage from "./admin/EmbedPage";
@@ -29,6 +33,12 @@ import EmbedPage from "./admin/EmbedPage";
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 
+const BOOKING_LIST_FIELDS = "service_name,staff_name,customer_name,customer_phone,status";
+// Live events refresh the counters at most this often, however busy the business
+const COUNTS_REFRESH_MS = 5000;
+
+const bookingKey = (b) => `${b.date} ${b.start_time} ${b.id}`;
+
 const AdminDashboard = () => {
   const navigate = useNavigate();
   const location = useLocation();
@@ -62,6 +72,10 @@ const AdminDashboard = () => {
   }, [token, navigate, fetchBusiness]);
 
   const handleLogout = () => {
+    // Revoke the token server-side; the local session is cleared regardless
+    axios.post(`${API}/admin/logout`, {}, {
+      headers: { Authorization: `Bearer ${token}` }
+    }).catch(() => {});
     localStorage.removeItem("booking_token");
     localStorage.removeItem("booking_business_id");
     localStorage.removeItem("booking_business_name");
@@ -72,6 +86,7 @@ const AdminDashboard = () => {
   const navItems = [
     { path: "/admin/dashboard", label: "Bookings", icon: List },
     { path: "/admin/services", label: "Services", icon: Clock },
+    { path: "/admin/staff", label: "Staff", icon: Users },
     { path: "/admin/availability", label: "Availability", icon: Calendar },
     { path: "/admin/blocked-dates", label: "Blocked", icon: CalendarOff },
     { path: "/admin/embed", label: "Embed", icon: Code }
@@ -188,6 +203,7 @@ const AdminDashboard = () => {
             <Routes>
               <Route path="/dashboard" element={<BookingsView token={token} />} />
               <Route path="/services" element={<ServicesPage token={token} onUpdate={fetchBusiness} />} />
+              <Route path="/staff" element={<StaffPage token={token} onUpdate={fetchBusiness} />} />
               <Route path="/availability" element={<AvailabilityPage token={token} business={business} onUpdate={fetchBusiness} />} />
               <Route path="/blocked-dates" element={<BlockedDatesPage token={token} business={business} onUpdate={fetchBusiness} />} />
               <Route path="/embed" element={<EmbedPage businessId={businessId} />} />
@@ -203,25 +219,96 @@ const AdminDashboard = () => {
 // Bookings View Component
 const BookingsView = ({ token }) => {
   const [bookings, setBookings] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [counts, setCounts] = useState({ upcoming: 0, completed: 0, cancelled: 0, total: 0 });
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const hasMore = useRef(false);
+  const countsTimer = useRef(null);
 
-  useEffect(() => {
-  const fetchBookings = async () => {
+  const today = format(new Date(), "yyyy-MM-dd");
+  const yesterday = format(subDays(new Date(), 1), "yyyy-MM-dd");
+
+  const fetchBookings = useCallback(async (cursor = null) => {
+    const headers = { Authorization: `Bearer ${token}` };
+    const params = { status: "confirmed", from: today, order: "asc", fields: BOOKING_LIST_FIELDS };
+    if (cursor) params.cursor = cursor;
     try {
-      const response = await axios.get(`${API}/admin/bookings`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setBookings(response.data);
+      const response = await axios.get(`${API}/admin/bookings`, { headers, params });
+      setBookings(prev => (cursor ? [...prev, ...response.data] : response.data));
+      setNextCursor(response.headers["x-next-cursor"] || null);
+      hasMore.current = Boolean(response.headers["x-next-cursor"]);
     } catch (error) {
       console.error("Failed to fetch bookings:", error);
       toast.error("Failed to load bookings");
-    } finally {
-      setLoading(false);
     }
-  };
+  }, [token, today]);
 
-  fetchBookings();
-}, [token]);
+  const fetchCounts = useCallback(async () => {
+    const headers = { Authorization: `Bearer ${token}` };
+    const count = (params) =>
+      axios.get(`${API}/admin/bookings/count`, { headers, params }).then(r => r.data.count);
+    try {
+      const [upcoming, completed, cancelled, total] = await Promise.all([
+        count({ status: "confirmed", from: today }),
+        count({ status: "confirmed", to: yesterday }),
+        count({ status: "cancelled" }),
+        count({})
+      ]);
+      setCounts({ upcoming, completed, cancelled, total });
+    } catch (error) {
+      console.error("Failed to fetch booking counts:", error);
+    }
+  }, [token, today, yesterday]);
+
+  useEffect(() => {
+    Promise.all([fetchBookings(), fetchCounts()]).finally(() => setLoading(false));
+  }, [fetchBookings, fetchCounts]);
+
+  // One trailing refetch for a burst of events instead of one per event
+  const scheduleCounts = useCallback(() => {
+    if (countsTimer.current) return;
+    countsTimer.current = setTimeout(() => {
+      countsTimer.current = null;
+      fetchCounts();
+    }, COUNTS_REFRESH_MS);
+  }, [fetchCounts]);
+
+  useEffect(() => () => clearTimeout(countsTimer.current), []);
+
+  // Live updates: new and cancelled bookings show up without a refresh
+  useEffect(() => {
+    return subscribeEvents(`${API}/admin/events`, {
+      headers: { Authorization: `Bearer ${token}` },
+      onEvent: (event, data) => {
+        if (event === "booking-created") {
+          toast.success(`New booking: ${data.customer_name}, ${data.date} ${data.start_time}`);
+          if (data.date >= today) {
+            setBookings(prev => {
+              if (prev.some(b => b.id === data.id)) return prev;
+              // Past the loaded pages it will arrive with "Load more" instead
+              if (hasMore.current && prev.length && bookingKey(data) > bookingKey(prev[prev.length - 1])) return prev;
+              return [...prev, data].sort((a, b) => bookingKey(a).localeCompare(bookingKey(b)));
+            });
+          }
+          scheduleCounts();
+        } else if (event === "booking-cancelled") {
+          setBookings(prev => prev.filter(b => b.id !== data.id));
+          scheduleCounts();
+        }
+      },
+      onReconnect: () => {
+        fetchBookings();
+        fetchCounts();
+      }
+    });
+  }, [token, today, fetchBookings, fetchCounts, scheduleCounts]);
+
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    await fetchBookings(nextCursor);
+    setLoadingMore(false);
+  };
 
   const handleCancel = async (bookingId) => {
     if (!window.confirm("Cancel this booking?")) return;
@@ -232,14 +319,12 @@ const BookingsView = ({ token }) => {
       });
       toast.success("Booking cancelled");
       fetchBookings();
+      fetchCounts();
     } catch (error) {
       toast.error("Failed to cancel");
     }
   };
 
-  const upcomingBookings = bookings.filter(b => b.status === "confirmed" && new Date(b.date) >= new Date().setHours(0,0,0,0));
-  const pastBookings = bookings.filter(b => b.status === "confirmed" && new Date(b.date) < new Date().setHours(0,0,0,0));
-
   return (
     <div className="space-y-4" data-testid="bookings-view">
       <div>
@@ -250,10 +335,10 @@ const BookingsView = ({ token }) => {
       {/* Stats */}
       <div className="grid grid-cols-2 sm:grid-cols-4 gap-3">
         {[
-          { label: "Upcoming", value: upcomingBookings.length, color: "text-emerald-600" },
-          { label: "Completed", value: pastBookings.length, color: "text-blue-600" },
-          { label: "Cancelled", value: bookings.filter(b => b.status === "cancelled").length, color: "text-zinc-400" },
-          { label: "Total", value: bookings.length, color: "text-foreground" }
+          { label: "Upcoming", value: counts.upcoming, color: "text-emerald-600" },
+          { label: "Completed", value: counts.completed, color: "text-blue-600" },
+          { label: "Cancelled", value: counts.cancelled, color: "text-zinc-400" },
+          { label: "Total", value: counts.total, color: "text-foreground" }
         ].map((stat, i) => (
           <Card key={i} className="border-0 shadow-sm">
             <CardContent className="p-3 sm:p-4">
@@ -276,14 +361,14 @@ const BookingsView = ({ token }) => {
                 <div key={i} className="h-20 bg-zinc-100 rounded-xl animate-pulse" />
               ))}
             </div>
-          ) : upcomingBookings.length === 0 ? (
+          ) : bookings.length === 0 ? (
             <div className="text-center py-12 text-muted-foreground">
               <Calendar className="w-10 h-10 mx-auto mb-3 opacity-30" />
               <p className="text-sm font-medium">No upcoming bookings</p>
             </div>
           ) : (
             <div className="space-y-3">
-              {upcomingBookings.map((booking) => (
+              {bookings.map((booking) => (
                 <div
                   key={booking.id}
                   className="p-3 sm:p-4 bg-zinc-50 rounded-xl"
@@ -313,9 +398,26 @@ const BookingsView = ({ token }) => {
                       <Phone className="w-3 h-3" />
                       {booking.customer_phone}
                     </span>
+                    {booking.staff_name && (
+                      <span className="flex items-center gap-1">
+                        <Users className="w-3 h-3" />
+                        {booking.staff_name}
+                      </span>
+                    )}
                   </div>
                 </div>
               ))}
+              {nextCursor && (
+                <Button
+                  variant="outline"
+                  className="w-full"
+                  onClick={handleLoadMore}
+                  disabled={loadingMore}
+                  data-testid="load-more-bookings"
+                >
+                  {loadingMore ? "Loading..." : "Load more"}
+                </Button>
+              )}
             </div>
           )}
         </CardContent>
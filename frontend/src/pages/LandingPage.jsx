@@ -56,26 +56,28 @@ const LandingPage = () => {
       const token = response.data.token;
       setDemoBusinessId(businessId);
       
-      await Promise.all([
-        axios.post(`${API}/admin/services`, {
-          name: "Signature Haircut",
-          duration: 45,
-          description: "Precision cut with styling",
-          price: 65
-        }, { headers: { Authorization: `Bearer ${token}` } }),
-        axios.post(`${API}/admin/services`, {
-          name: "Color Treatment",
-          duration: 90,
-          description: "Full color or highlights",
-          price: 120
-        }, { headers: { Authorization: `Bearer ${token}` } }),
-        axios.post(`${API}/admin/services`, {
-          name: "Express Blowout",
-          duration: 30,
-          description: "Quick style refresh",
-          price: 40
-        }, { headers: { Authorization: `Bearer ${token}` } })
-      ]);
+      await axios.post(`${API}/admin/services/bulk`, {
+        services: [
+          {
+            name: "Signature Haircut",
+            duration: 45,
+            description: "Precision cut with styling",
+            price: 65
+          },
+          {
+            name: "Color Treatment",
+            duration: 90,
+            description: "Full color or highlights",
+            price: 120
+          },
+          {
+            name: "Express Blowout",
+            duration: 30,
+            description: "Quick style refresh",
+            price: 40
+          }
+        ]
+      }, { headers: { Authorization: `Bearer ${token}` } });
     } catch {
       try {
         const loginResponse = await axios.post(`${API}/admin/login`, {
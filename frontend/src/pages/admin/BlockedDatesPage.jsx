@@ -12,7 +12,7 @@ const API = `${BACKEND_URL}/api`;
 
 const BlockedDatesPage = ({ token, business, onUpdate }) => {
   const [blockedDates, setBlockedDates] = useState([]);
-  const [selectedDate, setSelectedDate] = useState(null);
+  const [selectedRange, setSelectedRange] = useState(undefined);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -23,26 +23,29 @@ const BlockedDatesPage = ({ token, business, onUpdate }) => {
   }, [business]);
 
   const handleBlockDate = async () => {
-    if (!selectedDate) {
+    if (!selectedRange?.from) {
       toast.error("Select a date");
       return;
     }
 
-    const dateStr = format(selectedDate, "yyyy-MM-dd");
-    
-    if (blockedDates.includes(dateStr)) {
-      toast.error("Already blocked");
-      return;
-    }
+    const range = {
+      from: format(selectedRange.from, "yyyy-MM-dd"),
+      to: format(selectedRange.to || selectedRange.from, "yyyy-MM-dd")
+    };
 
     try {
-      await axios.post(`${API}/admin/blocked-dates`, { date: dateStr }, {
+      const response = await axios.post(`${API}/admin/blocked-dates/bulk`, { block: [range] }, {
         headers: { Authorization: `Bearer ${token}` }
       });
 
-      setBlockedDates([...blockedDates, dateStr].sort());
-      setSelectedDate(null);
-      toast.success("Date blocked!");
+      const added = response.data.results.filter(r => r.status === "blocked").map(r => r.date);
+      if (added.length === 0) {
+        toast.error("Already blocked");
+        return;
+      }
+      setBlockedDates([...blockedDates, ...added].sort());
+      setSelectedRange(undefined);
+      toast.success(added.length === 1 ? "Date blocked!" : `${added.length} dates blocked!`);
       if (onUpdate) onUpdate();
     } catch (error) {
       toast.error("Failed to block date");
@@ -102,9 +105,9 @@ const BlockedDatesPage = ({ token, business, onUpdate }) => {
           <CardContent className="px-4 pb-4">
             <div className="flex justify-center mb-3">
               <Calendar
-                mode="single"
-                selected={selectedDate}
-                onSelect={setSelectedDate}
+                mode="range"
+                selected={selectedRange}
+                onSelect={setSelectedRange}
                 disabled={isDateDisabled}
                 modifiers={{ blocked: isDateBlocked }}
                 modifiersStyles={{
@@ -139,13 +142,13 @@ const BlockedDatesPage = ({ token, business, onUpdate }) => {
             </div>
             <Button
               onClick={handleBlockDate}
-              disabled={!selectedDate}
+              disabled={!selectedRange?.from}
               className="w-full"
               size="sm"
               data-testid="block-date-button"
             >
               <Plus className="w-4 h-4 mr-2" />
-              Block Date
+              Block {selectedRange?.to && selectedRange.to > selectedRange.from ? "Dates" : "Date"}
             </Button>
           </CardContent>
         </Card>
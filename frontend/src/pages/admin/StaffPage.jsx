@@ -0,0 +1,207 @@
+import { useState, useEffect, useCallback } from "react";
+import axios from "axios";
+import { Button } from "@/components/ui/button";
+import { Input } from "@/components/ui/input";
+import { Label } from "@/components/ui/label";
+import { Checkbox } from "@/components/ui/checkbox";
+import { Card, CardContent } from "@/components/ui/card";
+import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle, DialogTrigger, DialogFooter } from "@/components/ui/dialog";
+import { toast } from "sonner";
+import { Plus, Users, Trash2, Loader2 } from "lucide-react";
+
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+const API = `${BACKEND_URL}/api`;
+
+// A member with no services ticked performs every service.
+const StaffPage = ({ token, onUpdate }) => {
+  const [staff, setStaff] = useState([]);
+  const [services, setServices] = useState([]);
+  const [loading, setLoading] = useState(true);
+  const [dialogOpen, setDialogOpen] = useState(false);
+  const [submitting, setSubmitting] = useState(false);
+  const [newMember, setNewMember] = useState({ name: "", service_ids: [] });
+
+  const fetchStaff = useCallback(async () => {
+    try {
+      const response = await axios.get(`${API}/admin/business`, {
+        headers: { Authorization: `Bearer ${token}` }
+      });
+      setStaff(response.data.staff || []);
+      setServices(response.data.services || []);
+    } catch (error) {
+      toast.error("Failed to load staff");
+    } finally {
+      setLoading(false);
+    }
+  }, [token]);
+
+  useEffect(() => {
+    fetchStaff();
+  }, [fetchStaff]);
+
+  const toggleService = (serviceId, checked) => {
+    setNewMember((member) => ({
+      ...member,
+      service_ids: checked
+        ? [...member.service_ids, serviceId]
+        : member.service_ids.filter(id => id !== serviceId)
+    }));
+  };
+
+  const handleAddMember = async (e) => {
+    e.preventDefault();
+    if (!newMember.name) {
+      toast.error("Enter a name");
+      return;
+    }
+
+    try {
+      setSubmitting(true);
+      await axios.post(`${API}/admin/staff`, {
+        name: newMember.name,
+        service_ids: newMember.service_ids.length ? newMember.service_ids : null
+      }, {
+        headers: { Authorization: `Bearer ${token}` }
+      });
+
+      toast.success("Staff member added!");
+      setDialogOpen(false);
+      setNewMember({ name: "", service_ids: [] });
+      fetchStaff();
+      if (onUpdate) onUpdate();
+    } catch (error) {
+      toast.error("Failed to add staff member");
+    } finally {
+      setSubmitting(false);
+    }
+  };
+
+  const handleDeleteMember = async (staffId) => {
+    if (!window.confirm("Remove this staff member?")) return;
+
+    try {
+      await axios.delete(`${API}/admin/staff/${staffId}`, {
+        headers: { Authorization: `Bearer ${token}` }
+      });
+      toast.success("Staff member removed");
+      fetchStaff();
+      if (onUpdate) onUpdate();
+    } catch (error) {
+      toast.error(error.response?.status === 409 ? error.response.data.detail : "Failed to remove");
+    }
+  };
+
+  const serviceNames = (member) => {
+    if (!member.service_ids) return "All services";
+    const names = services.filter(s => member.service_ids.includes(s.id)).map(s => s.name);
+    return names.length ? names.join(", ") : "No services";
+  };
+
+  return (
+    <div className="space-y-4" data-testid="staff-page">
+      <div className="flex items-start justify-between gap-3">
+        <div>
+          <h1 className="text-xl sm:text-2xl font-bold font-heading">Staff</h1>
+          <p className="text-muted-foreground text-sm">Who can be booked, and for what</p>
+        </div>
+        <Dialog open={dialogOpen} onOpenChange={setDialogOpen}>
+          <DialogTrigger asChild>
+            <Button size="sm" className="shrink-0" data-testid="add-staff-button">
+              <Plus className="w-4 h-4 sm:mr-2" />
+              <span className="hidden sm:inline">Add</span>
+            </Button>
+          </DialogTrigger>
+          <DialogContent className="max-w-[calc(100vw-2rem)] sm:max-w-md">
+            <DialogHeader>
+              <DialogTitle className="font-heading">Add Staff Member</DialogTitle>
+              <DialogDescription>Customers are booked with the first member free at their time</DialogDescription>
+            </DialogHeader>
+            <form onSubmit={handleAddMember} className="space-y-4 mt-2">
+              <div>
+                <Label htmlFor="staff-name" className="text-sm">Name</Label>
+                <Input
+                  id="staff-name"
+                  placeholder="e.g., Alex"
+                  value={newMember.name}
+                  onChange={(e) => setNewMember({ ...newMember, name: e.target.value })}
+                  className="h-10 mt-1"
+                  required
+                  data-testid="staff-name-input"
+                />
+              </div>
+              {services.length > 0 && (
+                <div>
+                  <Label className="text-sm">Services (none ticked = all)</Label>
+                  <div className="space-y-2 mt-2">
+                    {services.map((service) => (
+                      <label key={service.id} className="flex items-center gap-2 text-sm">
+                        <Checkbox
+                          checked={newMember.service_ids.includes(service.id)}
+                          onCheckedChange={(checked) => toggleService(service.id, checked === true)}
+                          data-testid={`staff-service-${service.id}`}
+                        />
+                        {service.name}
+                      </label>
+                    ))}
+                  </div>
+                </div>
+              )}
+              <DialogFooter className="gap-2">
+                <Button type="button" variant="outline" size="sm" onClick={() => setDialogOpen(false)}>
+                  Cancel
+                </Button>
+                <Button type="submit" size="sm" disabled={submitting} data-testid="submit-staff-button">
+                  {submitting ? <Loader2 className="w-4 h-4 animate-spin" /> : "Add"}
+                </Button>
+              </DialogFooter>
+            </form>
+          </DialogContent>
+        </Dialog>
+      </div>
+
+      <Card className="border-0 shadow-sm">
+        <CardContent className="p-4">
+          {loading ? (
+            <div className="space-y-3">
+              {[1, 2].map(i => (
+                <div key={i} className="h-16 bg-zinc-100 rounded-lg animate-pulse" />
+              ))}
+            </div>
+          ) : staff.length === 0 ? (
+            <div className="text-center py-12 text-muted-foreground">
+              <Users className="w-10 h-10 mx-auto mb-3 opacity-30" />
+              <p className="text-sm font-medium">No staff yet</p>
+              <p className="text-xs mt-1">Without staff, one booking at a time is taken</p>
+            </div>
+          ) : (
+            <div className="space-y-2">
+              {staff.map((member) => (
+                <div
+                  key={member.id}
+                  className="flex items-center justify-between p-3 bg-zinc-50 rounded-lg group"
+                  data-testid={`staff-${member.id}`}
+                >
+                  <div className="min-w-0 flex-1">
+                    <h4 className="font-medium text-sm truncate">{member.name}</h4>
+                    <p className="text-xs text-muted-foreground mt-1 truncate">{serviceNames(member)}</p>
+                  </div>
+                  <Button
+                    variant="ghost"
+                    size="icon"
+                    className="opacity-0 group-hover:opacity-100 h-8 w-8 text-destructive hover:text-destructive"
+                    onClick={() => handleDeleteMember(member.id)}
+                    data-testid={`delete-staff-${member.id}`}
+                  >
+                    <Trash2 className="w-4 h-4" />
+                  </Button>
+                </div>
+              ))}
+            </div>
+          )}
+        </CardContent>
+      </Card>
+    </div>
+  );
+};
+
+export default StaffPage;
@@ -0,0 +1,63 @@
+"""Shared fixtures: the app in process on an in-memory MongoDB (mongomock-motor)."""
+
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from benchmarks.common import app_client, next_weekday, use_in_memory_db  # noqa: E402
+
+use_in_memory_db()
+
+CUSTOMER = {"customer_name": "Test", "customer_email": "test@test.com", "customer_phone": "+1234567890"}
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def client():
+    # One app for the session (its lifespan shuts the password hasher down);
+    # every test registers its own business, so tests do not see each other
+    async with app_client() as client:
+        yield client
+
+
+@pytest.fixture
+async def business(client):
+    """A registered business with a 30 and a 60 minute service, open Mon-Fri 09:00-17:00."""
+    register = await client.post("/api/admin/register", json={
+        "business_name": "Test Business",
+        "email": f"test_{uuid.uuid4().hex[:12]}@test.com",
+        "password": "test123",
+    })
+    register.raise_for_status()
+    headers = {"Authorization": f"Bearer {register.json()['token']}"}
+    services = await client.post(
+        "/api/admin/services/bulk",
+        json={"services": [{"name": "Short", "duration": 30, "price": 20}, {"name": "Long", "duration": 60}]},
+        headers=headers,
+    )
+    services.raise_for_status()
+    short, long = (r["service"]["id"] for r in services.json()["results"])
+    return {
+        "id": register.json()["business_id"],
+        "headers": headers,
+        "short": short,
+        "long": long,
+        "date": next_weekday().isoformat(),
+    }
+
+
+def slot(business: dict, start_time: str, service: str = "short") -> dict:
+    return {
+        "business_id": business["id"],
+        "service_id": business[service],
+        "date": business["date"],
+        "start_time": start_time,
+    }
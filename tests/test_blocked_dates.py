@@ -0,0 +1,29 @@
+"""Blocking dates in bulk reports one outcome per date and closes its slots."""
+
+from datetime import date, timedelta
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_overlapping_ranges_block_once_and_evict_slots(client, business):
+    day = business["date"]
+    params = {"date": day, "service_id": business["short"]}
+    slots = await client.get(f"/api/businesses/{business['id']}/slots", params=params)
+    assert any(s["available"] for s in slots.json())
+
+    following = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+    response = await client.post(
+        "/api/admin/blocked-dates/bulk",
+        json={"block": [{"from": day, "to": following}, {"from": day, "to": day}]},
+        headers=business["headers"],
+    )
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"date": day, "status": "blocked"},
+        {"date": following, "status": "blocked"},
+    ]
+
+    slots = await client.get(f"/api/businesses/{business['id']}/slots", params=params)
+    assert not any(s["available"] for s in slots.json())
@@ -0,0 +1,35 @@
+"""Booking counts come from the daily rollups and include archived bookings."""
+
+import pytest
+
+import archive
+import database
+from tests.conftest import CUSTOMER, slot
+
+pytestmark = pytest.mark.anyio
+
+
+async def count(client, business, **params) -> int:
+    response = await client.get("/api/admin/bookings/count", params=params, headers=business["headers"])
+    assert response.status_code == 200
+    return response.json()["count"]
+
+
+async def test_counts_by_status_and_range(client, business):
+    ids = []
+    for start_time in ("09:00", "10:00", "11:00"):
+        response = await client.post("/api/bookings", json={**slot(business, start_time), **CUSTOMER})
+        ids.append(response.json()["id"])
+    await client.delete(f"/api/admin/bookings/{ids[0]}", headers=business["headers"])
+
+    day = business["date"]
+    assert await count(client, business) == 3
+    assert await count(client, business, status="confirmed") == 2
+    assert await count(client, business, status="cancelled") == 1
+    assert await count(client, business, status="confirmed", **{"from": day, "to": day}) == 2
+    assert await count(client, business, **{"to": "2000-01-01"}) == 0
+
+    # Moving the bookings to the archive changes nothing
+    await archive.run(database.get_db(), before="9999-12-31")
+    assert await database.get_db().bookings.count_documents({"business_id": business["id"]}) == 0
+    assert await count(client, business, status="confirmed") == 2
@@ -0,0 +1,93 @@
+"""Concurrent bookings can never take the same minutes twice."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import booking_claims
+import database
+from tests.conftest import CUSTOMER, slot
+
+pytestmark = pytest.mark.anyio
+
+CONCURRENCY = 25
+
+
+async def stored_bookings(business: dict) -> int:
+    return await database.get_db().bookings.count_documents({"business_id": business["id"], "status": "confirmed"})
+
+
+async def test_concurrent_bookings_for_one_slot(client, business):
+    payload = {**slot(business, "10:00"), **CUSTOMER}
+    responses = await asyncio.gather(*(client.post("/api/bookings", json=payload) for _ in range(CONCURRENCY)))
+
+    statuses = sorted(r.status_code for r in responses)
+    assert statuses == [200] + [409] * (CONCURRENCY - 1)
+    assert await stored_bookings(business) == 1
+
+
+async def test_concurrent_overlapping_starts(client, business):
+    # 10:00-11:00 and 10:30-11:00 share the 10:30 half hour
+    payloads = [{**slot(business, "10:00", "long"), **CUSTOMER}, {**slot(business, "10:30"), **CUSTOMER}]
+    responses = await asyncio.gather(
+        *(client.post("/api/bookings", json=payloads[i % 2]) for i in range(CONCURRENCY))
+    )
+
+    assert sorted(r.status_code for r in responses) == [200] + [409] * (CONCURRENCY - 1)
+    assert await stored_bookings(business) == 1
+
+
+async def test_hold_converts_to_booking(client, business):
+    hold = await client.post("/api/holds", json=slot(business, "10:00"))
+    assert hold.status_code == 200
+    hold_id = hold.json()["id"]
+
+    # Nobody else can book or hold the held minutes
+    assert (await client.post("/api/bookings", json={**slot(business, "10:00", "long"), **CUSTOMER})).status_code == 409
+    assert (await client.post("/api/holds", json=slot(business, "10:00"))).status_code == 409
+
+    booking = await client.post("/api/bookings", json={**slot(business, "10:00"), **CUSTOMER, "hold_id": hold_id})
+    assert booking.status_code == 200
+    claims = database.get_db().slot_claims
+    assert await claims.count_documents({"booking_id": booking.json()["id"], "expires_at": {"$exists": False}}) == 30
+    assert await claims.count_documents({"booking_id": hold_id}) == 0
+    assert await database.get_db().slot_holds.count_documents({"id": hold_id}) == 0
+
+    # The hold is spent: submitting it again cannot book the slot twice
+    again = await client.post("/api/bookings", json={**slot(business, "10:00"), **CUSTOMER, "hold_id": hold_id})
+    assert again.status_code == 409
+    assert await stored_bookings(business) == 1
+
+
+async def test_rebook_after_cancellation(client, business):
+    payload = {**slot(business, "10:00"), **CUSTOMER}
+    first = await client.post("/api/bookings", json=payload)
+    assert first.status_code == 200
+    assert (await client.post("/api/bookings", json=payload)).status_code == 409
+
+    cancel = await client.delete(f"/api/admin/bookings/{first.json()['id']}", headers=business["headers"])
+    assert cancel.status_code == 200
+    assert (await client.post("/api/bookings", json=payload)).status_code == 200
+    assert await stored_bookings(business) == 1
+
+
+async def test_rebook_after_hold_release(client, business):
+    hold = await client.post("/api/holds", json=slot(business, "10:00"))
+    assert hold.status_code == 200
+    assert (await client.delete(f"/api/holds/{hold.json()['id']}")).status_code == 200
+
+    booking = await client.post("/api/bookings", json={**slot(business, "10:00"), **CUSTOMER})
+    assert booking.status_code == 200
+
+
+async def test_claims_of_a_lost_booking_lapse(client, business):
+    # A worker that died between claiming the minutes and storing the booking
+    db = database.get_db()
+    lapsed = datetime.now(timezone.utc) - timedelta(seconds=1)
+    await booking_claims.claim(db, business["id"], business["date"], 600, 630, "lost", expires_at=lapsed)
+
+    booking = await client.post("/api/bookings", json={**slot(business, "10:00"), **CUSTOMER})
+    assert booking.status_code == 200
+    assert await db.slot_claims.count_documents({"booking_id": "lost"}) == 0
+    assert await db.slot_claims.count_documents({"booking_id": booking.json()["id"], "expires_at": {"$exists": True}}) == 0
@@ -0,0 +1,57 @@
+"""Idempotency-Key replays mutations, but never sign-in or sign-out."""
+
+import uuid
+
+import pytest
+
+import database
+from tests.conftest import CUSTOMER, slot
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_booking_is_replayed(client, business):
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    payload = {**slot(business, "10:00"), **CUSTOMER}
+    first = await client.post("/api/bookings", json=payload, headers=headers)
+    again = await client.post("/api/bookings", json=payload, headers=headers)
+
+    assert first.status_code == again.status_code == 200
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert again.json()["id"] == first.json()["id"]
+
+
+async def test_login_is_never_stored_or_replayed(client):
+    credentials = {"email": f"idem_{uuid.uuid4().hex[:12]}@test.com", "password": "test123"}
+    register = await client.post(
+        "/api/admin/register", json={"business_name": "Idem", **credentials}, headers={"Idempotency-Key": "r"}
+    )
+    assert register.status_code == 200
+    stored = await database.get_db().idempotency_keys.count_documents({})
+
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    first = await client.post("/api/admin/login", json=credentials, headers=headers)
+    token = {"Authorization": f"Bearer {first.json()['token']}"}
+    assert (await client.post("/api/admin/logout-all", headers={**token, **headers})).status_code == 200
+
+    # The same key and body must check the password again, not hand out the revoked token
+    again = await client.post("/api/admin/login", json=credentials, headers=headers)
+    assert again.status_code == 200
+    assert "Idempotent-Replayed" not in again.headers
+    assert again.json()["token"] != first.json()["token"]
+    wrong = await client.post("/api/admin/login", json={**credentials, "password": "nope"}, headers=headers)
+    assert wrong.status_code == 401
+    assert await database.get_db().idempotency_keys.count_documents({}) == stored
+
+
+async def test_replay_needs_a_valid_token(client, business):
+    headers = {**business["headers"], "Idempotency-Key": uuid.uuid4().hex}
+    first = await client.post("/api/admin/staff", json={"name": "Alex"}, headers=headers)
+    assert first.status_code == 200
+    again = await client.post("/api/admin/staff", json={"name": "Alex"}, headers=headers)
+    assert again.headers["Idempotent-Replayed"] == "true"
+
+    assert (await client.post("/api/admin/logout", headers=business["headers"])).status_code == 200
+    revoked = await client.post("/api/admin/staff", json={"name": "Alex"}, headers=headers)
+    assert revoked.status_code == 401
+    assert "Idempotent-Replayed" not in revoked.headers
@@ -0,0 +1,124 @@
+"""The email queue batches, retries with backoff and dead-letters what keeps failing."""
+
+import asyncio
+import uuid
+
+import pytest
+
+import database
+import notifications
+from notifications import EmailQueue, MemoryTransport
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def fast_queue(monkeypatch):
+    monkeypatch.setattr(notifications, "EMAIL_WORKERS", 1)
+    monkeypatch.setattr(notifications, "EMAIL_BATCH_WAIT_MS", 20)
+    monkeypatch.setattr(notifications, "EMAIL_BACKOFF_BASE_SECONDS", 0.01)
+
+
+def messages(count: int) -> list:
+    recipient = f"{uuid.uuid4().hex[:12]}@test.com"
+    return [{"kind": "test", "to": recipient, "subject": f"Message {i}", "html": ""} for i in range(count)]
+
+
+async def wait_until(predicate, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def dead_letters(recipient: str) -> list:
+    return await database.get_db().email_dead_letters.find({"to": recipient}, {"_id": 0}).to_list(None)
+
+
+async def test_messages_are_sent_in_batches(client, fast_queue, monkeypatch):
+    monkeypatch.setattr(notifications, "EMAIL_BATCH_SIZE", 2)
+    transport = MemoryTransport()
+    queue = EmailQueue(database.get_db(), transport)
+    queue.start()
+    for message in messages(5):
+        queue.enqueue(message)
+
+    await wait_until(lambda: queue.sent == 5)
+    await queue.stop()
+    assert transport.batches == 3
+    assert [m["subject"] for m in transport.sent] == [f"Message {i}" for i in range(5)]
+
+
+async def test_failed_batches_are_retried(client, fast_queue):
+    transport = MemoryTransport(fail_times=2)
+    queue = EmailQueue(database.get_db(), transport)
+    queue.start()
+    batch = messages(3)
+    for message in batch:
+        queue.enqueue(message)
+
+    await wait_until(lambda: queue.sent == 3)
+    await queue.stop()
+    assert queue.retried == 6
+    assert queue.dead_lettered == 0
+    assert sorted(m["subject"] for m in transport.sent) == [m["subject"] for m in batch]
+    assert all(m["attempts"] == 2 for m in transport.sent)
+    assert await dead_letters(batch[0]["to"]) == []
+
+
+async def test_dead_lettered_after_max_attempts(client, fast_queue, monkeypatch):
+    monkeypatch.setattr(notifications, "EMAIL_MAX_ATTEMPTS", 3)
+    transport = MemoryTransport(fail_times=100)
+    queue = EmailQueue(database.get_db(), transport)
+    queue.start()
+    [message] = messages(1)
+    queue.enqueue(message)
+
+    await wait_until(lambda: queue.dead_lettered == 1)
+    await queue.stop()
+    assert transport.sent == []
+    assert queue.retried == 2
+    [letter] = await dead_letters(message["to"])
+    assert letter["subject"] == message["subject"]
+    assert letter["attempts"] == 3
+    assert letter["error"] == "simulated transport failure"
+
+
+async def test_overflow_is_dead_lettered(client, monkeypatch):
+    monkeypatch.setattr(notifications, "EMAIL_QUEUE_MAX", 1)
+    queue = EmailQueue(database.get_db(), MemoryTransport())
+    kept, overflow = messages(2)
+    queue.enqueue(kept)
+    queue.enqueue(overflow)
+
+    await wait_until(lambda: queue.dead_lettered == 1)
+    [letter] = await dead_letters(overflow["to"])
+    assert letter["subject"] == overflow["subject"]
+    assert letter["error"] == "queue full"
+    assert queue.stats()["queued"] == 1
+
+
+async def test_shutdown_dead_letters_pending_retries(client, fast_queue, monkeypatch):
+    monkeypatch.setattr(notifications, "EMAIL_BACKOFF_BASE_SECONDS", 60)
+    queue = EmailQueue(database.get_db(), MemoryTransport(fail_times=1))
+    queue.start()
+    [message] = messages(1)
+    queue.enqueue(message)
+    await wait_until(lambda: queue.stats()["waiting_retry"] == 1)
+
+    await queue.stop(timeout=0.05)
+    assert queue.stats()["waiting_retry"] == 0
+    [letter] = await dead_letters(message["to"])
+    assert letter["attempts"] == 1
+    assert letter["error"] == "simulated transport failure"
+
+
+async def test_shutdown_dead_letters_queued_messages(client):
+    queue = EmailQueue(database.get_db(), MemoryTransport())  # no workers: nothing drains it
+    batch = messages(2)
+    for message in batch:
+        queue.enqueue(message)
+
+    await queue.stop(timeout=0.05)
+    letters = await dead_letters(batch[0]["to"])
+    assert sorted((m["subject"], m["error"]) for m in letters) == [("Message 0", "shutdown"), ("Message 1", "shutdown")]
@@ -0,0 +1,90 @@
+"""Every write that changes a day's slots evicts them from the slot cache."""
+
+import pytest
+
+from tests.conftest import CUSTOMER, slot
+
+pytestmark = pytest.mark.anyio
+
+
+async def get_slots(client, business, service: str = "short"):
+    return await client.get(
+        f"/api/businesses/{business['id']}/slots", params={"date": business["date"], "service_id": business[service]}
+    )
+
+
+async def open_times(client, business) -> list:
+    # The first call of each test also fills the cache
+    response = await get_slots(client, business)
+    assert response.status_code == 200
+    return [s["start_time"] for s in response.json() if s["available"]]
+
+
+async def book(client, business, start_time: str = "10:00") -> str:
+    response = await client.post("/api/bookings", json={**slot(business, start_time), **CUSTOMER})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+async def test_booking(client, business):
+    assert "10:00" in await open_times(client, business)
+    await book(client, business)
+    assert "10:00" not in await open_times(client, business)
+
+
+async def test_cancel(client, business):
+    booking_id = await book(client, business)
+    assert "10:00" not in await open_times(client, business)
+    await client.delete(f"/api/admin/bookings/{booking_id}", headers=business["headers"])
+    assert "10:00" in await open_times(client, business)
+
+
+async def test_bulk_cancel(client, business):
+    booking_id = await book(client, business)
+    assert "10:00" not in await open_times(client, business)
+    response = await client.post(
+        "/api/admin/bookings/cancel", json={"booking_ids": [booking_id]}, headers=business["headers"]
+    )
+    assert response.status_code == 200
+    assert "10:00" in await open_times(client, business)
+
+
+async def test_hold_and_release(client, business):
+    assert "10:00" in await open_times(client, business)
+    hold = await client.post("/api/holds", json=slot(business, "10:00"))
+    assert "10:00" not in await open_times(client, business)
+    await client.delete(f"/api/holds/{hold.json()['id']}")
+    assert "10:00" in await open_times(client, business)
+
+
+async def test_availability(client, business):
+    assert "16:30" in await open_times(client, business)
+    hours = [{"day": day, "start_time": "09:00", "end_time": "12:00"} for day in range(7)]
+    response = await client.put("/api/admin/availability", json={"availability": hours}, headers=business["headers"])
+    assert response.status_code == 200
+    assert (await open_times(client, business))[-1] == "11:30"
+
+
+async def test_block_and_unblock(client, business):
+    assert await open_times(client, business)
+    headers = business["headers"]
+    await client.post("/api/admin/blocked-dates", json={"date": business["date"]}, headers=headers)
+    assert await open_times(client, business) == []
+    await client.delete(f"/api/admin/blocked-dates/{business['date']}", headers=headers)
+    assert await open_times(client, business)
+
+
+async def test_bulk_block_and_unblock(client, business):
+    assert await open_times(client, business)
+    day = {"from": business["date"], "to": business["date"]}
+    await client.post("/api/admin/blocked-dates/bulk", json={"block": [day]}, headers=business["headers"])
+    assert await open_times(client, business) == []
+    await client.post("/api/admin/blocked-dates/bulk", json={"unblock": [day]}, headers=business["headers"])
+    assert await open_times(client, business)
+
+
+async def test_service_delete(client, business):
+    assert (await get_slots(client, business)).status_code == 200
+    response = await client.delete(f"/api/admin/services/{business['short']}", headers=business["headers"])
+    assert response.status_code == 200
+    assert (await get_slots(client, business)).status_code == 404
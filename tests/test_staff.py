@@ -0,0 +1,41 @@
+"""Businesses with staff take parallel bookings, one per free member."""
+
+import pytest
+
+from tests.conftest import CUSTOMER, slot
+
+pytestmark = pytest.mark.anyio
+
+
+async def add_staff(client, business, name):
+    response = await client.post("/api/admin/staff", json={"name": name}, headers=business["headers"])
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_each_member_is_booked_once(client, business):
+    ann, bob = await add_staff(client, business, "Ann"), await add_staff(client, business, "Bob")
+    payload = {**slot(business, "10:00"), **CUSTOMER}
+
+    first = await client.post("/api/bookings", json=payload)
+    second = await client.post("/api/bookings", json=payload)
+    assert [first.json()["staff_id"], second.json()["staff_id"]] == [ann["id"], bob["id"]]
+    assert (await client.post("/api/bookings", json=payload)).status_code == 409
+
+
+async def test_utilization_counts_every_member(client, business):
+    await add_staff(client, business, "Ann")
+    await add_staff(client, business, "Bob")
+    for _ in range(2):
+        response = await client.post("/api/bookings", json={**slot(business, "10:00"), **CUSTOMER})
+        assert response.status_code == 200
+
+    day = business["date"]
+    response = await client.get(
+        "/api/admin/analytics", params={"from": day, "to": day}, headers=business["headers"]
+    )
+    totals = response.json()["totals"]
+    # Open 09:00-17:00 with two members: 960 bookable minutes, 60 booked
+    assert totals["available_minutes"] == 2 * 8 * 60
+    assert totals["booked_minutes"] == 60
+    assert totals["utilization"] == round(60 / 960, 4)
@@ -0,0 +1,65 @@
+"""Times are HH:MM on the 24-hour clock and bookings store them canonically."""
+
+import pytest
+from fastapi import HTTPException
+
+import database
+import main
+from tests.conftest import CUSTOMER, slot
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("value", ["99:99", "24:01", "24:30", "09:60", "9:30"])
+async def test_availability_rejects_invalid_times(client, business, value):
+    response = await client.put(
+        "/api/admin/availability",
+        json={"availability": [{"day": 0, "start_time": "09:00", "end_time": value, "enabled": True}]},
+        headers=business["headers"],
+    )
+    assert response.status_code == 422
+
+
+async def test_availability_start_cannot_be_midnight_at_day_end(client, business):
+    response = await client.put(
+        "/api/admin/availability",
+        json={"availability": [{"day": 0, "start_time": "24:00", "end_time": "24:00", "enabled": True}]},
+        headers=business["headers"],
+    )
+    assert response.status_code == 422
+
+
+async def test_open_until_midnight_keeps_the_last_slot(client, business):
+    hours = [{"day": day, "start_time": "22:00", "end_time": "24:00"} for day in range(7)]
+    response = await client.put("/api/admin/availability", json={"availability": hours}, headers=business["headers"])
+    assert response.status_code == 200
+
+    slots = await client.get(
+        f"/api/businesses/{business['id']}/slots", params={"date": business["date"], "service_id": business["long"]}
+    )
+    assert [(s["start_time"], s["end_time"]) for s in slots.json()] == [("22:00", "23:00"), ("23:00", "24:00")]
+    booking = await client.post("/api/bookings", json={**slot(business, "23:00", "long"), **CUSTOMER})
+    assert booking.status_code == 200
+    assert booking.json()["end_time"] == "24:00"
+
+
+@pytest.mark.parametrize("path", ["/api/holds", "/api/bookings"])
+@pytest.mark.parametrize("value", ["99:99", "09:60", "25:00"])
+async def test_slot_requests_reject_invalid_times(client, business, path, value):
+    response = await client.post(path, json={**slot(business, value), **CUSTOMER})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("value", ["09:60", "10:0", "9:30"])
+async def test_open_slot_rejects_non_canonical_start(client, business, value):
+    # Bypasses model validation: the slot check itself must not accept them
+    data = main.HoldCreate.model_construct(**slot(business, value))
+    with pytest.raises(HTTPException) as raised:
+        await main.find_open_slot(database.get_db(), data)
+    assert raised.value.status_code == 400
+
+
+async def test_booking_stores_canonical_times(client, business):
+    response = await client.post("/api/bookings", json={**slot(business, "10:00"), **CUSTOMER})
+    assert response.status_code == 200
+    assert (response.json()["start_time"], response.json()["end_time"]) == ("10:00", "10:30")